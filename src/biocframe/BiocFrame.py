@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import sys
+import sysconfig
+import weakref
 from collections import OrderedDict, abc
 from copy import copy
-from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union
 from warnings import warn
 
 import biocutils as ut
 import numpy
 
+from .batch import BatchUpdate
+from .chunked import ChunkedArray
+from .columnmap import ColumnMap
+from .expressions import Expression
+from .hooks import instrumented
+from .indexes import HashIndex, IntervalIndex, SortedIndex, _as_key_list
+from .lazy import LazyBiocFrame
+from .names import PersistentNames, RangeNames, _as_names, _combine_partial_names
+from .nullable import NullableArray, _as_values_and_mask, combine_nullable
+
 if TYPE_CHECKING:
     import pandas
     import polars
@@ -34,14 +47,119 @@ def _guess_number_of_rows(
     return 0
 
 
+def _validation_level(level: Union[bool, str]) -> str:
+    if level is True:
+        return "full"
+    if level is False:
+        return "none"
+    if level not in ("full", "shape", "none"):
+        raise ValueError("Unknown validation level '" + str(level) + "'.")
+    return level
+
+
+def _get_height(x: Any) -> int:
+    # Avoiding the dispatch overhead of ut.get_height() for the most common column types.
+    if type(x) is list:
+        return len(x)
+    if isinstance(x, numpy.ndarray):
+        return x.shape[0]
+    return ut.get_height(x)
+
+
+def _has_none(names: Union[Sequence[str], numpy.ndarray, ut.Names]) -> bool:
+    """Check whether names contain None, without iterating in Python where possible."""
+    if isinstance(names, numpy.ndarray):
+        return names.dtype == object and bool(numpy.equal(names, None).any())
+    if isinstance(names, ut.Names):
+        if getattr(names, "_compact", None) is not None:
+            # Compact names are generated from integers or string arrays, which cannot contain None.
+            return False
+        names = names.as_list()
+    if isinstance(names, list):
+        return None in names
+    return any(x is None for x in names)
+
+
+def _normalize_rows(rows: Any, length: int, names: Optional[ut.Names]) -> Union[Sequence[int], numpy.ndarray]:
+    # Vectorized equivalent of ut.normalize_subscript() for NumPy integer and
+    # boolean arrays, which would otherwise be checked one element at a time.
+    if isinstance(rows, numpy.ndarray) and rows.ndim == 1 and not numpy.ma.isMaskedArray(rows):
+        if rows.dtype == numpy.bool_:
+            return numpy.flatnonzero(rows)
+        if rows.dtype.kind in "iu":
+            if len(rows) == 0:
+                return numpy.zeros(0, dtype=numpy.intp)
+            lo = rows.min()
+            hi = rows.max()
+            if hi >= length or lo < -length:
+                raise IndexError(f"subscript ({lo if lo < -length else hi}) out of range for {length} rows")
+            rows = rows.astype(numpy.intp, copy=False)
+            if lo < 0:
+                rows = numpy.where(rows < 0, rows + length, rows)
+            return rows
+
+    return ut.normalize_subscript(rows, length, names=names)[0]
+
+
+def _as_numpy_selector(indices: Sequence[int]) -> Union[slice, numpy.ndarray]:
+    """Convert normalized indices into a NumPy selector that can be reused across columns.
+
+    Ranges with a positive step become slices, for which NumPy uses basic
+    indexing; other indices are converted into an integer array once, instead
+    of being converted by NumPy in every assignment.
+    """
+    if isinstance(indices, range) and indices.step > 0:
+        return slice(indices.start, indices.stop, indices.step)
+    if isinstance(indices, numpy.ndarray) and indices.dtype == numpy.intp:
+        return indices
+    return numpy.asarray(indices, dtype=numpy.intp)
+
+
+def _as_row_mask(mask: Any, length: int) -> numpy.ndarray:
+    """Coerce a boolean vector into a NumPy boolean array, treating masked values as False."""
+    if numpy.ma.isMaskedArray(mask):
+        mask = numpy.ma.filled(mask, False)
+    mask = numpy.asarray(mask)
+    if mask.ndim != 1 or mask.dtype != numpy.bool_:
+        raise TypeError("Row filters should be (or return) a one-dimensional boolean vector.")
+    if len(mask) != length:
+        raise ValueError("Length of the mask should be equal to the number of rows.")
+    return mask
+
+
+def _refcount_in(data: Dict[str, Any], name: str) -> int:
+    col = data[name]
+    return sys.getrefcount(col)
+
+
+# Reference counts only show that a column is not referenced elsewhere on
+# CPython with the GIL; other implementations and free-threaded builds may
+# defer reference counting, so columns are always copied before writing.
+_EXACT_REFCOUNTS = sys.implementation.name == "cpython" and not sysconfig.get_config_var("Py_GIL_DISABLED")
+
+# Number of references reported by _refcount_in() for a column that is only
+# referenced by its column map; calibrated at import for the current interpreter.
+_EXCLUSIVE_REFCOUNT = _refcount_in({"x": numpy.empty(0)}, "x")
+
+
+# Frames with at least this many columns switch to persistent column storage
+# (ColumnMap and PersistentNames) once their dictionary of columns has been
+# copied this many times by a chain of non-in-place modifications. Building
+# a ColumnMap costs about as much as 50 dictionary copies, so waiting for the
+# chain to reach a similar length bounds the overhead for short chains.
+_PERSISTENT_MIN_COLUMNS = 1024
+_PERSISTENT_AFTER_COPIES = 32
+
+
 def _validate_rows(
     number_of_rows: int,
     data: Dict[str, Any],
     row_names: Optional[Union[Sequence[str], ut.Names]],
+    check_names: bool = True,
 ) -> None:
     incorrect_len_keys = []
     for k, v in data.items():
-        if number_of_rows != ut.get_height(v):
+        if number_of_rows != _get_height(v):
             incorrect_len_keys.append(k)
 
     if len(incorrect_len_keys) > 0:
@@ -54,16 +172,154 @@ def _validate_rows(
             raise ValueError(
                 f"Length of `row_names` and `number_of_rows` do not match, {len(row_names)} != {number_of_rows}"
             )
-        if any(x is None for x in row_names):
+        if check_names and _has_none(row_names):
             raise ValueError("`row_names` cannot contain None values.")
 
 
+def _encode_strings(x: Any, max_levels: int) -> Optional[ut.Factor]:
+    """Encode a sequence of strings as a :py:class:`~biocutils.Factor`.
+
+    Args:
+        x:
+            List or object array of strings, possibly containing Nones.
+
+        max_levels:
+            Maximum number of distinct strings.
+
+    Returns:
+        A ``Factor`` with sorted levels, or None if ``x`` contains non-string
+        values or more than ``max_levels`` distinct strings.
+    """
+    mapping = {}
+    codes = []
+    for y in x:
+        if y is None:
+            codes.append(-1)
+            continue
+        if not isinstance(y, str):
+            return None
+        c = mapping.get(y)
+        if c is None:
+            if len(mapping) >= max_levels:
+                return None
+            c = mapping[y] = len(mapping)
+        codes.append(c)
+
+    levels = list(mapping.keys())
+    order = sorted(range(len(levels)), key=levels.__getitem__)
+    remap = numpy.empty(len(levels) + 1, dtype=numpy.min_scalar_type(-len(levels) - 1))
+    remap[order] = numpy.arange(len(levels))
+    remap[-1] = -1  # missing values are stored as -1 and map to the extra slot.
+    return ut.Factor(
+        remap[numpy.array(codes, dtype=numpy.intp)],
+        ut.StringList([levels[i] for i in order]),
+        _validate=False,
+    )
+
+
+def _factors_equal(x: ut.Factor, y: ut.Factor) -> bool:
+    """Compare two factors by their codes, accounting for differences in the levels."""
+    if len(x) != len(y) or x.get_ordered() != y.get_ordered() or x.get_names() != y.get_names():
+        return False
+
+    xcodes = numpy.asarray(x.get_codes())
+    ycodes = numpy.asarray(y.get_codes())
+    xlevels = x.get_levels()
+    ylevels = y.get_levels()
+    if list(xlevels) != list(ylevels):
+        if len(xlevels) != len(ylevels):
+            return False
+        remap = numpy.append(numpy.asarray(ut.match(ylevels, xlevels), dtype=numpy.intp), -1)
+        if (remap[:-1] < 0).any():
+            return False
+        ycodes = remap[ycodes]
+
+    return bool(numpy.array_equal(xcodes, ycodes))
+
+
+def _sizeof(x: Any, deep: bool, seen: set) -> int:
+    """Compute the memory used by an object.
+
+    Args:
+        x:
+            Any object.
+
+        deep:
+            Whether to include the Python objects referenced by lists,
+            dictionaries and NumPy object arrays.
+
+        seen:
+            Identities of objects that were already counted, which are
+            skipped so that shared objects are only counted once.
+
+    Returns:
+        Size of ``x`` in bytes.
+    """
+    if id(x) in seen:
+        return 0
+    seen.add(id(x))
+
+    if isinstance(x, BiocFrame):
+        return object.__sizeof__(x) + int(x._memory_usage_sizes(deep, seen)[2].sum())
+    if isinstance(x, numpy.ndarray):
+        size = x.nbytes
+        if deep and x.dtype == object:
+            size += sum(_sizeof(y, deep, seen) for y in x.ravel().tolist())
+        return size
+    if isinstance(x, (list, tuple)):
+        size = sys.getsizeof(x)
+        if deep:
+            size += sum(_sizeof(y, deep, seen) for y in x)
+        return size
+    if isinstance(x, dict):
+        size = sys.getsizeof(x)
+        if deep:
+            size += sum(_sizeof(k, deep, seen) + _sizeof(v, deep, seen) for k, v in x.items())
+        return size
+    if isinstance(x, ut.Factor):
+        return x.get_codes().nbytes + _sizeof(x.get_levels().as_list(), deep, seen)
+    if isinstance(x, ut.NamedList):
+        names = x.get_names()
+        return (
+            sys.getsizeof(x) + _sizeof(x.as_list(), deep, seen) + (0 if names is None else _sizeof(names, deep, seen))
+        )
+    if isinstance(x, ut.Names) and getattr(x, "_compact", None) is None:
+        return sys.getsizeof(x) + _sizeof(x._names, deep, seen)
+    return sys.getsizeof(x)
+
+
+def _downcast_array(x: numpy.ndarray, valid: Optional[numpy.ndarray], allow_float32: bool) -> numpy.ndarray:
+    """Convert a one-dimensional NumPy array to the smallest type that holds all (valid) values."""
+    present = x if valid is None else x[valid]
+    if x.dtype.kind in "iu":
+        if len(present) == 0:
+            return x
+        lo = present.min()
+        hi = present.max()
+        candidates = (
+            (numpy.uint8, numpy.uint16, numpy.uint32) if x.dtype.kind == "u" else (numpy.int8, numpy.int16, numpy.int32)
+        )
+        for candidate in candidates:
+            if numpy.dtype(candidate).itemsize >= x.dtype.itemsize:
+                break
+            info = numpy.iinfo(candidate)
+            if lo >= info.min and hi <= info.max:
+                return x.astype(candidate)
+    elif x.dtype == numpy.float64 and allow_float32:
+        finite = present[numpy.isfinite(present)]
+        if len(finite) == 0 or numpy.abs(finite).max() <= numpy.finfo(numpy.float32).max:
+            return x.astype(numpy.float32)
+    return x
+
+
 def _validate_columns(
     column_names: ut.Names,
     data: Dict[str, Any],
     column_data: Optional[BiocFrame],
+    check_names: bool = True,
 ) -> None:
-    if sorted(column_names) != sorted(data.keys()):
+    # Equal lengths and equal sets imply that the names are unique and match the keys.
+    if len(column_names) != len(data) or (check_names and set(column_names) != data.keys()):
         raise ValueError("Mismatch between `column_names` and the keys of `data`.")
 
     if column_data is not None:
@@ -77,6 +333,8 @@ def _validate_columns(
 class BiocFrameIter:
     """An iterator to a :py:class:`~biocframe.BiocFrame.BiocFrame` object."""
 
+    __slots__ = ("_bframe", "_current_index")
+
     def __init__(self, obj: BiocFrame) -> None:
         """Initialize the iterator.
 
@@ -119,6 +377,23 @@ class BiocFrame(ut.BiocObject):
     This allows ``BiocFrame`` to accept arbitrarily complex classes (such as nested ``BiocFrame`` instances) as columns.
     """
 
+    # Attributes are stored in slots for faster access. This does not make
+    # instances smaller: ut.BiocObject does not define __slots__, so instances
+    # still have a (lazily created) __dict__, and subclasses can add
+    # attributes as usual.
+    __slots__ = (
+        "_data",
+        "_number_of_rows",
+        "_row_names",
+        "_column_names",
+        "_column_data",
+        "_metadata",
+        "_indexes",
+        "_data_shared",
+        "_data_copies",
+        "_owned_columns",
+    )
+
     def __init__(
         self,
         data: Optional[Union[Dict[str, Any], ut.NamedList, Sequence[Any]]] = None,
@@ -127,7 +402,7 @@ class BiocFrame(ut.BiocObject):
         column_names: Optional[Union[Sequence[str], ut.Names]] = None,
         column_data: Optional[BiocFrame] = None,
         metadata: Optional[Union[Dict[str, Any], ut.NamedList]] = None,
-        _validate: bool = True,
+        _validate: Union[bool, Literal["full", "shape", "none"]] = True,
     ) -> None:
         """Initialize a ``BiocFrame`` object from columns.
 
@@ -153,6 +428,10 @@ class BiocFrame(ut.BiocObject):
             row_names:
                 Row names. This should not contain missing strings.
 
+                A NumPy string array (fixed-width or ``StringDType``) is
+                stored as a :py:class:`~biocframe.names.StringArrayNames`,
+                avoiding conversion into a list of Python strings.
+
             column_names:
                 Column names. If not provided, inferred from the ``data``.
                 This may be in a different order than the keys of ``data``.
@@ -166,12 +445,17 @@ class BiocFrame(ut.BiocObject):
                 Additional metadata. Defaults to an empty dictionary.
 
             _validate:
-                Internal use only.
+                Internal use only. Level of validation, either ``"full"``
+                (equivalent to True), ``"shape"`` or ``"none"`` (equivalent to
+                False). ``"shape"`` only checks that the heights of the columns
+                and the lengths of the names and column data are consistent,
+                skipping the checks on the contents of the names and metadata.
         """
+        _validate = _validation_level(_validate)
 
         super().__init__(
             metadata=metadata,
-            _validate=_validate,
+            _validate=_validate == "full",
         )
 
         if data is None:
@@ -195,8 +479,8 @@ class BiocFrame(ut.BiocObject):
 
         self._data = data
 
-        if row_names is not None and not isinstance(row_names, ut.Names):
-            row_names = ut.Names(row_names)
+        if row_names is not None:
+            row_names = _as_names(row_names)
         self._row_names = row_names
 
         self._number_of_rows = int(
@@ -210,17 +494,141 @@ class BiocFrame(ut.BiocObject):
         if column_names is None:
             self._column_names = ut.Names(self._data.keys())
         else:
-            self._column_names = column_names if isinstance(column_names, ut.Names) else ut.Names(column_names)
+            self._column_names = _as_names(column_names)
 
         if self._number_of_rows == 0 and len(self._column_names) > 0 and len(self._data) == 0:
             for col in self._column_names:
                 self._data[col] = []
 
         self._column_data = column_data
+        self._indexes = None
+        self._data_shared = False
+        self._data_copies = 0
+        self._owned_columns = {}
+
+        if _validate != "none":
+            full = _validate == "full"
+            _validate_rows(self._number_of_rows, self._data, self._row_names, check_names=full)
+            _validate_columns(self._column_names, self._data, self._column_data, check_names=full)
+
+    @classmethod
+    def _from_parts(
+        cls,
+        data: Dict[str, Any],
+        number_of_rows: int,
+        row_names: Optional[ut.Names],
+        column_names: ut.Names,
+        column_data: Optional[BiocFrame],
+        metadata: ut.NamedList,
+    ) -> BiocFrame:
+        """Construct a ``BiocFrame`` directly from its components, without any coercion or validation.
+
+        Args:
+            data:
+                Dictionary of columns, which is used without copying.
+
+            number_of_rows:
+                Number of rows.
+
+            row_names:
+                Row names as a :py:class:`~biocutils.Names` object, or None.
+
+            column_names:
+                Column names as a :py:class:`~biocutils.Names` object,
+                containing the same names as the keys of ``data``.
 
-        if _validate:
-            _validate_rows(self._number_of_rows, self._data, self._row_names)
-            _validate_columns(self._column_names, self._data, self._column_data)
+            column_data:
+                Column data with one row per column, or None.
+
+            metadata:
+                Metadata as a :py:class:`~biocutils.NamedList`.
+
+        Returns:
+            A ``BiocFrame`` of the same class as ``cls``. Subclasses that
+            override ``__init__`` are constructed through their constructor
+            (without validation) so that their own attributes are initialized.
+        """
+        if cls.__init__ is not BiocFrame.__init__:
+            return cls(
+                data,
+                number_of_rows=number_of_rows,
+                row_names=row_names,
+                column_names=column_names,
+                column_data=column_data,
+                metadata=metadata,
+                _validate=False,
+            )
+
+        output = cls.__new__(cls)
+        output._data = data
+        output._number_of_rows = number_of_rows
+        output._row_names = row_names
+        output._column_names = column_names
+        output._column_data = column_data
+        output._metadata = metadata
+        output._indexes = None
+        output._data_shared = False
+        output._data_copies = 0
+        output._owned_columns = {}
+        return output
+
+    def _mutable_data(self) -> Dict[str, Any]:
+        """Get the dictionary of columns for modification.
+
+        Shallow copies share their dictionary of columns (see
+        :py:meth:`~__copy__`), which is only copied when one of them is
+        modified. This avoids copying all columns in methods that do not end up
+        modifying the dictionary, e.g., :py:meth:`~set_row_names`.
+
+        After a long chain of non-in-place modifications of a frame with many
+        columns, the dictionary is replaced by a
+        :py:class:`~biocframe.columnmap.ColumnMap`, which can be copied in
+        O(1) time and modified in O(log n) time.
+
+        Returns:
+            The dictionary of columns, which is not shared with any other object.
+        """
+        if self._data_shared:
+            if (
+                type(self._data) is not ColumnMap
+                and self._data_copies >= _PERSISTENT_AFTER_COPIES
+                and len(self._data) >= _PERSISTENT_MIN_COLUMNS
+            ):
+                self._data = ColumnMap(self._data)
+            else:
+                self._data = copy(self._data)
+            self._data_copies += 1
+            self._data_shared = False
+        return self._data
+
+    def _writable_column(self, name: str) -> numpy.ndarray:
+        """Get a NumPy column that can be modified in place without affecting any other object.
+
+        Only buffers that were allocated by a previous call to this method
+        are modified in place, so buffers supplied by the user are always
+        copied first. Even these are copied if they may be visible elsewhere,
+        i.e., if they are referenced by anything other than this object's
+        dictionary of columns (e.g., another ``BiocFrame``, an index or the
+        user), or if this cannot be determined from the reference counts
+        of the current interpreter.
+
+        Args:
+            name:
+                Name of a column containing a NumPy array.
+
+        Returns:
+            The column, which can be modified in place.
+        """
+        data = self._mutable_data()
+        # Leaves of a ColumnMap may be shared with other maps, so the reference count is not informative.
+        exclusive = _EXACT_REFCOUNTS and type(data) is dict and _refcount_in(data, name) <= _EXCLUSIVE_REFCOUNT
+        col = data[name]
+        owned = self._owned_columns.get(name)
+        if not exclusive or owned is None or owned() is not col or col.base is not None or not col.flags.writeable:
+            col = col.copy()
+            data[name] = col
+            self._owned_columns[name] = weakref.ref(col)
+        return col
 
     def __eq__(self, other: Any) -> bool:
         """Check if the current object is equal to another.
@@ -248,7 +656,13 @@ class BiocFrame(ut.BiocObject):
             d1 = self.column(col)
             d2 = other.column(col)
 
-            if isinstance(d1, numpy.ndarray) or isinstance(d2, numpy.ndarray):
+            if isinstance(d1, ut.Factor) and isinstance(d2, ut.Factor):
+                if not _factors_equal(d1, d2):
+                    return False
+            elif isinstance(d1, NullableArray) or isinstance(d2, NullableArray):
+                if not (d1.equals(d2) if isinstance(d1, NullableArray) else d2.equals(d1)):
+                    return False
+            elif isinstance(d1, numpy.ndarray) or isinstance(d2, numpy.ndarray):
                 if not numpy.array_equal(d1, d2):
                     return False
             else:
@@ -335,7 +749,7 @@ class BiocFrame(ut.BiocObject):
         Returns:
             A string representation of this ``BiocFrame``.
         """
-        output = "BiocFrame(data=" + ut.print_truncated_dict(self._data)
+        output = "BiocFrame(data=" + ut.print_truncated_dict(self.get_data())
         output += ", number_of_rows=" + str(self.shape[0])
 
         if self._row_names:
@@ -452,10 +866,9 @@ class BiocFrame(ut.BiocObject):
                     "Length of `names` does not match the number of rows, need to be "
                     f"{self.shape[0]} but provided {len(names)}."
                 )
-            if any(x is None for x in names):
+            if _has_none(names):
                 raise ValueError("`row_names` cannot contain None values.")
-            if not isinstance(names, ut.Names):
-                names = ut.Names(names)
+            names = _as_names(names)
 
         output = self._define_output(in_place)
         output._row_names = names
@@ -499,8 +912,12 @@ class BiocFrame(ut.BiocObject):
         """Get the underlying data.
 
         Returns:
-            Dictionary of columns and their values.
+            Dictionary of columns and their values. If the columns are stored
+            in a :py:class:`~biocframe.columnmap.ColumnMap`, a new dictionary
+            is created in the order of the column names.
         """
+        if type(self._data) is ColumnMap:
+            return {col: self._data[col] for col in self._column_names}
         return self._data
 
     def to_dict(self) -> Dict[str, Any]:
@@ -685,7 +1102,7 @@ class BiocFrame(ut.BiocObject):
         Returns:
             True if the column exists, Otherwise False.
         """
-        return name in self.column_names
+        return name in self._data
 
     def get_column(self, column: Union[str, int]) -> Any:
         """Get the contents of the specified column.
@@ -708,7 +1125,8 @@ class BiocFrame(ut.BiocObject):
 
             return self._data[self._column_names[column]]
         elif isinstance(column, str):
-            if column not in self._column_names:
+            # Checking the dictionary first, as the column names may need to build their reverse map.
+            if column not in self._data:
                 raise AttributeError(f"Column: {column} does not exist.")
 
             return self._data[column]
@@ -735,7 +1153,7 @@ class BiocFrame(ut.BiocObject):
 
         return name in self.row_names
 
-    def get_row(self, row: Union[str, int]) -> Dict[str, Any]:
+    def get_row(self, row: Union[str, int, Any], by: Optional[str] = None) -> Dict[str, Any]:
         """Get a specified row.
 
         Args:
@@ -746,11 +1164,23 @@ class BiocFrame(ut.BiocObject):
                 string may be supplied instead. The first occurrence of the
                 string in the row names is used.
 
+                If ``by`` is provided, this should be a value of the ``by``
+                column instead. The first row containing this value is used.
+
+            by:
+                Name of a key column to look up ``row`` in. This uses the index
+                created by :py:meth:`~create_index` if one is available.
+
         Returns:
             A dictionary where the keys are column names and the values are
             the contents of the columns at the specified ``row``.
         """
-        if isinstance(row, str):
+        if by is not None:
+            row_idx = self._find_hash_index(by).get(row)
+            if row_idx < 0:
+                raise ValueError(f"Could not find '{row}' in column '{by}'.")
+            row = row_idx
+        elif isinstance(row, str):
             if self._row_names is None:
                 raise ValueError("No row names present to find row '" + row + "'.")
 
@@ -823,6 +1253,7 @@ class BiocFrame(ut.BiocObject):
 
         return self[rows - n : rows, :]
 
+    @instrumented("get_slice")
     def get_slice(
         self,
         rows: Union[str, int, bool, Sequence[Union[str, int, bool]], slice],
@@ -865,7 +1296,7 @@ class BiocFrame(ut.BiocObject):
         new_number_of_rows = self.shape[0]
         if not (isinstance(rows, slice) and rows == slice(None)):
             new_row_names = self.row_names
-            new_row_indices, _ = ut.normalize_subscript(rows, self.shape[0], new_row_names)
+            new_row_indices = _normalize_rows(rows, self.shape[0], new_row_names)
 
             new_number_of_rows = len(new_row_indices)
             for k, v in new_data.items():
@@ -878,17 +1309,162 @@ class BiocFrame(ut.BiocObject):
             if columns != slice(None):
                 column_data = column_data.slice(new_column_indices, slice(None))
 
-        current_class_const = type(self)
-        return current_class_const(
-            data=new_data,
+        output = type(self)._from_parts(
+            new_data,
             number_of_rows=new_number_of_rows,
             row_names=new_row_names,
             column_names=new_column_names,
+            column_data=column_data,
             metadata=self._metadata,
+        )
+
+        if self._indexes and isinstance(rows, slice) and rows == slice(None):
+            # Row order is unchanged, so indexes on the retained columns are still valid.
+            for key, index in self._indexes.items():
+                if all(c in new_data for c in index.columns):
+                    output._register_index(key, index)
+
+        return output
+
+    def filter(
+        self,
+        mask_or_predicate: Union[Sequence[bool], numpy.ndarray, Callable[[BiocFrame], Sequence[bool]]],
+        columns: Optional[Union[str, int, bool, Sequence[Union[str, int, bool]], slice]] = None,
+    ) -> BiocFrame:
+        """Extract the rows of the ``BiocFrame`` that satisfy a condition.
+
+        This is equivalent to :py:meth:`~get_slice` with a boolean vector,
+        but converts the mask into row indices once with
+        :py:func:`~numpy.flatnonzero` and gathers each NumPy column directly,
+        skipping the element-wise checks of
+        :py:meth:`~biocutils.normalize_subscript.normalize_subscript`.
+
+        Args:
+            mask_or_predicate:
+                Boolean vector of length equal to the number of rows,
+                specifying the rows to retain. Masked values in a NumPy
+                masked array are treated as False.
+
+                Alternatively, a function that accepts the ``BiocFrame`` and
+                returns such a vector.
+
+            columns:
+                Columns to retain, as supported by :py:meth:`~get_slice`.
+                Only these columns are subsetted. If None, all columns are
+                retained.
+
+        Returns:
+            A ``BiocFrame`` containing the selected rows and columns.
+        """
+        mask = mask_or_predicate(self) if callable(mask_or_predicate) else mask_or_predicate
+        mask = _as_row_mask(mask, self.shape[0])
+
+        new_column_names = self._column_names
+        new_column_indices = slice(None)
+        if columns is not None and not (isinstance(columns, slice) and columns == slice(None)):
+            new_column_indices, _ = ut.normalize_subscript(columns, len(new_column_names), new_column_names)
+            new_column_names = ut.subset_sequence(new_column_names, new_column_indices)
+
+        indices = numpy.flatnonzero(mask)
+        everything = len(indices) == len(mask)
+
+        new_data = {}
+        for col in new_column_names:
+            value = self._data[col]
+            if everything:
+                new_data[col] = value
+            elif isinstance(value, numpy.ndarray):
+                new_data[col] = value[indices]
+            else:
+                new_data[col] = ut.subset(value, indices)
+
+        new_row_names = self._row_names
+        if new_row_names is not None and not everything:
+            new_row_names = ut.subset_sequence(self.row_names, indices)
+
+        column_data = self._column_data
+        if column_data is not None and not isinstance(new_column_indices, slice):
+            column_data = column_data.slice(new_column_indices, slice(None))
+
+        output = type(self)._from_parts(
+            new_data,
+            number_of_rows=len(indices),
+            row_names=new_row_names,
+            column_names=new_column_names,
             column_data=column_data,
-            _validate=False,
+            metadata=self._metadata,
         )
 
+        if self._indexes and everything:
+            for key, index in self._indexes.items():
+                if all(c in new_data for c in index.columns):
+                    output._register_index(key, index)
+
+        return output
+
+    def eval(self, expr: Union[str, Expression], chunk_size: Optional[int] = None) -> numpy.ndarray:
+        """Evaluate an expression over the columns of the ``BiocFrame``.
+
+        Args:
+            expr:
+                String containing an expression, e.g.,
+                ``"log1p(counts) / size_factor"``. See
+                :py:class:`~biocframe.expressions.Expression` for the
+                supported grammar. Alternatively, a pre-parsed ``Expression``.
+
+            chunk_size:
+                Number of rows to evaluate at a time, see
+                :py:meth:`~biocframe.expressions.Expression.evaluate`.
+
+        Returns:
+            NumPy array of length equal to the number of rows, containing
+            the result of the expression for each row.
+        """
+        if not isinstance(expr, Expression):
+            expr = Expression(expr)
+        return expr.evaluate(self, chunk_size=chunk_size)
+
+    def query(
+        self,
+        expr: Union[str, Expression],
+        columns: Optional[Union[str, int, bool, Sequence[Union[str, int, bool]], slice]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> BiocFrame:
+        """Extract the rows of the ``BiocFrame`` that satisfy a boolean expression.
+
+        Args:
+            expr:
+                String containing an expression, e.g.,
+                ``"qval < 0.05 and abs(lfc) > 1"``. See
+                :py:class:`~biocframe.expressions.Expression` for the
+                supported grammar. Alternatively, a pre-parsed ``Expression``.
+                Rows where the result is missing are not retained.
+
+            columns:
+                Columns to retain, see :py:meth:`~filter`.
+
+            chunk_size:
+                Number of rows to evaluate at a time, see
+                :py:meth:`~biocframe.expressions.Expression.evaluate`.
+
+        Returns:
+            A ``BiocFrame`` containing the selected rows and columns.
+        """
+        mask = self.eval(expr, chunk_size=chunk_size)
+        if mask.dtype != numpy.bool_:
+            raise TypeError("'expr' should evaluate to a boolean vector.")
+        return self.filter(mask, columns=columns)
+
+    def lazy(self) -> LazyBiocFrame:
+        """Start a query plan over the ``BiocFrame``.
+
+        Returns:
+            A :py:class:`~biocframe.lazy.LazyBiocFrame` that records
+            subsequent steps and only executes them, after optimization, when
+            :py:meth:`~biocframe.lazy.LazyBiocFrame.collect` is called.
+        """
+        return LazyBiocFrame(self)
+
     def slice(
         self,
         rows: Optional[Union[Sequence[Union[str, int, bool]], slice]],
@@ -1021,20 +1597,21 @@ class BiocFrame(ut.BiocObject):
             or as a reference to the (in-place-modified) original.
         """
         output = self._define_output(in_place)
-        if not in_place:
-            output._data = copy(output._data)
+        output._mutable_data()
 
-        row_idx, _ = ut.normalize_subscript(rows, output.shape[0], names=output._row_names)
+        row_idx = _normalize_rows(rows, output.shape[0], output._row_names)
+        row_sel = _as_numpy_selector(row_idx)
 
         col_idx, _ = ut.normalize_subscript(columns, output.shape[1], names=output._column_names)
 
         for i, x in enumerate(col_idx):
             nm = output._column_names[x]
-            output._data[nm] = ut.assign(
-                output._data[nm],
-                row_idx,
-                replacement=value._data[value._column_names[i]],
-            )
+            replacement = value._data[value._column_names[i]]
+            if type(output._data[nm]) is numpy.ndarray:
+                # Same as ut.assign(), but the copy is skipped if no other object can see the column.
+                output._writable_column(nm)[row_sel] = replacement
+            else:
+                output._data[nm] = ut.assign(output._data[nm], row_idx, replacement=replacement)
 
         return output
 
@@ -1091,9 +1668,9 @@ class BiocFrame(ut.BiocObject):
             or as a reference to the (in-place-modified) original.
         """
         output = self._define_output(in_place)
-        if not in_place:
-            output._data = copy(output._data)
-        is_colnames_copied = False
+        # Column names are shared along with the dictionary of columns, so they must be copied before appending.
+        is_colnames_copied = not output._data_shared
+        output._mutable_data()
         previous = len(output._column_names)
 
         for column, value in columns.items():
@@ -1112,10 +1689,12 @@ class BiocFrame(ut.BiocObject):
             if isinstance(column, int):
                 column = output._column_names[column]
             elif column not in output._data:
-                if not in_place and not is_colnames_copied:
-                    output._column_names = copy(output._column_names)
+                names = output._column_names
+                if type(output._data) is ColumnMap and not isinstance(names, PersistentNames):
+                    names = PersistentNames(names)
                     is_colnames_copied = True
-                output._column_names.append(column)
+                output._column_names = names.safe_append(column, in_place=is_colnames_copied)
+                is_colnames_copied = True
 
             output._data[column] = value
 
@@ -1161,8 +1740,7 @@ class BiocFrame(ut.BiocObject):
             TypeError: If columns contains mixed types.
         """
         output = self._define_output(in_place)
-        if not in_place:
-            output._data = copy(output._data)
+        output._mutable_data()
 
         if isinstance(columns, slice):
             indices = range(*columns.indices(len(output._column_names)))
@@ -1234,54 +1812,90 @@ class BiocFrame(ut.BiocObject):
             TypeError: If rows contain mixed types.
         """
         output = self._define_output(in_place)
-        if not in_place:
-            output._data = copy(output._data)
+        output._mutable_data()
 
         _row_names = output._row_names
-        if output._row_names is None:
-            # raise ValueError("Cannot remove rows when row names are not defined.")
-            _row_names = range(len(output))
+        nrows = output.shape[0]
 
         if isinstance(rows, slice):
-            indices = range(*rows.indices(len(_row_names)))
-            killset = {_row_names[i] for i in indices}
+            killpos = range(*rows.indices(nrows))
         else:
             # Check for homogeneous types
             types = set(type(x) for x in rows)
             if len(types) > 1:
                 raise TypeError("rows must contain all strings or all integers")
 
-            killset = set()
+            killpos = []
             for name in rows:
                 if isinstance(name, int):
-                    if name < 0 or name >= len(_row_names):
+                    if name < 0 or name >= nrows:
                         raise IndexError(f"Row index {name} is out of range.")
-                    name = _row_names[name]
-
-                if name not in _row_names:
-                    raise ValueError(f"Row '{name}' does not exist.")
-                killset.add(name)
-
-        keep = []
-        for i, row in enumerate(_row_names):
-            if row not in killset:
-                keep.append(i)
+                    killpos.append(name)
+                else:
+                    i = -1 if _row_names is None else _row_names.map(name)
+                    if i < 0:
+                        raise ValueError(f"Row '{name}' does not exist.")
+                    killpos.append(i)
+
+        if _row_names is not None:
+            # All rows sharing a name with a removed row are also removed.
+            killset = {_row_names[i] for i in killpos}
+            keep = [i for i, row in enumerate(_row_names) if row not in killset]
+            output._row_names = ut.subset_sequence(_row_names, keep)
+        else:
+            # Without row names, work directly on the positions.
+            survivors = numpy.ones(nrows, dtype=bool)
+            survivors[numpy.asarray(killpos, dtype=numpy.intp)] = False
+            keep = numpy.flatnonzero(survivors)
 
         for col in output._data:
             output._data[col] = ut.subset_sequence(output._data[col], keep)
 
-        output._row_names = ut.subset_sequence(_row_names, keep)
-
-        output._number_of_rows = int(
-            _guess_number_of_rows(
-                number_of_rows=None,
-                data=output._data,
-                row_names=output._row_names,
-            )
-        )
+        output._number_of_rows = len(keep)
 
         return output
 
+    def batch_update(self, in_place: bool = True) -> BatchUpdate:
+        """Batch multiple column modifications, to be applied together when the returned context manager exits.
+
+        Each call to :py:meth:`~set_columns` or :py:meth:`~remove_columns`
+        processes all columns of the frame, e.g., to copy the dictionary of
+        columns or to extend the column data, so a sequence of ``k``
+        modifications costs O(k * ncol). A batch records the modifications
+        and applies them with a single pass over the columns instead.
+
+        .. code-block:: python
+
+            with (
+                frame.batch_update() as b
+            ):
+                b.set_column(
+                    "score",
+                    score,
+                )
+                b.rename_column(
+                    "old", "new"
+                )
+                b.remove_column(
+                    "tmp"
+                )
+                b.set_slice(
+                    [0, 1],
+                    ["score"],
+                    replacement,
+                )
+
+        Args:
+            in_place:
+                Whether to modify this object in place. Otherwise, the
+                modifications are applied to a copy, which is available from
+                :py:attr:`~biocframe.batch.BatchUpdate.result` after exit.
+
+        Returns:
+            A :py:class:`~biocframe.batch.BatchUpdate` object.
+        """
+        return BatchUpdate(self, in_place=in_place)
+
     #########################
     ######>> Copying <<######
     #########################
@@ -1307,14 +1921,13 @@ class BiocFrame(ut.BiocObject):
             except Exception as e:
                 raise Exception(f"Cannot `deepcopy` column '{col}', full error: {str(e)}") from e
 
-        current_class_const = type(self)
-        return current_class_const(
+        return type(self)._from_parts(
             _data_copy,
             number_of_rows=_num_rows_copy,
             row_names=_rownames_copy,
             column_names=_colnames_copy,
-            metadata=_metadata_copy,
             column_data=_column_data_copy,
+            metadata=_metadata_copy,
         )
 
     def __copy__(self) -> BiocFrame:
@@ -1322,27 +1935,341 @@ class BiocFrame(ut.BiocObject):
         Returns:
             A shallow copy of the current ``BiocFrame``.
         """
-        current_class_const = type(self)
-        new_instance = current_class_const(
+        new_instance = type(self)._from_parts(
             self._data,
             number_of_rows=self._number_of_rows,
             row_names=self._row_names,
             column_names=self._column_names,
-            metadata=self._metadata,
             column_data=self._column_data,
-            _validate=False,
+            metadata=self._metadata,
         )
+        if self._indexes:
+            new_instance._indexes = copy(self._indexes)
 
+        # Copy-on-write: the dictionary of columns is shared until either object modifies it.
+        self._data_shared = True
+        new_instance._data_shared = True
+        new_instance._data_copies = self._data_copies
         return new_instance
 
     def copy(self) -> BiocFrame:
         """Alias for :py:meth:`~__copy__`."""
         return self.__copy__()
 
+    ##########################
+    ######>> Indexing <<######
+    ##########################
+
+    def _register_index(self, key: Tuple[str, ...], index: Any) -> None:
+        # The registry is only created when needed, to keep index-free instances small.
+        if self._indexes is None:
+            self._indexes = {}
+        self._indexes[key] = index
+
+    def _get_valid_index(self, key: Tuple[str, ...]) -> Optional[Any]:
+        if self._indexes is None:
+            return None
+        index = self._indexes.get(key)
+        if index is None:
+            return None
+
+        sources = []
+        for col in index.columns:
+            if col not in self._data:
+                break
+            sources.append(self._data[col])
+        else:
+            if index.is_valid_for(*sources):
+                return index
+
+        # Dropping stale indexes, e.g., after the key column was replaced.
+        del self._indexes[key]
+        return None
+
+    def _find_hash_index(self, column: str) -> HashIndex:
+        index = self.get_index(column)
+        if index is None:
+            if column not in self._data:
+                raise ValueError(f"'{column}' is not a valid column name.")
+            index = HashIndex(column, self._data[column])
+        return index
+
+    def create_index(self, column: str, unique: bool = False) -> HashIndex:
+        """Create a hash index on a column for fast lookups by value.
+
+        The index is attached to this object and is used by
+        :py:meth:`~get_row`, :py:meth:`~loc_by` and :py:func:`~merge`.
+        It is shared with shallow copies (e.g., from :py:meth:`~copy` or
+        column-only slicing by :py:meth:`~get_slice`) until the indexed
+        column is replaced. In-place modifications to the contents of
+        the column itself are not tracked.
+
+        Args:
+            column:
+                Name of the column to index.
+
+            unique:
+                Whether the column values should be unique.
+                If True, an error is raised for duplicated values.
+
+        Returns:
+            The newly created index.
+        """
+        if column not in self._data:
+            raise ValueError(f"'{column}' is not a valid column name.")
+
+        index = HashIndex(column, self._data[column], unique=unique)
+        self._register_index(("hash", column), index)
+        return index
+
+    def get_index(self, column: str) -> Optional[HashIndex]:
+        """Get the hash index for a column.
+
+        Args:
+            column:
+                Name of the column.
+
+        Returns:
+            The index created by :py:meth:`~create_index`, or None if no index
+            exists or the column has since been replaced.
+        """
+        return self._get_valid_index(("hash", column))
+
+    def drop_index(self, column: str) -> None:
+        """Drop all indexes involving a column, if any exist.
+
+        Args:
+            column:
+                Name of the column.
+        """
+        if self._indexes is None:
+            return
+        for key in [k for k, v in self._indexes.items() if column in v.columns]:
+            del self._indexes[key]
+
+    def create_sorted_index(self, column: str) -> SortedIndex:
+        """Create a sorted index on a numeric column for fast range queries with :py:meth:`~range_query`.
+
+        If the column is already sorted, no permutation is stored. Like
+        :py:meth:`~create_index`, the index is shared with shallow copies
+        until the column is replaced.
+
+        Args:
+            column:
+                Name of the column to index.
+
+        Returns:
+            The newly created index.
+        """
+        if column not in self._data:
+            raise ValueError(f"'{column}' is not a valid column name.")
+
+        index = SortedIndex(column, self._data[column])
+        self._register_index(("sorted", column), index)
+        return index
+
+    def get_sorted_index(self, column: str) -> Optional[SortedIndex]:
+        """Get the sorted index for a column.
+
+        Args:
+            column:
+                Name of the column.
+
+        Returns:
+            The index created by :py:meth:`~create_sorted_index`, or None if no
+            index exists or the column has since been replaced.
+        """
+        return self._get_valid_index(("sorted", column))
+
+    def range_query(
+        self,
+        column: str,
+        lo: Any = None,
+        hi: Any = None,
+        only_indices: bool = False,
+    ) -> Union[BiocFrame, numpy.ndarray]:
+        """Extract rows where the values of a numeric column lie in the closed range ``[lo, hi]``.
+
+        This uses binary search on the index created by
+        :py:meth:`~create_sorted_index`, taking O(log n + k) time for k
+        matching rows. If no index is available, a temporary one is created.
+
+        Args:
+            column:
+                Name of the column.
+
+            lo:
+                Lower bound, inclusive. If None, the range is unbounded below.
+
+            hi:
+                Upper bound, inclusive. If None, the range is unbounded above.
+
+            only_indices:
+                Whether to only return the row indices.
+
+        Returns:
+            A ``BiocFrame`` containing the matching rows in their original
+            order. If ``only_indices`` is True, an integer array of the
+            positions of those rows is returned instead.
+        """
+        index = self.get_sorted_index(column)
+        if index is None:
+            if column not in self._data:
+                raise ValueError(f"'{column}' is not a valid column name.")
+            index = SortedIndex(column, self._data[column])
+
+        rows = index.query(lo, hi)
+        if only_indices:
+            if isinstance(rows, slice):
+                rows = numpy.arange(rows.start, rows.stop)
+            return rows
+
+        return self.get_slice(rows, slice(None))
+
+    def _make_interval_index(self, start: str, end: str, group: Optional[str]) -> IntervalIndex:
+        for col in (start, end) if group is None else (start, end, group):
+            if col not in self._data:
+                raise ValueError(f"'{col}' is not a valid column name.")
+
+        return IntervalIndex(
+            start,
+            end,
+            self._data[start],
+            self._data[end],
+            group=group,
+            group_values=None if group is None else self._data[group],
+        )
+
+    def create_interval_index(
+        self, start: str = "start", end: str = "end", group: Optional[str] = None
+    ) -> IntervalIndex:
+        """Create an interval index over start/end columns for overlap queries with :py:meth:`~find_overlaps`.
+
+        Like :py:meth:`~create_index`, the index is shared with shallow copies
+        until any of the indexed columns are replaced.
+
+        Args:
+            start:
+                Name of the column containing the interval starts.
+
+            end:
+                Name of the column containing the interval ends, inclusive.
+
+            group:
+                Name of the column containing the group of each interval,
+                e.g., the chromosome. Only intervals in the same group can
+                overlap. If None, all intervals are considered together.
+
+        Returns:
+            The newly created index.
+        """
+        index = self._make_interval_index(start, end, group)
+        self._register_index(("interval", start, end, group), index)
+        return index
+
+    def get_interval_index(
+        self, start: str = "start", end: str = "end", group: Optional[str] = None
+    ) -> Optional[IntervalIndex]:
+        """Get the interval index for a set of columns.
+
+        Args:
+            start:
+                Name of the column containing the interval starts.
+
+            end:
+                Name of the column containing the interval ends.
+
+            group:
+                Name of the column containing the group of each interval.
+
+        Returns:
+            The index created by :py:meth:`~create_interval_index`, or None if
+            no index exists or any of the columns have since been replaced.
+        """
+        return self._get_valid_index(("interval", start, end, group))
+
+    def find_overlaps(
+        self,
+        starts: Any,
+        ends: Any,
+        groups: Optional[Any] = None,
+        start: str = "start",
+        end: str = "end",
+        group: Optional[str] = None,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Find rows whose intervals overlap each query interval.
+
+        This uses the index created by :py:meth:`~create_interval_index`
+        if one is available, otherwise a temporary index is created.
+
+        Args:
+            starts:
+                Start positions of the query intervals.
+
+            ends:
+                End positions of the query intervals, inclusive.
+
+            groups:
+                Group of each query interval, required if ``group`` is provided.
+
+            start:
+                Name of the column containing the interval starts.
+
+            end:
+                Name of the column containing the interval ends, inclusive.
+
+            group:
+                Name of the column containing the group of each interval.
+
+        Returns:
+            Tuple of two integer arrays, containing the query index and the row
+            index for each overlapping pair. See
+            :py:meth:`~biocframe.indexes.IntervalIndex.find_overlaps` for details.
+        """
+        index = self.get_interval_index(start, end, group)
+        if index is None:
+            index = self._make_interval_index(start, end, group)
+        return index.find_overlaps(starts, ends, groups=groups)
+
+    def loc_by(
+        self,
+        column: str,
+        keys: Union[Any, Sequence[Any]],
+        columns: Optional[Union[str, int, bool, Sequence[Union[str, int, bool]], slice]] = None,
+    ) -> BiocFrame:
+        """Slice the rows of the ``BiocFrame`` by values of a key column.
+
+        Args:
+            column:
+                Name of the key column. If :py:meth:`~create_index` was called
+                for this column, its index is used for the lookup.
+
+            keys:
+                Values of the key column to extract. This may be a scalar, which
+                is treated as a length-1 sequence. All rows containing each key
+                are returned, in the order of ``keys``.
+
+            columns:
+                Columns to be extracted, see :py:meth:`~get_slice` for details.
+                Defaults to all columns.
+
+        Returns:
+            A ``BiocFrame`` with the rows matching ``keys``.
+        """
+        if columns is None:
+            columns = slice(None)
+
+        if isinstance(keys, str) or not isinstance(keys, (abc.Sequence, numpy.ndarray, ut.Names)):
+            keys = [keys]
+
+        rows = self._find_hash_index(column).locate(keys)
+        return self.get_slice(rows, columns)
+
     ##########################
     ######>> split by <<######
     ##########################
 
+    @instrumented("split")
     def split(self, column_name: str, only_indices: bool = False) -> Dict[str, Union[BiocFrame, List[int]]]:
         """Split the object by a column.
 
@@ -1367,12 +2294,37 @@ class BiocFrame(ut.BiocObject):
         _column = self.get_column(column_name)
 
         _grps = {}
-        for i in range(len(self)):
-            _key = _column[i]
-            if _key not in _grps:
-                _grps[_key] = []
+        if isinstance(_column, ut.Factor):
+            # Grouping on the integer codes, ordered by first appearance as for other columns.
+            codes = numpy.asarray(_column.get_codes())
+            uniq, first = numpy.unique(codes, return_index=True)
+            order = numpy.argsort(codes, kind="stable")
+            bounds = numpy.searchsorted(codes[order], uniq, side="right")
+            levels = _column.get_levels()
+            starts = numpy.concatenate([[0], bounds[:-1]])
+            for j in numpy.argsort(first, kind="stable").tolist():
+                c = int(uniq[j])
+                _grps[None if c < 0 else levels[c]] = order[starts[j] : bounds[j]].tolist()
+        elif (
+            isinstance(_column, numpy.ndarray)
+            and not numpy.ma.isMaskedArray(_column)
+            and _column.ndim == 1
+            and (_column.dtype.kind in "biuUS" or (_column.dtype.kind == "f" and not numpy.isnan(_column).any()))
+        ):
+            # Same as for factors, but on the unique values of the array.
+            uniq, first, inverse = numpy.unique(_column, return_index=True, return_inverse=True)
+            order = numpy.argsort(inverse, kind="stable")
+            bounds = numpy.cumsum(numpy.bincount(inverse, minlength=len(uniq)))
+            starts = numpy.concatenate([[0], bounds[:-1]])
+            for j in numpy.argsort(first, kind="stable").tolist():
+                _grps[uniq[j].item()] = order[starts[j] : bounds[j]].tolist()
+        else:
+            for i in range(len(self)):
+                _key = _column[i]
+                if _key not in _grps:
+                    _grps[_key] = []
 
-            _grps[_key].append(i)
+                _grps[_key].append(i)
 
         if only_indices is True:
             return _grps
@@ -1424,7 +2376,7 @@ class BiocFrame(ut.BiocObject):
             A ``BiocFrame`` object.
         """
 
-        from pandas import DataFrame
+        from pandas import DataFrame, RangeIndex
 
         if not isinstance(input, DataFrame):
             raise TypeError("`data` is not a pandas `DataFrame` object.")
@@ -1432,7 +2384,10 @@ class BiocFrame(ut.BiocObject):
         rdata = input.to_dict("list")
         rindex = None
 
-        if input.index is not None:
+        if isinstance(input.index, RangeIndex):
+            # Avoid creating strings for the default integer index.
+            rindex = RangeNames(range(input.index.start, input.index.stop, input.index.step))
+        elif input.index is not None:
             rindex = input.index.to_list()
 
         return cls(data=rdata, row_names=rindex, column_names=input.columns.to_list())
@@ -1512,6 +2467,10 @@ class BiocFrame(ut.BiocObject):
                     _data_copy[f"{col}{delim}{k}"] = _res[k]
             elif isinstance(_cold, ut.Factor):
                 _data_copy[col] = _cold.to_pandas()
+            elif isinstance(_cold, ChunkedArray):
+                _data_copy[col] = _cold.consolidate()
+            elif isinstance(_cold, NullableArray):
+                _data_copy[col] = _cold.to_masked()
             else:
                 _data_copy[col] = _cold
 
@@ -1523,6 +2482,209 @@ class BiocFrame(ut.BiocObject):
 
         return _data_copy
 
+    def consolidate(self, in_place: bool = False) -> BiocFrame:
+        """Flatten all :py:class:`~biocframe.chunked.ChunkedArray` columns into regular NumPy arrays.
+
+        This is typically called after a series of :py:meth:`~combine_rows`
+        operations on frames with chunked columns, once no more rows are to
+        be appended.
+
+        Args:
+            in_place:
+                Whether to modify the ``BiocFrame`` object in place.
+
+        Returns:
+            A modified ``BiocFrame`` object, either as a copy of the original
+            or as a reference to the (in-place-modified) original.
+        """
+        chunked = {}
+        for col in self._column_names:
+            val = self._data[col]
+            if isinstance(val, ChunkedArray):
+                chunked[col] = val.consolidate()
+
+        output = self._define_output(in_place)
+        if len(chunked):
+            output._mutable_data().update(chunked)
+        return output
+
+    def encode_strings(
+        self, threshold: float = 0.5, columns: Optional[Sequence[str]] = None, in_place: bool = False
+    ) -> BiocFrame:
+        """Convert low-cardinality string columns into :py:class:`~biocutils.Factor` objects.
+
+        Each string is then represented by an integer code, which reduces
+        memory usage and allows :py:meth:`~split`, :py:func:`~merge` and
+        equality checks to operate on the codes directly.
+
+        Args:
+            threshold:
+                Maximum number of distinct strings in a column, as a proportion
+                of the number of rows, for the column to be converted.
+
+            columns:
+                Names of the columns to consider. If None, all columns are
+                considered. Only lists and NumPy object arrays that contain
+                strings (or None, for missing values) are converted.
+
+            in_place:
+                Whether to modify the ``BiocFrame`` object in place.
+
+        Returns:
+            A modified ``BiocFrame`` object, either as a copy of the original
+            or as a reference to the (in-place-modified) original.
+        """
+        if columns is None:
+            columns = self._column_names
+        max_levels = max(int(threshold * self._number_of_rows), 1)
+
+        encoded = {}
+        for col in columns:
+            if col not in self._data:
+                raise ValueError(f"'{col}' is not a valid column name.")
+            val = self._data[col]
+            if isinstance(val, list) or (isinstance(val, numpy.ndarray) and val.dtype == object and val.ndim == 1):
+                fac = _encode_strings(val, max_levels)
+                if fac is not None:
+                    encoded[col] = fac
+
+        output = self._define_output(in_place)
+        if len(encoded):
+            output._mutable_data().update(encoded)
+        return output
+
+    def _memory_usage_sizes(self, deep: bool, seen: set) -> Tuple[List[str], List[str], numpy.ndarray]:
+        names = []
+        kinds = []
+        sizes = []
+        for col in self._column_names:
+            names.append(col)
+            kinds.append("column")
+            sizes.append(_sizeof(self._data[col], deep, seen))
+
+        for kind, val in (
+            ("row_names", self._row_names),
+            ("column_names", self._column_names),
+            ("column_data", self._column_data),
+            ("metadata", self._metadata),
+        ):
+            names.append(kind)
+            kinds.append(kind)
+            sizes.append(0 if val is None else _sizeof(val, deep, seen))
+
+        return names, kinds, numpy.array(sizes, dtype=numpy.int64)
+
+    def memory_usage(self, deep: bool = True) -> BiocFrame:
+        """Report the memory used by each component of the ``BiocFrame``.
+
+        Args:
+            deep:
+                Whether to include the Python objects referenced by each
+                column, e.g., the strings in a list. If False, only the storage
+                for the references themselves is counted for lists and NumPy
+                object arrays. Objects that are referenced multiple times
+                (e.g., the same array in two columns) are only counted once.
+
+        Returns:
+            A ``BiocFrame`` with one row per column, followed by rows for the
+            row names, column names, column data and metadata. This contains
+            the ``bytes`` used by each component, and the ``kind`` of each
+            component, i.e., ``"column"`` or the name of the component.
+            Nested ``BiocFrame`` columns are counted recursively.
+        """
+        names, kinds, sizes = self._memory_usage_sizes(deep, set())
+        return BiocFrame({"bytes": sizes, "kind": kinds}, row_names=names)
+
+    def __sizeof__(self) -> int:
+        """
+        Returns:
+            Total size of the ``BiocFrame`` in bytes, including the contents
+            of all columns, see :py:meth:`~memory_usage`.
+        """
+        return object.__sizeof__(self) + int(self._memory_usage_sizes(True, {id(self)})[2].sum())
+
+    def optimize_dtypes(
+        self, allow_float32: bool = False, columns: Optional[Sequence[str]] = None, in_place: bool = False
+    ) -> Tuple[BiocFrame, BiocFrame]:
+        """Convert numeric columns to more compact representations.
+
+        - Integer arrays are downcast to the smallest integer type (of the same
+          signedness) that holds all values.
+        - Double-precision arrays are converted to single precision, if
+          ``allow_float32 = True`` and all values are in range.
+        - Lists of booleans or numbers are converted into NumPy arrays (and
+          downcast as above). Lists containing Nones are converted into a
+          :py:class:`~biocframe.nullable.NullableArray`.
+
+        Args:
+            allow_float32:
+                Whether to allow a loss of precision by converting
+                double-precision values into single precision.
+
+            columns:
+                Names of the columns to consider. If None, all columns are considered.
+
+            in_place:
+                Whether to modify the ``BiocFrame`` object in place.
+
+        Returns:
+            A tuple containing the modified ``BiocFrame``, either as a copy of
+            the original or as a reference to the (in-place-modified)
+            original; and a ``BiocFrame`` with one row per converted column,
+            containing the ``before`` and ``after`` sizes in bytes, the number
+            of bytes ``saved`` and the new ``dtype``.
+        """
+        if columns is None:
+            columns = self._column_names
+
+        optimized = {}
+        for col in columns:
+            if col not in self._data:
+                raise ValueError(f"'{col}' is not a valid column name.")
+
+            val = self._data[col]
+            if isinstance(val, list) and len(val):
+                converted = _promote_sequence(val)
+                if converted is None:
+                    continue
+            elif isinstance(val, NullableArray):
+                converted = val
+            elif isinstance(val, numpy.ndarray) and val.ndim == 1 and not numpy.ma.isMaskedArray(val):
+                converted = val
+            else:
+                continue
+
+            if numpy.ma.isMaskedArray(converted):
+                converted = NullableArray(converted)
+            if isinstance(converted, NullableArray):
+                values = _downcast_array(converted.values, ~converted.mask, allow_float32)
+                if values is not converted.values or converted is not val:
+                    converted = NullableArray(values, _bitmap=converted.validity)
+            else:
+                converted = _downcast_array(converted, None, allow_float32)
+
+            if converted is not val:
+                optimized[col] = converted
+
+        report_names = list(optimized.keys())
+        before = numpy.array([_sizeof(self._data[col], True, set()) for col in report_names], dtype=numpy.int64)
+        after = numpy.array([_sizeof(optimized[col], True, set()) for col in report_names], dtype=numpy.int64)
+        report = BiocFrame(
+            {
+                "before": before,
+                "after": after,
+                "saved": before - after,
+                "dtype": [str(optimized[col].dtype) for col in report_names],
+            },
+            number_of_rows=len(report_names),
+            row_names=report_names,
+        )
+
+        output = self._define_output(in_place)
+        if len(optimized):
+            output._mutable_data().update(optimized)
+        return output, report
+
     # TODO: very primitive implementation, needs very robust testing
     # TODO: implement in-place, view
     def __array_ufunc__(self, func: Any, method: str, *inputs: Any, **kwargs: Any) -> BiocFrame:
@@ -1589,11 +2751,97 @@ class BiocFrame(ut.BiocObject):
             rename_duplicate_columns=rename_duplicate_columns,
         )
 
+    def upsert(self, other: BiocFrame, by: Optional[str] = None, in_place: bool = False) -> BiocFrame:
+        """Update existing rows and insert new rows from another ``BiocFrame``, matching rows by a key.
+
+        Rows of ``other`` whose key is present in this object overwrite the
+        matching rows with a single scatter per column, as in
+        :py:meth:`~set_slice`. All remaining rows of ``other`` are appended
+        in one combining step, with missing values for any columns that are
+        absent from ``other``.
+
+        If a hash index was created on the key column by
+        :py:meth:`~create_index`, it is used to match the keys and is extended
+        with the appended rows, so it does not need to be rebuilt.
+
+        Args:
+            other:
+                Object containing the rows to update or insert. All of its
+                columns should be present in this object.
+
+            by:
+                Name of the key column, which should be present in both
+                objects. If None, rows are matched by their row names.
+
+            in_place:
+                Whether to modify the object in place.
+
+        Raises:
+            ValueError:
+                If keys are duplicated in either object, or if ``other``
+                contains columns that are not present in this object.
+
+        Returns:
+            A modified ``BiocFrame`` object, either as a copy of the original
+            or as a reference to the (in-place-modified) original.
+        """
+        if by is None:
+            if self._row_names is None or other._row_names is None:
+                raise ValueError("Both objects should have row names when 'by = None'.")
+            index = HashIndex("row_names", self._row_names)
+            keys = _as_key_list(other._row_names)
+            registered = False
+        else:
+            if not other.has_column(by):
+                raise ValueError(f"'{by}' is not a valid column name in 'other'.")
+            index = self.get_index(by)
+            registered = index is not None
+            if not registered:
+                index = self._find_hash_index(by)
+            keys = _as_key_list(other._data[by])
+
+        if not index.unique:
+            raise ValueError("Keys should be unique in the current object.")
+        if len(set(keys)) != len(keys):
+            raise ValueError("Keys should be unique in 'other'.")
+        for col in other._column_names:
+            if col not in self._data:
+                raise ValueError(f"Column '{col}' in 'other' does not exist in the current object.")
+
+        positions = index.map(keys)
+        found = positions >= 0
+        matched = numpy.flatnonzero(found)
+        inserted = numpy.flatnonzero(~found)
+
+        output = self._define_output(in_place)
+        if len(inserted):
+            # Appending before scattering, so that the updates are written
+            # into the newly allocated columns rather than copying them twice.
+            start = output._number_of_rows
+            combined = relaxed_combine_rows(output, other[inserted, :])
+            output._data = combined._data
+            output._data_shared = False
+            output._owned_columns = {
+                k: weakref.ref(v) for k, v in output._data.items() if type(v) is numpy.ndarray and v.base is None
+            }
+            output._row_names = combined._row_names
+            output._number_of_rows = combined._number_of_rows
+            if registered:
+                output._register_index(("hash", by), index.extend(output._data[by], start, in_place=in_place))
+
+        if len(matched):
+            updated = [col for col in other._column_names if col != by]
+            if updated:
+                output.set_slice(positions[matched], updated, other[matched, updated], in_place=True)
+
+        return output
+
 
 ############################
 
 
 @ut.combine_rows.register(BiocFrame)
+@instrumented("combine_rows")
 def _combine_rows_bframes(*x: BiocFrame) -> BiocFrame:
     """Combine multiple BiocFrame objects by row.
 
@@ -1643,25 +2891,27 @@ def _combine_rows_bframes(*x: BiocFrame) -> BiocFrame:
                     + ")."
                 )
             current.append(df.column(col))
-        new_data[col] = ut.combine(*current)
+
+        if any(isinstance(y, NullableArray) for y in current):
+            new_data[col] = combine_nullable(*current)
+        else:
+            new_data[col] = ut.combine(*current)
 
     new_rownames = None
     if has_rownames:
-        new_rownames = []
-        for df in x:
-            other_names = df._row_names
-            if other_names is None:
-                other_names = [""] * df.shape[0]
-            new_rownames += other_names
+        if all(df._row_names is not None for df in x):
+            new_rownames = ut.combine_sequences(*[df._row_names for df in x])
+        else:
+            # Objects without row names only contribute a count of empty names.
+            new_rownames = _combine_partial_names([df.shape[0] if df._row_names is None else df._row_names for df in x])
 
-    current_class_const = type(first)
-    return current_class_const(
+    return type(first)._from_parts(
         new_data,
         number_of_rows=total_nrows,
         row_names=new_rownames,
         column_names=first._column_names,
-        metadata=first._metadata,
         column_data=first._column_data,
+        metadata=first._metadata,
     )
 
 
@@ -1717,14 +2967,13 @@ def _combine_cols_bframes(*x: BiocFrame) -> BiocFrame:
         except Exception as ex:
             raise ValueError("Failed to combine 'column_data' when combining 'BiocFrame' objects by column. " + str(ex))
 
-    current_class_const = type(first)
-    return current_class_const(
+    return type(first)._from_parts(
         all_data,
         number_of_rows=first_nr,
         row_names=first._row_names,
         column_names=all_column_names,
-        metadata=first._metadata,
         column_data=combined_column_data,
+        metadata=first._metadata,
     )
 
 
@@ -1822,11 +3071,8 @@ def _construct_missing(col: Any, n: int) -> Any:
     Returns:
         A missing value.
     """
-    if isinstance(col, numpy.ndarray):
-        return numpy.ma.array(
-            numpy.zeros(n, dtype=col.dtype),
-            mask=True,
-        )
+    if isinstance(col, (numpy.ndarray, NullableArray)):
+        return NullableArray.missing(n, dtype=col.dtype)
     else:
         return [None] * n
 
@@ -1846,7 +3092,8 @@ def relaxed_combine_rows(*x: BiocFrame) -> BiocFrame:
     Returns:
         A ``BiocFrame`` that combines all ``x`` along their rows and contains
         the union of all columns. Columns absent in any ``x`` are filled in
-        with placeholders consisting of Nones or masked NumPy values.
+        with placeholders consisting of Nones, or missing values in a
+        :py:class:`~biocframe.nullable.NullableArray` for NumPy columns.
     """
     if not ut.is_list_of_type(x, BiocFrame):
         raise TypeError("All objects to combine must be BiocFrame objects.")
@@ -1870,14 +3117,337 @@ def relaxed_combine_rows(*x: BiocFrame) -> BiocFrame:
                     df.shape[0],
                 )
 
-        if len(extras):
-            edited.append(df.set_columns(extras))
-        else:
+        if len(extras) == 0:
             edited.append(df)
+        elif df._column_data is None:
+            # Adding the placeholder columns directly, as there is no column data to extend.
+            new_data = copy(df._data)
+            new_data.update(extras)
+            edited.append(
+                type(df)._from_parts(
+                    new_data,
+                    number_of_rows=df._number_of_rows,
+                    row_names=df._row_names,
+                    column_names=df._column_names + ut.Names(extras.keys(), _validate=False),
+                    column_data=None,
+                    metadata=df._metadata,
+                )
+            )
+        else:
+            edited.append(df.set_columns(extras))
 
     return ut.combine_rows(*edited)
 
 
+class _ConcatColumn:
+    """Output buffer for a single column in :py:func:`~concat`.
+
+    NumPy columns are written directly into a preallocated array at the
+    current offset, with a boolean mask that is only created once a missing
+    segment is encountered (in which case a ``NullableArray`` is returned).
+    Columns of any other type (or NumPy columns that cannot be promoted to a
+    common type) are collected as pieces and combined with
+    :py:func:`~biocutils.combine_sequences` at the end.
+    """
+
+    def __init__(self, template: Any, dtype: Optional[numpy.dtype], capacity: int):
+        self.template = template
+        self.filled = 0
+        self.mask = None
+        if dtype is None:
+            self.buffer = None
+            self.pieces = []
+        else:
+            self.buffer = numpy.empty(capacity, dtype=dtype)
+            self.pieces = None
+
+    def _reserve(self, n: int) -> None:
+        needed = self.filled + n
+        capacity = len(self.buffer)
+        if needed <= capacity:
+            return
+
+        capacity = max(2 * capacity, needed)
+        grown = numpy.empty(capacity, dtype=self.buffer.dtype)
+        grown[: self.filled] = self.buffer[: self.filled]
+        self.buffer = grown
+        if self.mask is not None:
+            grown_mask = numpy.zeros(capacity, dtype=numpy.bool_)
+            grown_mask[: self.filled] = self.mask[: self.filled]
+            self.mask = grown_mask
+
+    def _ensure_mask(self) -> None:
+        if self.mask is None:
+            self.mask = numpy.zeros(len(self.buffer), dtype=numpy.bool_)
+
+    def _switch_to_pieces(self) -> None:
+        self.pieces = [self.finish()]
+        self.buffer = None
+        self.mask = None
+
+    def add(self, value: Any, n: int) -> None:
+        if self.buffer is not None:
+            parts = _as_values_and_mask(value)
+            if parts is not None:
+                values, mask = parts
+                try:
+                    dtype = numpy.result_type(self.buffer.dtype, values.dtype)
+                except TypeError:
+                    dtype = None
+                if dtype is not None:
+                    if dtype != self.buffer.dtype:
+                        self.buffer = self.buffer.astype(dtype)
+
+                    self._reserve(n)
+                    end = self.filled + n
+                    self.buffer[self.filled : end] = values
+                    if mask is not None:
+                        self._ensure_mask()
+                        self.mask[self.filled : end] = mask
+                    self.filled = end
+                    return
+
+            self._switch_to_pieces()
+
+        self.pieces.append(value)
+        self.filled += n
+
+    def add_missing(self, n: int) -> None:
+        if self.buffer is not None:
+            self._reserve(n)
+            self._ensure_mask()
+            end = self.filled + n
+            self.mask[self.filled : end] = True
+            self.filled = end
+        else:
+            self.pieces.append(_construct_missing(self.template, n))
+            self.filled += n
+
+    def finish(self) -> Any:
+        if self.buffer is not None:
+            output = self.buffer
+            if len(output) != self.filled:
+                output = output[: self.filled].copy()
+            if self.mask is not None:
+                mask = self.mask[: self.filled]
+                if mask.any():
+                    return NullableArray(output, mask)
+            return output
+
+        if len(self.pieces) == 0:
+            return ut.subset_sequence(self.template, [])
+        if len(self.pieces) == 1:
+            return self.pieces[0]
+        return ut.combine(*self.pieces)
+
+
+def _promote_sequence(x: Any) -> Optional[numpy.ndarray]:
+    """Convert a list of numbers into a NumPy array, where Nones are masked.
+
+    Returns:
+        A NumPy array, or None if ``x`` cannot be converted into a numeric array.
+    """
+    if isinstance(x, numpy.ndarray):
+        return x
+    if not isinstance(x, (list, tuple)):
+        return None
+
+    present = [y for y in x if y is not None]
+    try:
+        values = numpy.asarray(present)
+    except (TypeError, ValueError):
+        return None
+    if values.ndim != 1 or (len(present) and values.dtype.kind not in "biufc"):
+        return None
+    if len(present) == len(x):
+        return values
+
+    if len(present) == 0:
+        # Booleans are promoted to any other type, so an all-None sequence
+        # does not affect the type of the combined column.
+        values = numpy.zeros(0, dtype=numpy.bool_)
+    mask = numpy.fromiter((y is None for y in x), dtype=numpy.bool_, count=len(x))
+    output = numpy.zeros(len(x), dtype=values.dtype)
+    output[~mask] = values
+    return numpy.ma.array(output, mask=mask)
+
+
+def _prescan_concat(
+    frames: Sequence[BiocFrame], promote: bool
+) -> Tuple[int, Dict[str, Optional[numpy.dtype]], Dict[int, numpy.ndarray]]:
+    total = 0
+    dtypes = {}
+    promoted = {}
+    for df in frames:
+        total += df.shape[0]
+        for col in df._column_names:
+            if col in dtypes and dtypes[col] is None:
+                continue
+
+            val = df._data[col]
+            if promote and not isinstance(val, (numpy.ndarray, NullableArray)):
+                converted = _promote_sequence(val)
+                if converted is not None:
+                    promoted[id(val)] = converted
+                    val = converted
+
+            if _as_values_and_mask(val) is None:
+                dtypes[col] = None
+            elif col not in dtypes:
+                dtypes[col] = val.dtype
+            else:
+                try:
+                    dtypes[col] = numpy.result_type(dtypes[col], val.dtype)
+                except TypeError:
+                    dtypes[col] = None
+
+    return total, dtypes, promoted
+
+
+def concat_dtypes(frames: Sequence[BiocFrame], promote: bool = False) -> Dict[str, Optional[numpy.dtype]]:
+    """Report the type of each column in the output of :py:func:`~concat`.
+
+    Args:
+        frames:
+            Sequence of ``BiocFrame`` objects.
+
+        promote:
+            Whether lists of numbers should be promoted, see :py:func:`~concat`.
+
+    Returns:
+        Dictionary where each key is the name of a column in any of
+        ``frames`` and each value is the NumPy type of the combined column.
+        If the combined column is not a NumPy array, the value is None.
+    """
+    if not ut.is_list_of_type(frames, BiocFrame):
+        raise TypeError("All objects to combine must be BiocFrame objects.")
+    return _prescan_concat(frames, promote)[1]
+
+
+def concat(
+    frames: Iterable[BiocFrame], how: Literal["strict", "relaxed"] = "strict", promote: bool = False
+) -> BiocFrame:
+    """Combine many :py:class:`~BiocFrame` objects by row in a single pass.
+
+    This is equivalent to :py:func:`~biocutils.combine_rows.combine_rows` (for
+    ``how = "strict"``) or :py:func:`~relaxed_combine_rows` (for ``how =
+    "relaxed"``), but is much faster when combining a large number of objects.
+    NumPy columns are written directly into a preallocated output array, so
+    no intermediate objects are created for absent columns and each value is
+    only copied once. If ``frames`` is a sequence, the total number of rows
+    and the type of each column are determined in advance; otherwise, the
+    output arrays are grown as needed.
+
+    Args:
+        frames:
+            Sequence or iterable of ``BiocFrame`` objects. A generator may be
+            supplied to avoid holding all objects in memory at once.
+
+        how:
+            Whether all objects must have the same columns (``"strict"``), or
+            whether the output should contain the union of all columns
+            (``"relaxed"``). For the latter, absent columns are filled in with
+            missing values, see :py:func:`~relaxed_combine_rows`.
+
+        promote:
+            Whether to convert lists of numbers (possibly containing Nones)
+            into NumPy arrays, so that they can be combined with NumPy
+            columns in other objects. Nones are treated as missing values.
+
+            In all cases, NumPy columns of different types are combined by
+            following NumPy's type promotion rules, see
+            :py:func:`~concat_dtypes` to report the output types in advance.
+
+    Returns:
+        A ``BiocFrame`` containing all rows of ``frames``. Metadata is taken
+        from the first object, as is the column data if its columns are the
+        same as those of the output.
+    """
+    if how not in ("strict", "relaxed"):
+        raise ValueError("Unknown combining strategy '" + str(how) + "'.")
+
+    total = 0
+    dtypes = {}
+    promoted = {}
+    if isinstance(frames, abc.Sequence):
+        if not ut.is_list_of_type(frames, BiocFrame):
+            raise TypeError("All objects to combine must be BiocFrame objects.")
+        total, dtypes, promoted = _prescan_concat(frames, promote)
+
+    first = None
+    columns = {}
+    row_names = []
+    has_rownames = False
+    number_of_rows = 0
+
+    for i, df in enumerate(frames):
+        if not isinstance(df, BiocFrame):
+            raise TypeError("All objects to combine must be BiocFrame objects.")
+
+        if first is None:
+            first = df
+        elif how == "strict" and (df.shape[1] != first.shape[1] or any(col not in columns for col in df._column_names)):
+            raise ValueError("All objects to combine must have the same columns (mismatch in object " + str(i) + ").")
+
+        n = df.shape[0]
+        for col in df._column_names:
+            val = df._data[col]
+            current = columns.get(col)
+            numeric = dtypes.get(col, 0) is not None and (current is None or current.buffer is not None)
+            if promote and numeric and not isinstance(val, (numpy.ndarray, NullableArray)):
+                converted = promoted.get(id(val))
+                if converted is None:
+                    converted = _promote_sequence(val)
+                if converted is not None:
+                    val = converted
+
+            if current is None:
+                dtype = dtypes.get(col)
+                if col not in dtypes and _as_values_and_mask(val) is not None:
+                    dtype = val.dtype
+                current = _ConcatColumn(val, dtype, max(total, number_of_rows + n))
+                if number_of_rows:
+                    current.add_missing(number_of_rows)
+                columns[col] = current
+            current.add(val, n)
+
+        if len(columns) > df.shape[1]:
+            for col, current in columns.items():
+                if current.filled == number_of_rows:
+                    current.add_missing(n)
+
+        if df._row_names is not None:
+            has_rownames = True
+            row_names.append(df._row_names)
+        else:
+            row_names.append(n)
+        number_of_rows += n
+
+    if first is None:
+        raise ValueError("'frames' should contain at least one 'BiocFrame'.")
+
+    new_rownames = None
+    if has_rownames:
+        if all(isinstance(y, ut.Names) for y in row_names):
+            new_rownames = ut.combine_sequences(*row_names)
+        else:
+            new_rownames = _combine_partial_names(row_names)
+
+    column_names = list(columns.keys())
+    column_data = first._column_data
+    if len(column_names) != first.shape[1]:
+        column_data = None
+
+    return type(first)._from_parts(
+        {col: current.finish() for col, current in columns.items()},
+        number_of_rows=number_of_rows,
+        row_names=new_rownames,
+        column_names=ut.Names(column_names, _validate=False),
+        column_data=column_data,
+        metadata=first._metadata,
+    )
+
+
 ############################
 
 
@@ -1946,6 +3516,29 @@ def _get_merge_key(x: Sequence[BiocFrame], i: int, by: List[Optional[int]]) -> A
         return x[i].get_column(by[i])
 
 
+def _match_to_factor(keys: Any, fac: ut.Factor) -> numpy.ndarray:
+    """Find the first occurrence of each key in a :py:class:`~biocutils.Factor`, using its codes.
+
+    Returns:
+        Integer array of positions in ``fac``, or -1 for keys that are absent.
+    """
+    codes = numpy.asarray(fac.get_codes())
+    present = numpy.flatnonzero(codes >= 0)
+    uniq, first = numpy.unique(codes[present], return_index=True)
+    level_first = numpy.full(len(fac.get_levels()) + 1, -1, dtype=numpy.intp)
+    level_first[uniq] = present[first]
+
+    if isinstance(keys, ut.Factor):
+        remap = numpy.append(numpy.asarray(ut.match(keys.get_levels(), fac.get_levels()), dtype=numpy.intp), -1)
+        key_codes = remap[numpy.asarray(keys.get_codes(), dtype=numpy.intp)]
+    else:
+        key_codes = numpy.asarray(ut.match(keys, fac.get_levels()), dtype=numpy.intp)
+
+    # Absent keys have a code of -1, which refers to the extra -1 at the end of 'level_first'.
+    return level_first[key_codes]
+
+
+@instrumented("merge")
 def merge(
     x: Sequence[BiocFrame],
     by: Union[None, str, int, Sequence[Union[None, str, int]]] = None,
@@ -2030,18 +3623,23 @@ def merge(
         reorg_permute = None
 
         if not noop:
-            keep = ut.match(all_keys, _get_merge_key(x, i, by))
-            has_missing = (keep < 0).sum()
+            index = None
+            if by[i] is not None:
+                index = df.get_index(df._column_names[by[i]])
+            current_keys = _get_merge_key(x, i, by)
+            if index is not None:
+                keep = index.map(all_keys)
+            elif isinstance(current_keys, ut.Factor):
+                keep = _match_to_factor(all_keys, current_keys)
+            else:
+                keep = ut.match(all_keys, current_keys)
+            keep = numpy.asarray(keep, dtype=numpy.intp)
+            missing = keep < 0
+            has_missing = missing.sum()
             if has_missing:
-                non_missing = len(keep) - has_missing
-                reorg_keep = []
-                reorg_permute = []
-                for k in keep:
-                    if k < 0:
-                        reorg_permute.append(non_missing)
-                    else:
-                        reorg_permute.append(len(reorg_keep))
-                        reorg_keep.append(k)
+                present = ~missing
+                reorg_keep = keep[present]
+                reorg_permute = numpy.where(present, numpy.cumsum(present) - 1, len(reorg_keep))
 
         survivor_columns = []
         for j, y in enumerate(df._column_names):
@@ -2069,6 +3667,17 @@ def merge(
                 if keep is None:
                     raise RuntimeError("Internal error: 'keep' is None when has_missing == 0.")
                 new_data[y] = ut.subset(val, keep)
+            elif _as_values_and_mask(val) is not None:
+                # Gathering NumPy values directly, with missing keys recorded in the validity bitmap.
+                values, mask = _as_values_and_mask(val)
+                if len(values) == 0:
+                    new_data[y] = NullableArray.missing(len(keep), dtype=values.dtype)
+                else:
+                    source = numpy.where(missing, 0, keep)
+                    if mask is not None:
+                        new_data[y] = NullableArray(values[source], missing | mask[source])
+                    else:
+                        new_data[y] = NullableArray(values[source], missing)
             else:
                 if reorg_keep is None or reorg_permute is None:
                     raise RuntimeError("Internal error: 'reorg_keep' or 'reorg_permute' is None when has_missing > 0.")
@@ -2088,10 +3697,11 @@ def merge(
                 raw_column_data[i] = BiocFrame({}, number_of_rows=val)
         new_column_data = relaxed_combine_rows(*raw_column_data)
 
-    output = type(x[0])(
+    output = type(x[0])._from_parts(
         new_data,
-        column_names=new_columns,
         number_of_rows=ut.get_height(all_keys),
+        row_names=None,
+        column_names=ut.Names(new_columns, _validate=False),
         column_data=new_column_data,
         metadata=x[0]._metadata,
     )
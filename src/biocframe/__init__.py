@@ -15,5 +15,15 @@ except PackageNotFoundError:  # pragma: no cover
 finally:
     del version, PackageNotFoundError
 
-from .BiocFrame import BiocFrame, relaxed_combine_rows, merge, relaxed_combine_columns
+from .BiocFrame import BiocFrame, concat, concat_dtypes, relaxed_combine_rows, merge, relaxed_combine_columns
+from .batch import BatchUpdate
+from .builder import BiocFrameBuilder
+from .chunked import ChunkedArray
+from .columnmap import ColumnMap
+from .expressions import Expression
+from .hooks import add_hook, remove_hook
+from .indexes import HashIndex, IntervalIndex, SortedIndex
+from .lazy import LazyBiocFrame
+from .names import PartialNames, PersistentNames, RangeNames, StringArrayNames
+from .nullable import NullableArray
 from .io import from_pandas
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, List, Mapping, Optional, Sequence, Tuple, Union
+
+import biocutils as ut
+import numpy
+
+if TYPE_CHECKING:
+    from .BiocFrame import BiocFrame
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+class BatchUpdate:
+    """Queue modifications of a :py:class:`~biocframe.BiocFrame.BiocFrame` and apply them together.
+
+    This is usually created by :py:meth:`~biocframe.BiocFrame.BiocFrame.batch_update`
+    and used as a context manager. Each method only records the modification,
+    and all of them are applied in order when the context exits. This rebuilds
+    the dictionary of columns once, extends the column data once and
+    validates the heights of the columns once, regardless of the number of
+    modifications. If any modification fails (or the block raises an
+    exception), the frame is left unchanged.
+
+    Columns are identified by name, as positions may change during the batch.
+    """
+
+    def __init__(self, frame: BiocFrame, in_place: bool = True) -> None:
+        """
+        Args:
+            frame:
+                The ``BiocFrame`` to modify.
+
+            in_place:
+                Whether to modify ``frame`` in place. If False, the
+                modifications are applied to a copy, see :py:attr:`~result`.
+        """
+        self._frame = frame
+        self._in_place = in_place
+        self._ops: List[Tuple[str, tuple]] = []
+        self._result = None
+
+    def __enter__(self) -> BatchUpdate:
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, traceback: Any) -> bool:
+        if exc_type is None and (self._ops or self._result is None):
+            self.apply()
+        self._ops = []
+        return False
+
+    @property
+    def result(self) -> Optional[BiocFrame]:
+        """
+        Returns:
+            The modified ``BiocFrame``, or None if the modifications have not
+            been applied yet.
+        """
+        return self._result
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            Number of queued modifications.
+        """
+        return len(self._ops)
+
+    def set_column(self, column: str, value: Any) -> None:
+        """Queue the addition or replacement of a column.
+
+        Args:
+            column:
+                Name of a new or existing column.
+
+            value:
+                Contents of the column.
+        """
+        if not isinstance(column, str):
+            raise TypeError("'column' should be a string.")
+        self._ops.append(("set", (column, value)))
+
+    def set_columns(self, columns: Mapping[str, Any]) -> None:
+        """Queue the addition or replacement of multiple columns.
+
+        Args:
+            columns:
+                Mapping of column names to their contents.
+        """
+        for column, value in columns.items():
+            self.set_column(column, value)
+
+    def remove_column(self, column: str) -> None:
+        """Queue the removal of a column.
+
+        Args:
+            column:
+                Name of the column to remove.
+        """
+        if not isinstance(column, str):
+            raise TypeError("'column' should be a string.")
+        self._ops.append(("remove", (column,)))
+
+    def remove_columns(self, columns: Sequence[str]) -> None:
+        """Queue the removal of multiple columns.
+
+        Args:
+            columns:
+                Names of the columns to remove.
+        """
+        for column in columns:
+            self.remove_column(column)
+
+    def rename_column(self, old: str, new: str) -> None:
+        """Queue the renaming of a column, retaining its position.
+
+        Args:
+            old:
+                Current name of the column.
+
+            new:
+                New name of the column, which should not already exist.
+        """
+        if not isinstance(old, str) or not isinstance(new, str):
+            raise TypeError("column names should be strings.")
+        self._ops.append(("rename", (old, new)))
+
+    def set_slice(
+        self,
+        rows: Union[int, str, bool, Sequence[Union[int, str, bool]], slice],
+        columns: Union[str, Sequence[str]],
+        value: BiocFrame,
+    ) -> None:
+        """Queue the replacement of a slice, as in :py:meth:`~biocframe.BiocFrame.BiocFrame.set_slice`.
+
+        Args:
+            rows:
+                Rows to be replaced, see
+                :py:meth:`~biocframe.BiocFrame.BiocFrame.set_slice` for details.
+
+            columns:
+                Name or names of the columns to be replaced.
+
+            value:
+                A ``BiocFrame`` containing replacement values, where each
+                column corresponds to a column in ``columns``.
+        """
+        if isinstance(columns, str):
+            columns = [columns]
+        self._ops.append(("slice", (rows, list(columns), value)))
+
+    def apply(self) -> BiocFrame:
+        """Apply all queued modifications. This is called automatically when the context exits.
+        Subsequent modifications are queued against the result.
+
+        Returns:
+            The modified ``BiocFrame``, either the original object or a copy
+            depending on ``in_place``.
+        """
+        from .BiocFrame import BiocFrame, _validate_rows, relaxed_combine_rows
+
+        frame = self._frame
+        nrows = frame._number_of_rows
+        row_names = frame._row_names
+        empty = nrows == 0 and len(frame._column_names) == 0
+
+        # Removed columns are marked as dead rather than deleted from 'names',
+        # so that each modification takes O(1) time.
+        names = list(frame._column_names)
+        alive = [True] * len(names)
+        position = {name: i for i, name in enumerate(names)}
+        data = dict(frame._data.items())
+
+        # Columns whose NumPy buffers were allocated in this batch, which can
+        # be modified in place by subsequent slice assignments.
+        fresh = set()
+
+        for op, args in self._ops:
+            if op == "set":
+                column, value = args
+                if empty:
+                    nrows = ut.get_height(value)
+                    if row_names is not None and len(row_names) == 0 and nrows > 0:
+                        row_names = None
+                    empty = False
+                if column not in position:
+                    position[column] = len(names)
+                    names.append(column)
+                    alive.append(True)
+                data[column] = value
+                fresh.discard(column)
+
+            elif op == "remove":
+                (column,) = args
+                if column not in position:
+                    raise ValueError(f"Column '{column}' does not exist.")
+                alive[position.pop(column)] = False
+                del data[column]
+                fresh.discard(column)
+
+            elif op == "rename":
+                old, new = args
+                if old not in position:
+                    raise ValueError(f"Column '{old}' does not exist.")
+                if new == old:
+                    continue
+                if new in position:
+                    raise ValueError(f"Column '{new}' already exists.")
+                i = position.pop(old)
+                position[new] = i
+                names[i] = new
+                data[new] = data.pop(old)
+                if old in fresh:
+                    fresh.remove(old)
+                    fresh.add(new)
+
+            else:
+                rows, columns, value = args
+                row_idx, _ = ut.normalize_subscript(rows, nrows, names=row_names)
+                if len(columns) != len(value._column_names):
+                    raise ValueError("Number of columns in 'value' should be equal to the number of 'columns'.")
+                for i, column in enumerate(columns):
+                    if column not in position:
+                        raise ValueError(f"Column '{column}' does not exist.")
+                    replacement = value._data[value._column_names[i]]
+                    current = data[column]
+                    if type(current) is numpy.ndarray:
+                        if column not in fresh:
+                            current = current.copy()
+                            data[column] = current
+                            fresh.add(column)
+                        current[row_idx] = replacement
+                    else:
+                        data[column] = ut.assign(current, row_idx, replacement=replacement)
+
+        order = [i for i, a in enumerate(alive) if a]
+        new_names = [names[i] for i in order]
+        new_data = {name: data[name] for name in new_names}
+        _validate_rows(nrows, new_data, row_names, check_names=False)
+
+        column_data = frame._column_data
+        if column_data is not None:
+            original = len(frame._column_names)
+            keep = [i for i in order if i < original]
+            if len(keep) != original:
+                column_data = column_data[keep, :]
+            added = len(order) - len(keep)
+            if added:
+                column_data = relaxed_combine_rows(column_data, BiocFrame({}, number_of_rows=added))
+
+        output = frame._define_output(self._in_place)
+        output._data = new_data
+        output._data_shared = False
+        output._data_copies = 0
+        output._number_of_rows = nrows
+        output._row_names = row_names
+        output._column_names = ut.Names(new_names, _validate=False)
+        output._column_data = column_data
+
+        self._ops = []
+        self._frame = output
+        self._result = output
+        return output
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Sequence, Union
+
+import numpy
+
+if TYPE_CHECKING:
+    from .BiocFrame import BiocFrame
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def _is_object_type(dtype: Any) -> bool:
+    return dtype is None or dtype is str or numpy.dtype(dtype).kind in "OUST"
+
+
+class BiocFrameBuilder:
+    """Incrementally build a :py:class:`~biocframe.BiocFrame.BiocFrame` from a stream of rows.
+
+    Each column is stored in a growable buffer. Columns with a NumPy type use
+    a typed array whose capacity is doubled whenever it fills up, so appending
+    ``n`` rows takes amortized O(n) time without converting any values into
+    Python objects. Other columns (e.g., strings) are collected in Python lists.
+    """
+
+    def __init__(self, schema: Union[Mapping[str, Any], Sequence[str]], initial_capacity: int = 1024) -> None:
+        """Initialize the builder.
+
+        Args:
+            schema:
+                Mapping of column names to their types. Each type may be
+                anything accepted by :py:class:`~numpy.dtype`, in which case the
+                column is stored as a NumPy array. If the type is None,
+                ``str`` or any string/object NumPy type, the column is stored
+                as a list instead.
+
+                Alternatively, a sequence of column names, all of which are
+                stored as lists.
+
+            initial_capacity:
+                Initial number of rows to allocate for each typed column.
+        """
+        if not isinstance(schema, Mapping):
+            schema = {name: None for name in schema}
+
+        self._schema = dict(schema)
+        self._initial_capacity = max(int(initial_capacity), 1)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._size = 0
+        self._capacity = self._initial_capacity
+        self._row_names = None
+        self._buffers = {}
+        for name, dtype in self._schema.items():
+            if _is_object_type(dtype):
+                self._buffers[name] = []
+            else:
+                self._buffers[name] = numpy.empty(self._capacity, dtype=dtype)
+
+    @property
+    def schema(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Mapping of column names to their types.
+        """
+        return self._schema
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            Number of rows appended so far.
+        """
+        return self._size
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed <= self._capacity:
+            return
+
+        capacity = max(self._capacity * 2, needed)
+        for name, buf in self._buffers.items():
+            if isinstance(buf, numpy.ndarray):
+                grown = numpy.empty(capacity, dtype=buf.dtype)
+                grown[: self._size] = buf[: self._size]
+                self._buffers[name] = grown
+        self._capacity = capacity
+
+    def _check_row_names(self, names: Optional[Sequence[str]], n: int) -> Optional[list]:
+        if names is None:
+            return None
+        if len(names) != n:
+            raise ValueError("Number of row names should be equal to the number of appended rows.")
+        return [str(y) for y in names]
+
+    def _add_row_names(self, names: Optional[list], n: int) -> None:
+        if names is None:
+            if self._row_names is not None:
+                self._row_names.extend([""] * n)
+            return
+
+        if self._row_names is None:
+            self._row_names = [""] * self._size
+        self._row_names.extend(names)
+
+    def append_row(self, row: Union[Mapping[str, Any], Sequence[Any]], name: Optional[str] = None) -> None:
+        """Append a single row.
+
+        Args:
+            row:
+                Mapping of column names to values. All columns in the schema
+                must be present. Alternatively, a sequence of values in the
+                same order as the columns in the schema.
+
+            name:
+                Row name for this row. If any rows are named, rows without
+                names are assigned an empty string.
+        """
+        values = self._row_values(row)
+
+        # Converting everything before touching the buffers, so that a failure
+        # does not leave the columns with different lengths.
+        converted = []
+        for buf, val in zip(self._buffers.values(), values):
+            converted.append(val if isinstance(buf, list) else numpy.asarray(val, dtype=buf.dtype))
+        names = self._check_row_names(None if name is None else [name], 1)
+
+        self._reserve(1)
+        pos = self._size
+        for buf, val in zip(self._buffers.values(), converted):
+            if isinstance(buf, list):
+                buf.append(val)
+            else:
+                buf[pos] = val
+
+        self._add_row_names(names, 1)
+        self._size += 1
+
+    def _row_values(self, row: Union[Mapping[str, Any], Sequence[Any]]) -> Sequence[Any]:
+        if isinstance(row, Mapping):
+            try:
+                return [row[col] for col in self._buffers]
+            except KeyError as e:
+                raise ValueError(f"Row is missing column {e} from the schema.") from e
+
+        if len(row) != len(self._buffers):
+            raise ValueError(f"Row has {len(row)} values but the schema has {len(self._buffers)} columns.")
+        return row
+
+    def append_rows(
+        self, rows: Sequence[Union[Mapping[str, Any], Sequence[Any]]], names: Optional[Sequence[str]] = None
+    ) -> None:
+        """Append multiple rows. This is more efficient than repeated calls to :py:meth:`~append_row`, as each typed
+        column is filled with a single vectorized assignment.
+
+        Args:
+            rows:
+                Sequence of rows, each of which is formatted as described in
+                :py:meth:`~append_row`.
+
+            names:
+                Row names for the appended rows.
+        """
+        n = len(rows)
+        if n == 0:
+            return
+
+        columns = list(zip(*[self._row_values(r) for r in rows]))
+        self._append_columns(columns, names, n)
+
+    def append_frame(self, frame: BiocFrame) -> None:
+        """Append all rows of a ``BiocFrame``.
+
+        Args:
+            frame:
+                A ``BiocFrame`` containing all columns in the schema.
+                Additional columns are ignored. Row names are retained
+                if present.
+        """
+        n = frame.shape[0]
+        if n == 0:
+            return
+
+        columns = []
+        for col in self._buffers:
+            if not frame.has_column(col):
+                raise ValueError(f"Frame is missing column '{col}' from the schema.")
+            columns.append(frame.get_column(col))
+
+        self._append_columns(columns, frame.get_row_names(), n)
+
+    def _append_columns(self, columns: Sequence[Any], names: Optional[Sequence[str]], n: int) -> None:
+        # Validating all columns and row names before touching the buffers,
+        # so that a failure leaves the builder unchanged.
+        converted = []
+        for (col, buf), val in zip(self._buffers.items(), columns):
+            if isinstance(buf, numpy.ndarray):
+                val = numpy.asarray(val, dtype=buf.dtype)
+            if len(val) != n:
+                raise ValueError(f"Column '{col}' should contain {n} values.")
+            converted.append(val)
+        names = self._check_row_names(names, n)
+
+        self._reserve(n)
+        start = self._size
+        for buf, val in zip(self._buffers.values(), converted):
+            if isinstance(buf, list):
+                buf.extend(val)
+            else:
+                buf[start : start + n] = val
+
+        self._add_row_names(names, n)
+        self._size += n
+
+    def finish(self) -> BiocFrame:
+        """Create a ``BiocFrame`` from the appended rows. This skips the validation performed by the ``BiocFrame``
+        constructor, as all columns are guaranteed to have the same length. The builder is reset afterwards.
+
+        Returns:
+            A ``BiocFrame`` containing all appended rows.
+        """
+        from .BiocFrame import BiocFrame
+
+        data = {}
+        for col, buf in self._buffers.items():
+            if isinstance(buf, numpy.ndarray):
+                # Copying to release the unused capacity.
+                buf = buf[: self._size].copy()
+            data[col] = buf
+
+        output = BiocFrame(
+            data,
+            number_of_rows=self._size,
+            row_names=self._row_names,
+            column_names=list(self._buffers.keys()),
+            _validate=False,
+        )
+
+        self._reset()
+        return output
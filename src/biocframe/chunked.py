@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+import biocutils as ut
+import numpy
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def _as_chunk(x: Any) -> numpy.ndarray:
+    if isinstance(x, ChunkedArray):
+        raise TypeError("nested 'ChunkedArray' objects are not supported.")
+    if not isinstance(x, numpy.ndarray):
+        x = numpy.asarray(x)
+    if x.ndim != 1:
+        raise ValueError("each chunk should be a one-dimensional array.")
+    return x
+
+
+class _ChunkStore:
+    # Growable list of chunks and prefix sums, shared by a ChunkedArray and
+    # the ChunkedArrays created by appending to it. Each of them only sees
+    # its own number of chunks, so entries are never modified once added.
+
+    __slots__ = ("chunks", "offsets")
+
+    def __init__(self, chunks: List[numpy.ndarray]) -> None:
+        self.chunks = chunks
+        self.offsets = numpy.zeros(max(2 * len(chunks), 1) + 1, dtype=numpy.int64)
+        numpy.cumsum([len(c) for c in chunks], out=self.offsets[1 : len(chunks) + 1])
+
+    def extend(self, chunks: List[numpy.ndarray]) -> None:
+        start = len(self.chunks)
+        end = start + len(chunks)
+        if end + 1 > len(self.offsets):
+            grown = numpy.zeros(2 * end + 1, dtype=numpy.int64)
+            grown[: start + 1] = self.offsets[: start + 1]
+            self.offsets = grown
+        numpy.cumsum([len(c) for c in chunks], out=self.offsets[start + 1 : end + 1])
+        self.offsets[start + 1 : end + 1] += self.offsets[start]
+        self.chunks += chunks
+
+
+class ChunkedArray:
+    """A one-dimensional column stored as a list of NumPy arrays ("chunks"), for use in a
+    :py:class:`~biocframe.BiocFrame.BiocFrame`.
+
+    Combining ``ChunkedArray`` objects only concatenates their lists of chunks,
+    so repeatedly appending batches of rows with
+    :py:func:`~biocutils.combine_rows` does not copy the existing data. Row
+    positions are resolved with a prefix sum of the chunk lengths. Appending to
+    the most recent ``ChunkedArray`` extends its list of chunks and prefix sums
+    in place, which takes amortized O(1) time per chunk, while the original
+    object continues to see only its own chunks. Once all batches have been
+    added, :py:meth:`~consolidate` flattens the chunks into a single NumPy
+    array.
+    """
+
+    def __init__(self, chunks: Sequence[Any]) -> None:
+        """
+        Args:
+            chunks:
+                Sequence of one-dimensional arrays (or objects that can be
+                coerced into arrays) to be treated as a single column.
+        """
+        if isinstance(chunks, numpy.ndarray):
+            chunks = [chunks]
+
+        self._store = _ChunkStore([_as_chunk(c) for c in chunks])
+        self._count = len(self._store.chunks)
+
+    @classmethod
+    def _from_store(cls, store: _ChunkStore, count: int) -> ChunkedArray:
+        output = cls.__new__(cls)
+        output._store = store
+        output._count = count
+        return output
+
+    @property
+    def _chunks(self) -> List[numpy.ndarray]:
+        chunks = self._store.chunks
+        return chunks if len(chunks) == self._count else chunks[: self._count]
+
+    @property
+    def _offsets(self) -> numpy.ndarray:
+        return self._store.offsets[: self._count + 1]
+
+    @property
+    def chunks(self) -> List[numpy.ndarray]:
+        """
+        Returns:
+            List of chunks. This should be treated as read-only.
+        """
+        return self._chunks
+
+    @property
+    def offsets(self) -> numpy.ndarray:
+        """
+        Returns:
+            Prefix sum of the chunk lengths, of length equal to the number of chunks plus 1.
+        """
+        return self._offsets
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        """
+        Returns:
+            Type of the consolidated array.
+        """
+        if len(self._chunks) == 0:
+            return numpy.dtype(numpy.float64)
+        return numpy.result_type(*self._chunks)
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Returns:
+            Tuple containing the length of the column.
+        """
+        return (len(self),)
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            Total length across all chunks.
+        """
+        return int(self._store.offsets[self._count])
+
+    def __repr__(self) -> str:
+        return "ChunkedArray(" + str(len(self)) + " values in " + str(len(self._chunks)) + " chunks)"
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sum(c.nbytes for c in self._chunks) + self._offsets.nbytes
+
+    def __iter__(self) -> Iterator[Any]:
+        for c in self._chunks:
+            yield from c
+
+    def __array__(self, dtype: Optional[numpy.dtype] = None, copy: Optional[bool] = None) -> numpy.ndarray:
+        output = self.consolidate()
+        if dtype is not None:
+            output = output.astype(dtype, copy=False)
+        return output
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ChunkedArray):
+            other = other.consolidate()
+        if len(self) != len(other):
+            return False
+        return bool(numpy.array_equal(self.consolidate(), numpy.asarray(other)))
+
+    def __ne__(self, other: Any) -> bool:
+        return not self.__eq__(other)
+
+    def consolidate(self) -> numpy.ndarray:
+        """
+        Returns:
+            A single NumPy array containing the contents of all chunks.
+            Masked arrays are preserved if any chunk is masked.
+        """
+        if len(self._chunks) == 1:
+            return self._chunks[0]
+        if len(self._chunks) == 0:
+            return numpy.zeros(0, dtype=self.dtype)
+        if any(numpy.ma.isMaskedArray(c) for c in self._chunks):
+            return numpy.ma.concatenate(self._chunks)
+        return numpy.concatenate(self._chunks)
+
+    def tolist(self) -> list:
+        """
+        Returns:
+            List containing the contents of all chunks.
+        """
+        output = []
+        for c in self._chunks:
+            output += c.tolist()
+        return output
+
+    def _locate(self, positions: numpy.ndarray) -> numpy.ndarray:
+        return numpy.searchsorted(self._offsets, positions, side="right") - 1
+
+    def get_value(self, index: int) -> Any:
+        """
+        Args:
+            index:
+                Position of interest.
+
+        Returns:
+            Value at the specified position.
+        """
+        n = len(self)
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError(f"Index {index} is out of range for a 'ChunkedArray' of length {n}.")
+        c = int(self._locate(index))
+        return self._chunks[c][index - self._offsets[c]]
+
+    def get_slice(self, indices: Union[Sequence[int], slice, range, numpy.ndarray]) -> ChunkedArray:
+        """
+        Args:
+            indices:
+                Positions of interest, or a boolean vector of the same length
+                as the array. Contiguous ranges are extracted as views of the
+                existing chunks, while arbitrary positions are gathered into a
+                single new chunk.
+
+        Returns:
+            A ``ChunkedArray`` containing the values at the specified positions.
+        """
+        if isinstance(indices, slice):
+            indices = range(*indices.indices(len(self)))
+
+        if isinstance(indices, range) and indices.step == 1:
+            start, stop = indices.start, indices.stop
+            if stop <= start:
+                return type(self)([numpy.zeros(0, dtype=self.dtype)])
+
+            first = int(self._locate(start))
+            last = int(self._locate(stop - 1))
+            pieces = []
+            for c in range(first, last + 1):
+                off = self._offsets[c]
+                current = self._chunks[c]
+                if len(current):
+                    pieces.append(current[max(start - off, 0) : min(stop - off, len(current))])
+            return type(self)(pieces)
+
+        indices = numpy.asarray(indices)
+        if indices.dtype == numpy.bool_:
+            if len(indices) != len(self):
+                raise ValueError("Length of boolean 'indices' should be equal to the length of the 'ChunkedArray'.")
+            indices = numpy.flatnonzero(indices)
+        indices = indices.astype(numpy.intp, copy=False)
+        if len(self._chunks) == 1:
+            return type(self)([self._chunks[0][indices]])
+
+        output = numpy.empty(len(indices), dtype=self.dtype)
+        owner = self._locate(indices)
+        masked = None
+        for c in numpy.unique(owner):
+            hits = owner == c
+            chunk = self._chunks[c]
+            output[hits] = chunk[indices[hits] - self._offsets[c]]
+            if numpy.ma.isMaskedArray(chunk):
+                if masked is None:
+                    masked = numpy.zeros(len(indices), dtype=bool)
+                masked[hits] = numpy.ma.getmaskarray(chunk)[indices[hits] - self._offsets[c]]
+
+        if masked is not None:
+            output = numpy.ma.array(output, mask=masked)
+        return type(self)([output])
+
+    def __getitem__(self, index: Any) -> Any:
+        """
+        If ``index`` is an integer, this is an alias for :py:meth:`~get_value`.
+        Otherwise, it is an alias for :py:meth:`~get_slice`.
+        """
+        if isinstance(index, (int, numpy.integer)):
+            return self.get_value(int(index))
+        return self.get_slice(index)
+
+    def append(self, *other: Any) -> ChunkedArray:
+        """
+        Args:
+            other:
+                Arrays or ``ChunkedArray`` objects to append.
+
+        Returns:
+            A new ``ChunkedArray`` with the chunks of ``other`` appended
+            after those of the current object. No data is copied.
+        """
+        chunks = []
+        for y in other:
+            if isinstance(y, ChunkedArray):
+                chunks += y._chunks
+            else:
+                chunks.append(_as_chunk(y))
+
+        store = self._store
+        if len(store.chunks) != self._count:
+            # Another object has already appended to the shared store.
+            store = _ChunkStore(self._chunks)
+        store.extend(chunks)
+        return type(self)._from_store(store, self._count + len(chunks))
+
+
+@ut.subset_sequence.register(ChunkedArray)
+def _subset_sequence_ChunkedArray(x: ChunkedArray, indices: Sequence[int]) -> ChunkedArray:
+    return x.get_slice(indices)
+
+
+@ut.combine_sequences.register(ChunkedArray)
+def _combine_sequences_ChunkedArray(*x: Any) -> ChunkedArray:
+    return x[0].append(*x[1:])
+
+
+@ut.assign_sequence.register(ChunkedArray)
+def _assign_sequence_ChunkedArray(x: ChunkedArray, indices: Sequence[int], replacement: Any) -> ChunkedArray:
+    output = x.consolidate().copy()
+    output[indices] = replacement
+    return ChunkedArray([output])
+
+
+@ut.show_as_cell.register(ChunkedArray)
+def _show_as_cell_ChunkedArray(x: ChunkedArray, indices: Sequence[int]) -> List[str]:
+    return [str(x.get_value(i)) for i in indices]
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import sys
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+from typing import Any, Iterator, List, Optional, Tuple
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+_BITS = 5
+_WIDTH = 1 << _BITS
+_MASK = _WIDTH - 1
+
+# Maximum number of entries in a leaf before it is split into a branch.
+_LEAF_SIZE = 16
+
+# Leaves are no longer split once all bits of the hash have been consumed.
+_MAX_SHIFT = sys.hash_info.width
+
+
+def _build(items: List[Tuple[Any, Any]], shift: int) -> Any:
+    if len(items) <= _LEAF_SIZE or shift >= _MAX_SHIFT:
+        return dict(items)
+
+    parts = [[] for _ in range(_WIDTH)]
+    for kv in items:
+        parts[(hash(kv[0]) >> shift) & _MASK].append(kv)
+    return [(_build(p, shift + _BITS) if p else None) for p in parts]
+
+
+def _leaves(node: Any) -> Iterator[dict]:
+    if node is None:
+        return
+    if type(node) is dict:
+        yield node
+        return
+
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        for child in reversed(current):
+            if type(child) is list:
+                stack.append(child)
+            elif child is not None:
+                yield child
+
+
+class _ColumnMapItems(ItemsView):
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        for leaf in _leaves(self._mapping._root):
+            yield from leaf.items()
+
+
+class _ColumnMapValues(ValuesView):
+    def __iter__(self) -> Iterator[Any]:
+        for leaf in _leaves(self._mapping._root):
+            yield from leaf.values()
+
+
+class ColumnMap(MutableMapping):
+    """A persistent mapping of column names to columns, for use as the column storage of a
+    :py:class:`~biocframe.BiocFrame.BiocFrame` with many columns.
+
+    The mapping is stored as a hash array mapped trie (HAMT), i.e., a tree
+    with up to 32 children per branch where each level is indexed by the next
+    5 bits of the hash of the key, and small dictionaries at the leaves. Nodes
+    are never modified after construction, so :py:meth:`~copy` takes O(1) time
+    by sharing the whole tree, and each modification only copies the nodes on
+    the path to the affected leaf, i.e., O(log n) time instead of the O(n)
+    needed to copy a dictionary.
+
+    Iteration follows the order of the hashes of the keys rather than the
+    insertion order; the order of the columns of a ``BiocFrame`` is defined by
+    its column names.
+    """
+
+    __slots__ = ("_root", "_size")
+
+    def __init__(self, data: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Args:
+            data:
+                Initial contents of the mapping. This takes O(n) time,
+                unless ``data`` is another ``ColumnMap``.
+        """
+        if isinstance(data, ColumnMap):
+            self._root = data._root
+            self._size = data._size
+        elif data is None or len(data) == 0:
+            self._root = None
+            self._size = 0
+        else:
+            items = list(data.items())
+            self._root = _build(items, 0)
+            self._size = len(items)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, key: str) -> Any:
+        node = self._root
+        h = hash(key)
+        shift = 0
+        while type(node) is list:
+            node = node[(h >> shift) & _MASK]
+            shift += _BITS
+        if node is None:
+            raise KeyError(key)
+        return node[key]
+
+    def __contains__(self, key: Any) -> bool:
+        try:
+            h = hash(key)
+        except TypeError:
+            return False
+        node = self._root
+        shift = 0
+        while type(node) is list:
+            node = node[(h >> shift) & _MASK]
+            shift += _BITS
+        return node is not None and key in node
+
+    def _find_path(self, key: str) -> Tuple[List[Tuple[list, int]], Any, int]:
+        path = []
+        node = self._root
+        h = hash(key)
+        shift = 0
+        while type(node) is list:
+            idx = (h >> shift) & _MASK
+            path.append((node, idx))
+            node = node[idx]
+            shift += _BITS
+        return path, node, shift
+
+    def _replace_path(self, path: List[Tuple[list, int]], new: Any) -> None:
+        for branch, idx in reversed(path):
+            branch = branch.copy()
+            branch[idx] = new
+            new = branch
+        self._root = new
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        path, leaf, shift = self._find_path(key)
+        leaf = {} if leaf is None else leaf.copy()
+        if key not in leaf:
+            self._size += 1
+        leaf[key] = value
+
+        if len(leaf) > _LEAF_SIZE and shift < _MAX_SHIFT:
+            leaf = _build(list(leaf.items()), shift)
+        self._replace_path(path, leaf)
+
+    def __delitem__(self, key: str) -> None:
+        path, leaf, _ = self._find_path(key)
+        if leaf is None or key not in leaf:
+            raise KeyError(key)
+
+        leaf = leaf.copy()
+        del leaf[key]
+        self._size -= 1
+        self._replace_path(path, leaf if len(leaf) else None)
+
+    def __iter__(self) -> Iterator[str]:
+        for leaf in _leaves(self._root):
+            yield from leaf
+
+    def items(self) -> ItemsView:
+        """
+        Returns:
+            View of the key-value pairs in the mapping.
+        """
+        return _ColumnMapItems(self)
+
+    def values(self) -> ValuesView:
+        """
+        Returns:
+            View of the values in the mapping.
+        """
+        return _ColumnMapValues(self)
+
+    def copy(self) -> ColumnMap:
+        """
+        Returns:
+            A copy of the mapping. This takes O(1) time as the tree is shared,
+            and modifications to either object do not affect the other.
+        """
+        output = type(self).__new__(type(self))
+        output._root = self._root
+        output._size = self._size
+        return output
+
+    def __copy__(self) -> ColumnMap:
+        """Alias for :py:meth:`~copy`."""
+        return self.copy()
+
+    def __sizeof__(self) -> int:
+        size = object.__sizeof__(self)
+        if self._root is None:
+            return size
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            size += sys.getsizeof(node)
+            if type(node) is list:
+                stack += [child for child in node if child is not None]
+        return size
+
+    def __repr__(self) -> str:
+        return "ColumnMap(" + repr(dict(self.items())) + ")"
@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import ast
+import re
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+import numpy
+
+from .chunked import ChunkedArray
+from .nullable import NullableArray
+
+if TYPE_CHECKING:
+    from .BiocFrame import BiocFrame
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+# Number of rows evaluated at a time. Each temporary is then at most 512 KB
+# for 64-bit types, so that intermediate results stay in the CPU cache
+# instead of being written to and read back from main memory.
+DEFAULT_CHUNK_SIZE = 65536
+
+_BINARY = {
+    ast.Add: numpy.add,
+    ast.Sub: numpy.subtract,
+    ast.Mult: numpy.multiply,
+    ast.Div: numpy.true_divide,
+    ast.FloorDiv: numpy.floor_divide,
+    ast.Mod: numpy.remainder,
+    ast.Pow: numpy.power,
+    ast.BitAnd: numpy.bitwise_and,
+    ast.BitOr: numpy.bitwise_or,
+    ast.BitXor: numpy.bitwise_xor,
+}
+
+_UNARY = {
+    ast.USub: numpy.negative,
+    ast.UAdd: numpy.positive,
+    ast.Not: numpy.logical_not,
+    ast.Invert: numpy.invert,
+}
+
+_COMPARE = {
+    ast.Lt: numpy.less,
+    ast.LtE: numpy.less_equal,
+    ast.Gt: numpy.greater,
+    ast.GtE: numpy.greater_equal,
+    ast.Eq: numpy.equal,
+    ast.NotEq: numpy.not_equal,
+}
+
+_BOOLEAN = {
+    ast.And: numpy.logical_and,
+    ast.Or: numpy.logical_or,
+}
+
+_FUNCTIONS = {
+    "abs": numpy.absolute,
+    "sqrt": numpy.sqrt,
+    "exp": numpy.exp,
+    "expm1": numpy.expm1,
+    "log": numpy.log,
+    "log1p": numpy.log1p,
+    "log2": numpy.log2,
+    "log10": numpy.log10,
+    "sin": numpy.sin,
+    "cos": numpy.cos,
+    "tan": numpy.tan,
+    "floor": numpy.floor,
+    "ceil": numpy.ceil,
+    "trunc": numpy.trunc,
+    "sign": numpy.sign,
+    "isnan": numpy.isnan,
+    "isinf": numpy.isinf,
+    "isfinite": numpy.isfinite,
+    "minimum": numpy.minimum,
+    "maximum": numpy.maximum,
+    "where": numpy.where,
+}
+
+_CONSTANTS = {
+    "nan": numpy.nan,
+    "inf": numpy.inf,
+    "pi": numpy.pi,
+}
+
+_BACKTICKS = re.compile(r"`([^`]*)`")
+
+
+def _is_in(values: Tuple[Any, ...]) -> Callable[[Any], Any]:
+    def fun(x: Any) -> Any:
+        return numpy.isin(x, values)
+
+    return fun
+
+
+def _not_in(values: Tuple[Any, ...]) -> Callable[[Any], Any]:
+    def fun(x: Any) -> Any:
+        return numpy.isin(x, values, invert=True)
+
+    return fun
+
+
+def _as_numpy_column(name: str, x: Any) -> numpy.ndarray:
+    if isinstance(x, numpy.ndarray):
+        return x
+    if isinstance(x, NullableArray):
+        return x.to_masked()
+    if isinstance(x, ChunkedArray):
+        return x.consolidate()
+    if isinstance(x, (list, tuple)):
+        return numpy.asarray(x)
+    raise TypeError(f"Column '{name}' cannot be used in an expression.")
+
+
+class Expression:
+    """An expression over the columns of a :py:class:`~biocframe.BiocFrame.BiocFrame`.
+
+    The expression is parsed once into a sequence of NumPy ufunc calls, where
+    identical subexpressions are computed only once. Evaluation proceeds in
+    chunks of rows, so each temporary only holds one chunk's worth of values
+    and is released as soon as it is no longer needed.
+
+    The grammar is a restricted subset of Python expressions:
+
+    - Column names, referenced directly if they are valid identifiers or
+      enclosed in backticks otherwise, e.g., ```log fold change```.
+    - Numeric, string and boolean literals, as well as ``nan``, ``inf`` and
+      ``pi`` if no column has the same name.
+    - Arithmetic operators ``+ - * / // % **``, element-wise ``& | ^ ~``,
+      comparisons (which may be chained), ``and``, ``or``, ``not``, and
+      ``in``/``not in`` against a tuple or list of literals.
+    - Calls to ``abs``, ``sqrt``, ``exp``, ``expm1``, ``log``, ``log1p``,
+      ``log2``, ``log10``, ``sin``, ``cos``, ``tan``, ``floor``, ``ceil``,
+      ``trunc``, ``sign``, ``isnan``, ``isinf``, ``isfinite``, ``minimum``,
+      ``maximum`` and ``where``.
+
+    Unlike Python, ``and``, ``or`` and ``not`` are applied element-wise.
+    """
+
+    def __init__(self, expr: str) -> None:
+        """
+        Args:
+            expr:
+                String containing the expression.
+        """
+        if not isinstance(expr, str):
+            raise TypeError("'expr' should be a string.")
+
+        self._expr = expr
+        self._quoted: Dict[str, str] = {}
+
+        def _replace(match: re.Match) -> str:
+            placeholder = "__biocframe_column_" + str(len(self._quoted)) + "__"
+            self._quoted[placeholder] = match.group(1)
+            return placeholder
+
+        try:
+            tree = ast.parse(_BACKTICKS.sub(_replace, expr).strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Failed to parse expression '{expr}': {e.msg}.") from e
+
+        # Each instruction is a tuple of (kind, argument, operands), where
+        # 'operands' are the positions of earlier instructions.
+        self._program: List[Tuple[str, Any, Tuple[int, ...]]] = []
+        self._memo: Dict[str, int] = {}
+        self._output = self._compile(tree.body)
+        del self._memo
+
+        # Position of the last instruction using each result, so that
+        # temporaries can be released as soon as possible.
+        self._release: List[List[int]] = [[] for _ in self._program]
+        last_use = {}
+        for i, (_, _, operands) in enumerate(self._program):
+            for j in operands:
+                last_use[j] = i
+        for j, i in last_use.items():
+            if j != self._output:
+                self._release[i].append(j)
+
+    def __repr__(self) -> str:
+        return "Expression(" + repr(self._expr) + ")"
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Returns:
+            Names referenced by the expression, in order of first appearance.
+            These are resolved to columns (or constants) during evaluation.
+        """
+        return [arg for kind, arg, _ in self._program if kind == "name"]
+
+    def _emit(self, key: str, kind: str, arg: Any, operands: Tuple[int, ...] = ()) -> int:
+        self._program.append((kind, arg, operands))
+        position = len(self._program) - 1
+        self._memo[key] = position
+        return position
+
+    def _compile(self, node: ast.AST) -> int:
+        key = ast.dump(node)
+        if key in self._memo:
+            return self._memo[key]
+
+        if isinstance(node, ast.Name):
+            return self._emit(key, "name", self._quoted.get(node.id, node.id))
+
+        if isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float, str, bool)):
+                raise ValueError(f"Unsupported constant '{node.value!r}' in expression.")
+            return self._emit(key, "constant", node.value)
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY:
+            left = self._compile(node.left)
+            right = self._compile(node.right)
+            return self._emit(key, "call", _BINARY[type(node.op)], (left, right))
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+            operand = self._compile(node.operand)
+            return self._emit(key, "call", _UNARY[type(node.op)], (operand,))
+
+        if isinstance(node, ast.BoolOp):
+            fun = _BOOLEAN[type(node.op)]
+            current = self._compile(node.values[0])
+            for value in node.values[1:]:
+                right = self._compile(value)
+                current = self._emit(f"{fun.__name__}({current},{right})", "call", fun, (current, right))
+            self._memo[key] = current
+            return current
+
+        if isinstance(node, ast.Compare):
+            if len(node.ops) > 1:
+                # Chained comparisons are split into pairs, so 'a < b < c'
+                # becomes '(a < b) and (b < c)' with 'b' only computed once.
+                operands = [node.left] + node.comparators
+                current = None
+                for i, op in enumerate(node.ops):
+                    pair = self._compile(ast.Compare(left=operands[i], ops=[op], comparators=[operands[i + 1]]))
+                    if current is None:
+                        current = pair
+                    else:
+                        current = self._emit(
+                            f"logical_and({current},{pair})", "call", numpy.logical_and, (current, pair)
+                        )
+                self._memo[key] = current
+                return current
+
+            op = node.ops[0]
+            left = self._compile(node.left)
+            if isinstance(op, (ast.In, ast.NotIn)):
+                values = self._literal_collection(node.comparators[0])
+                fun = _is_in(values) if isinstance(op, ast.In) else _not_in(values)
+                return self._emit(key, "call", fun, (left,))
+            if type(op) in _COMPARE:
+                right = self._compile(node.comparators[0])
+                return self._emit(key, "call", _COMPARE[type(op)], (left, right))
+            raise ValueError(f"Unsupported comparison '{type(op).__name__}' in expression.")
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in _FUNCTIONS:
+                raise ValueError(f"Unsupported function '{ast.unparse(node.func)}' in expression.")
+            if node.keywords:
+                raise ValueError("Keyword arguments are not supported in expressions.")
+            operands = tuple(self._compile(arg) for arg in node.args)
+            return self._emit(key, "call", _FUNCTIONS[node.func.id], operands)
+
+        raise ValueError(f"Unsupported syntax '{type(node).__name__}' in expression.")
+
+    def _literal_collection(self, node: ast.AST) -> Tuple[Any, ...]:
+        if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+            values = []
+            for elt in node.elts:
+                if (
+                    isinstance(elt, ast.UnaryOp)
+                    and isinstance(elt.op, ast.USub)
+                    and isinstance(elt.operand, ast.Constant)
+                ):
+                    values.append(-elt.operand.value)
+                elif isinstance(elt, ast.Constant):
+                    values.append(elt.value)
+                else:
+                    break
+            else:
+                return tuple(values)
+        raise ValueError("The right-hand side of 'in' should be a tuple or list of literals.")
+
+    def evaluate(self, frame: BiocFrame, chunk_size: Optional[int] = None) -> numpy.ndarray:
+        """Evaluate the expression for each row of a ``BiocFrame``.
+
+        Args:
+            frame:
+                A ``BiocFrame`` containing the referenced columns. Each
+                column should be a NumPy array, a
+                :py:class:`~biocframe.nullable.NullableArray`, a
+                :py:class:`~biocframe.chunked.ChunkedArray`, or a list.
+
+            chunk_size:
+                Number of rows to evaluate at a time. Defaults to
+                :py:data:`~DEFAULT_CHUNK_SIZE`.
+
+        Returns:
+            NumPy array of length equal to the number of rows of ``frame``.
+            This is a masked array if any referenced column contains
+            missing values.
+        """
+        if chunk_size is None:
+            chunk_size = DEFAULT_CHUNK_SIZE
+        if chunk_size <= 0:
+            raise ValueError("'chunk_size' should be positive.")
+
+        columns = {}
+        for kind, arg, _ in self._program:
+            if kind != "name" or arg in columns:
+                continue
+            if frame.has_column(arg):
+                columns[arg] = _as_numpy_column(arg, frame.get_column(arg))
+            elif arg in _CONSTANTS:
+                columns[arg] = None
+            else:
+                raise ValueError(f"Column '{arg}' does not exist.")
+
+        nrows = frame.shape[0]
+        pieces = []
+        for start in range(0, max(nrows, 1), chunk_size):
+            stop = min(start + chunk_size, nrows)
+            pieces.append(self._evaluate_chunk(columns, start, stop))
+
+        if len(pieces) == 1:
+            if self._program[self._output][0] == "name":
+                # Avoid returning a view of the column itself.
+                return pieces[0].copy()
+            return pieces[0]
+        if any(numpy.ma.isMaskedArray(p) for p in pieces):
+            return numpy.ma.concatenate(pieces)
+        return numpy.concatenate(pieces)
+
+    def _evaluate_chunk(self, columns: Dict[str, Optional[numpy.ndarray]], start: int, stop: int) -> numpy.ndarray:
+        values: List[Any] = [None] * len(self._program)
+        for i, (kind, arg, operands) in enumerate(self._program):
+            if kind == "name":
+                col = columns[arg]
+                values[i] = _CONSTANTS[arg] if col is None else col[start:stop]
+            elif kind == "constant":
+                values[i] = arg
+            else:
+                values[i] = arg(*[values[j] for j in operands])
+                for j in self._release[i]:
+                    values[j] = None
+
+        result = values[self._output]
+        if numpy.ndim(result) == 0:
+            result = numpy.full(stop - start, result)
+        return result
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from typing import Any, Callable, List
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+# Hooks registered in each thread (as "hooks"), and the number of instrumented
+# operations currently running in each thread (as "depth"), so that operations
+# called by other operations are not reported separately.
+_STATE = threading.local()
+
+
+def _thread_hooks() -> List[Callable[[str, Any, float], None]]:
+    hooks = getattr(_STATE, "hooks", None)
+    if hooks is None:
+        hooks = []
+        _STATE.hooks = hooks
+    return hooks
+
+
+def add_hook(hook: Callable[[str, Any, float], None]) -> None:
+    """Register a function to be called after each instrumented operation on a
+    :py:class:`~biocframe.BiocFrame.BiocFrame`.
+
+    The instrumented operations are ``"get_slice"``, ``"merge"``,
+    ``"combine_rows"`` and ``"split"``. Only the outermost call is reported,
+    e.g., the slices created inside :py:meth:`~biocframe.BiocFrame.BiocFrame.split`
+    are included in the time for ``"split"``.
+
+    Hooks are registered for the current thread, and are only called for the
+    operations that are performed in that thread.
+
+    Args:
+        hook:
+            Function that accepts the name of the operation, its return
+            value, and the wall time in seconds.
+    """
+    _thread_hooks().append(hook)
+
+
+def remove_hook(hook: Callable[[str, Any, float], None]) -> None:
+    """Remove a function registered with :py:func:`~add_hook` in the current thread.
+
+    Args:
+        hook:
+            The function to remove.
+    """
+    _thread_hooks().remove(hook)
+
+
+def instrumented(name: str) -> Callable:
+    """Decorator to report calls of a function to the registered hooks.
+
+    Args:
+        name:
+            Name of the operation.
+
+    Returns:
+        A decorator. The decorated function only adds a lookup of the
+        current thread's hooks when none are registered.
+    """
+
+    def decorator(fun: Callable) -> Callable:
+        @functools.wraps(fun)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            hooks = getattr(_STATE, "hooks", None)
+            if not hooks or getattr(_STATE, "depth", 0):
+                return fun(*args, **kwargs)
+
+            _STATE.depth = 1
+            try:
+                start = time.perf_counter()
+                output = fun(*args, **kwargs)
+                elapsed = time.perf_counter() - start
+            finally:
+                _STATE.depth = 0
+
+            for hook in list(hooks):
+                hook(name, output, elapsed)
+            return output
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,624 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import biocutils as ut
+import numpy
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def _as_key_list(values: Any) -> list:
+    """Convert a column into a list of hashable keys.
+
+    Args:
+        values:
+            Contents of a column.
+
+    Returns:
+        A list of keys, one per row. Masked entries of NumPy arrays are
+        reported as None.
+    """
+    if isinstance(values, numpy.ndarray):
+        return values.tolist()
+    if isinstance(values, ut.Names):
+        return values.as_list()
+    if isinstance(values, list):
+        return values
+    return list(values)
+
+
+class HashIndex:
+    """Hash index over the values of a single column of a :py:class:`~biocframe.BiocFrame.BiocFrame`.
+
+    Each distinct value is mapped to the positions of the rows that contain it,
+    so that key lookups are O(1) rather than a linear scan of the column. The
+    index keeps a reference to the column it was built from; it is considered
+    stale once that column is replaced in the frame. Missing values (None or
+    masked entries) are not indexed.
+    """
+
+    def __init__(self, column: str, values: Any, unique: bool = False) -> None:
+        """Initialize the index.
+
+        Args:
+            column:
+                Name of the column.
+
+            values:
+                Contents of the column.
+
+            unique:
+                Whether the values are expected to be unique. If True, an error
+                is raised when duplicates are present.
+        """
+        self._column = column
+        self._source = values
+
+        first = {}
+        rest = {}
+        for i, k in enumerate(_as_key_list(values)):
+            if k is None:
+                continue
+            if k in first:
+                if unique:
+                    raise ValueError(f"Duplicate value '{k}' in column '{column}' for a unique index.")
+                if k in rest:
+                    rest[k].append(i)
+                else:
+                    rest[k] = [i]
+            else:
+                first[k] = i
+
+        self._first: Dict[Any, int] = first
+        self._rest: Dict[Any, List[int]] = rest
+
+    @property
+    def columns(self) -> tuple:
+        """
+        Returns:
+            Names of the indexed columns.
+        """
+        return (self._column,)
+
+    @property
+    def column(self) -> str:
+        """
+        Returns:
+            Name of the indexed column.
+        """
+        return self._column
+
+    @property
+    def unique(self) -> bool:
+        """
+        Returns:
+            Whether each key is present in at most one row.
+        """
+        return len(self._rest) == 0
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            Number of distinct keys.
+        """
+        return len(self._first)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._first
+
+    def is_valid_for(self, *values: Any) -> bool:
+        """Check whether the index is still in sync with a column.
+
+        Args:
+            values:
+                Current contents of the indexed column.
+
+        Returns:
+            True if ``values`` is the same object that the index was built from.
+        """
+        return len(values) == 1 and values[0] is self._source
+
+    def get(self, key: Any) -> int:
+        """
+        Args:
+            key:
+                Key of interest.
+
+        Returns:
+            Position of the first row containing ``key``, or -1 if it is absent.
+        """
+        return self._first.get(key, -1)
+
+    def get_all(self, key: Any) -> List[int]:
+        """
+        Args:
+            key:
+                Key of interest.
+
+        Returns:
+            Positions of all rows containing ``key``, in increasing order.
+            This is empty if ``key`` is absent.
+        """
+        i = self._first.get(key)
+        if i is None:
+            return []
+        extra = self._rest.get(key)
+        if extra is None:
+            return [i]
+        return [i] + extra
+
+    def map(self, keys: Sequence[Any]) -> numpy.ndarray:
+        """Find the first row containing each key. This is equivalent to
+        :py:func:`~biocutils.match` with the indexed column as the targets.
+
+        Args:
+            keys:
+                Keys of interest.
+
+        Returns:
+            Integer array of length equal to ``keys``, containing the position
+            of the first row for each key, or -1 if the key is absent.
+        """
+        first = self._first
+        keys = _as_key_list(keys)
+        return numpy.fromiter((first.get(k, -1) for k in keys), dtype=numpy.intp, count=len(keys))
+
+    def extend(self, values: Any, start: int, in_place: bool = False) -> HashIndex:
+        """Index rows appended to the column, without re-indexing the existing rows.
+
+        Args:
+            values:
+                New contents of the indexed column, consisting of the original
+                rows followed by the appended rows.
+
+            start:
+                Position of the first appended row in ``values``.
+
+            in_place:
+                Whether to modify this index in place.
+
+        Returns:
+            An index for ``values``, either as a copy of the current index or
+            as a reference to the (in-place-modified) index.
+        """
+        if in_place:
+            output = self
+            first = self._first
+            rest = self._rest
+        else:
+            output = type(self).__new__(type(self))
+            output._column = self._column
+            first = self._first.copy()
+            rest = dict(self._rest)
+
+        appended = ut.subset_sequence(values, range(start, ut.get_height(values)))
+        for i, k in enumerate(_as_key_list(appended), start):
+            if k is None:
+                continue
+            if k in first:
+                # Copying the list in case it is shared with the original index.
+                rest[k] = rest.get(k, []) + [i]
+            else:
+                first[k] = i
+
+        output._source = values
+        output._first = first
+        output._rest = rest
+        return output
+
+    def locate(self, keys: Sequence[Any]) -> numpy.ndarray:
+        """Find all rows containing any of the keys.
+
+        Args:
+            keys:
+                Keys of interest.
+
+        Raises:
+            ValueError:
+                If any key is absent from the index.
+
+        Returns:
+            Integer array of row positions. Rows are reported in the order of
+            ``keys``; rows sharing a key are reported in increasing order.
+        """
+        keys = _as_key_list(keys)
+        if len(self._rest) == 0:
+            output = self.map(keys)
+            if len(output) and output.min() < 0:
+                missing = keys[int(numpy.argmin(output))]
+                raise ValueError(f"Could not find '{missing}' in column '{self._column}'.")
+            return output
+
+        collected = []
+        for k in keys:
+            found = self.get_all(k)
+            if not found:
+                raise ValueError(f"Could not find '{k}' in column '{self._column}'.")
+            collected += found
+        return numpy.array(collected, dtype=numpy.intp)
+
+
+class SortedIndex:
+    """Sorted index over a numeric column of a :py:class:`~biocframe.BiocFrame.BiocFrame`, for range queries.
+
+    If the column is already sorted in non-decreasing order, only a flag is
+    stored and rows are located directly by binary search. Otherwise, the
+    index stores the permutation that sorts the column. Each range query then
+    takes O(log n + k) time for k matching rows.
+    """
+
+    def __init__(self, column: str, values: Any) -> None:
+        """Initialize the index.
+
+        Args:
+            column:
+                Name of the column.
+
+            values:
+                Contents of the column. This should be a one-dimensional
+                numeric (or datetime) array-like without missing values.
+        """
+        if numpy.ma.is_masked(values):
+            raise ValueError(f"Column '{column}' cannot contain missing values for a sorted index.")
+
+        arr = numpy.asarray(values)
+        if arr.ndim != 1 or arr.dtype.kind not in "biufmM":
+            raise TypeError(f"Column '{column}' must be a one-dimensional numeric array for a sorted index.")
+
+        self._column = column
+        self._source = values
+
+        if len(arr) < 2 or bool(numpy.all(arr[:-1] <= arr[1:])):
+            self._order = None
+            self._sorted = arr
+        else:
+            self._order = numpy.argsort(arr, kind="stable")
+            self._sorted = arr[self._order]
+
+    @property
+    def columns(self) -> tuple:
+        """
+        Returns:
+            Names of the indexed columns.
+        """
+        return (self._column,)
+
+    @property
+    def column(self) -> str:
+        """
+        Returns:
+            Name of the indexed column.
+        """
+        return self._column
+
+    @property
+    def is_sorted(self) -> bool:
+        """
+        Returns:
+            Whether the column itself is sorted, in which case no permutation is stored.
+        """
+        return self._order is None
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            Number of indexed rows.
+        """
+        return len(self._sorted)
+
+    def is_valid_for(self, *values: Any) -> bool:
+        """Check whether the index is still in sync with a column.
+
+        Args:
+            values:
+                Current contents of the indexed column.
+
+        Returns:
+            True if ``values`` is the same object that the index was built from.
+        """
+        return len(values) == 1 and values[0] is self._source
+
+    def search(self, lo: Any = None, hi: Any = None) -> Tuple[Any, Any]:
+        """Find the bounds of a closed range ``[lo, hi]`` in the sorted values.
+
+        Args:
+            lo:
+                Lower bound, inclusive. If None, the range is unbounded below.
+                This may also be an array of lower bounds for multiple queries.
+
+            hi:
+                Upper bound, inclusive. If None, the range is unbounded above.
+                This may also be an array of upper bounds for multiple queries.
+
+        Returns:
+            Tuple containing the start and end positions (or arrays thereof)
+            of each range in the sorted order, as would be used in a slice.
+        """
+        start = 0 if lo is None else numpy.searchsorted(self._sorted, lo, side="left")
+        end = len(self._sorted) if hi is None else numpy.searchsorted(self._sorted, hi, side="right")
+        return start, end
+
+    def query(self, lo: Any = None, hi: Any = None) -> Union[slice, numpy.ndarray]:
+        """Find rows with values in the closed range ``[lo, hi]``.
+
+        Args:
+            lo:
+                Lower bound, inclusive. If None, the range is unbounded below.
+
+            hi:
+                Upper bound, inclusive. If None, the range is unbounded above.
+
+        Returns:
+            If the column is sorted, a slice of the matching rows. Otherwise,
+            an integer array containing the positions of the matching rows in
+            increasing order.
+        """
+        start, end = self.search(lo, hi)
+        start = int(start)
+        end = max(int(end), start)
+        if self._order is None:
+            return slice(start, end)
+        return numpy.sort(self._order[start:end])
+
+
+class IntervalIndex:
+    """Interval index over a pair of start/end columns of a :py:class:`~biocframe.BiocFrame.BiocFrame`, for overlap
+    queries.
+
+    Intervals are treated as closed, i.e., ``[start, end]``, and are stored
+    in a nested containment list (NCList): intervals that are strictly
+    contained in another interval are placed in a sublist of the latter, so
+    that both the starts and the ends are sorted within each sublist. The
+    intervals of a sublist that overlap a query are then found by two binary
+    searches, and only the sublists of overlapping intervals are searched
+    further. Long intervals (e.g., spanning a whole chromosome) and duplicated
+    intervals thus only add their own overlaps to the cost of a query.
+
+    If a grouping column is supplied (e.g., chromosomes), only intervals in
+    the same group can overlap.
+    """
+
+    def __init__(
+        self,
+        start: str,
+        end: str,
+        start_values: Any,
+        end_values: Any,
+        group: Optional[str] = None,
+        group_values: Optional[Any] = None,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            start:
+                Name of the column containing the interval starts.
+
+            end:
+                Name of the column containing the interval ends.
+
+            start_values:
+                Contents of the ``start`` column.
+
+            end_values:
+                Contents of the ``end`` column.
+
+            group:
+                Name of the column containing the group of each interval.
+                If None, all intervals belong to the same group.
+
+            group_values:
+                Contents of the ``group`` column.
+        """
+        starts = _as_bound_array(start, start_values)
+        ends = _as_bound_array(end, end_values)
+        if len(starts) != len(ends):
+            raise ValueError("Start and end columns must have the same length.")
+
+        self._columns = (start, end) if group is None else (start, end, group)
+        self._sources = (start_values, end_values) if group is None else (start_values, end_values, group_values)
+
+        self._groups = {}
+        if group is None:
+            self._groups[None] = _NestedContainmentList(numpy.arange(len(starts)), starts, ends)
+        else:
+            for key, positions in _group_positions(group_values).items():
+                self._groups[key] = _NestedContainmentList(positions, starts[positions], ends[positions])
+
+    @property
+    def columns(self) -> tuple:
+        """
+        Returns:
+            Names of the indexed columns, i.e., the start, end and (if present) group columns.
+        """
+        return self._columns
+
+    def is_valid_for(self, *values: Any) -> bool:
+        """Check whether the index is still in sync with its columns.
+
+        Args:
+            values:
+                Current contents of the indexed columns, in the same order as :py:attr:`~columns`.
+
+        Returns:
+            True if ``values`` are the same objects that the index was built from.
+        """
+        return len(values) == len(self._sources) and all(x is y for x, y in zip(values, self._sources))
+
+    def find_overlaps(
+        self,
+        starts: Any,
+        ends: Any,
+        groups: Optional[Any] = None,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Find all indexed intervals that overlap each query interval.
+
+        Args:
+            starts:
+                Start positions of the query intervals. This may be a scalar
+                for a single query.
+
+            ends:
+                End positions of the query intervals, inclusive. This should be
+                of the same length as ``starts``.
+
+            groups:
+                Group of each query interval. This should be provided if (and
+                only if) the index was created with a grouping column.
+
+        Returns:
+            Tuple of two integer arrays of equal length, containing the query
+            index and the subject row index for each overlapping pair. Pairs
+            are sorted by query and then by subject, so the subject indices can
+            be used directly to subset the rows of the indexed frame.
+        """
+        qstarts = numpy.atleast_1d(numpy.asarray(starts))
+        qends = numpy.atleast_1d(numpy.asarray(ends))
+        if qstarts.shape != qends.shape or qstarts.ndim != 1:
+            raise ValueError("'starts' and 'ends' must be one-dimensional and of the same length.")
+
+        has_group = len(self._columns) == 3
+        if has_group != (groups is not None):
+            raise ValueError("'groups' must be supplied if and only if the index was created with a group column.")
+
+        if groups is None:
+            query_sets = {None: numpy.arange(len(qstarts))}
+        else:
+            if isinstance(groups, str) or numpy.ndim(groups) == 0:
+                groups = [groups] * len(qstarts)
+            if len(groups) != len(qstarts):
+                raise ValueError("'groups' must be of the same length as 'starts'.")
+            query_sets = _group_positions(groups)
+
+        all_queries = []
+        all_subjects = []
+        for key, qpos in query_sets.items():
+            current = self._groups.get(key)
+            if current is None:
+                continue
+            q, s = current.find(qpos, qstarts[qpos], qends[qpos])
+            all_queries.append(q)
+            all_subjects.append(s)
+
+        if len(all_queries) == 0:
+            empty = numpy.zeros(0, dtype=numpy.intp)
+            return empty, empty.copy()
+
+        query_hits = numpy.concatenate(all_queries)
+        subject_hits = numpy.concatenate(all_subjects)
+        order = numpy.lexsort((subject_hits, query_hits))
+        return query_hits[order], subject_hits[order]
+
+
+def _as_bound_array(name: str, values: Any) -> numpy.ndarray:
+    if numpy.ma.is_masked(values):
+        raise ValueError(f"Column '{name}' cannot contain missing values for an interval index.")
+    arr = numpy.asarray(values)
+    if arr.ndim != 1 or arr.dtype.kind not in "biuf":
+        raise TypeError(f"Column '{name}' must be a one-dimensional numeric array for an interval index.")
+    return arr
+
+
+def _group_positions(values: Any) -> Dict[Any, numpy.ndarray]:
+    collected = {}
+    for i, k in enumerate(_as_key_list(values)):
+        if k in collected:
+            collected[k].append(i)
+        else:
+            collected[k] = [i]
+    return {k: numpy.array(v, dtype=numpy.intp) for k, v in collected.items()}
+
+
+class _NestedContainmentList:
+    """Nested containment list for the intervals of one group.
+
+    Intervals are sorted by start and then by end. Each interval is placed in
+    the sublist of the nearest preceding interval that has a larger end (and
+    thus contains it), or in the top-level sublist if there is none. Identical
+    intervals and intervals with the same start are therefore siblings, and
+    both the starts and the ends are sorted within each sublist.
+    """
+
+    # Sublists are stored contiguously: sublist 0 is the top level, and
+    # sublist ``i + 1`` contains the children of the ``i``-th sorted interval.
+    # To search all sublists in one call, each start (or end) is stored as a
+    # key combining its sublist with its rank among the unique starts (ends).
+
+    __slots__ = ("rows", "bounds", "children", "start_values", "start_keys", "end_values", "end_keys", "depth")
+
+    def __init__(self, positions: numpy.ndarray, starts: numpy.ndarray, ends: numpy.ndarray) -> None:
+        n = len(positions)
+        order = numpy.lexsort((ends, starts))
+        starts = starts[order]
+        ends = ends[order]
+
+        # Stack of the intervals containing the current one, in a single pass.
+        parents = []
+        stack = []
+        depth = 0
+        for i, end in enumerate(ends.tolist()):
+            while stack and stack[-1][1] <= end:
+                stack.pop()
+            parents.append(stack[-1][0] if stack else -1)
+            stack.append((i, end))
+            if len(stack) > depth:
+                depth = len(stack)
+
+        sublists = numpy.array(parents, dtype=numpy.intp) + 1
+        layout = numpy.argsort(sublists, kind="stable")
+        sublists = sublists[layout]
+
+        self.rows = positions[order[layout]]
+        self.bounds = numpy.searchsorted(sublists, numpy.arange(n + 2), side="left")
+        self.children = layout + 1
+        self.start_values = numpy.unique(starts)
+        self.start_keys = sublists * (len(self.start_values) + 1) + numpy.searchsorted(
+            self.start_values, starts[layout]
+        )
+        self.end_values = numpy.unique(ends)
+        self.end_keys = sublists * (len(self.end_values) + 1) + numpy.searchsorted(self.end_values, ends[layout])
+        self.depth = depth
+
+    def find(
+        self, qpos: numpy.ndarray, qstarts: numpy.ndarray, qends: numpy.ndarray
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        # An interval overlaps a query if it does not end before the query
+        # start, i.e., its end rank is at least ``end_ranks``; and if it does
+        # not start after the query end, i.e., its start rank is below ``start_ranks``.
+        end_ranks = numpy.searchsorted(self.end_values, qstarts, side="left")
+        start_ranks = numpy.searchsorted(self.start_values, qends, side="right")
+        end_width = len(self.end_values) + 1
+        start_width = len(self.start_values) + 1
+
+        all_queries = []
+        all_subjects = []
+        queries = numpy.arange(len(qpos))
+        sublists = numpy.zeros(len(qpos), dtype=numpy.intp)
+
+        while len(queries):
+            # Both starts and ends are sorted within a sublist, so the
+            # overlapping intervals in each sublist are those in [lo, hi).
+            lo = numpy.searchsorted(self.end_keys, sublists * end_width + end_ranks[queries], side="left")
+            hi = numpy.searchsorted(self.start_keys, sublists * start_width + start_ranks[queries], side="left")
+            counts = numpy.maximum(hi - lo, 0)
+
+            total = int(counts.sum())
+            offsets = numpy.cumsum(counts) - counts
+            hits = numpy.repeat(lo, counts) + (numpy.arange(total) - numpy.repeat(offsets, counts))
+            which = numpy.repeat(queries, counts)
+            all_queries.append(qpos[which])
+            all_subjects.append(self.rows[hits])
+
+            # Intervals can only overlap a query if their container does, so
+            # only the sublists of the overlapping intervals are searched next.
+            children = self.children[hits]
+            nonempty = self.bounds[children + 1] > self.bounds[children]
+            queries = which[nonempty]
+            sublists = children[nonempty]
+
+        if len(all_queries) == 0:
+            empty = numpy.zeros(0, dtype=numpy.intp)
+            return empty, empty.copy()
+        return numpy.concatenate(all_queries), numpy.concatenate(all_subjects)
@@ -0,0 +1,772 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Mapping, Optional, Sequence, Set, Tuple, Union
+
+import biocutils as ut
+import numpy
+
+from .expressions import Expression
+from .hooks import add_hook, remove_hook
+
+if TYPE_CHECKING:
+    from .BiocFrame import BiocFrame
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+_REDUCERS = {
+    "sum": numpy.add,
+    "min": numpy.minimum,
+    "max": numpy.maximum,
+}
+
+_AGGREGATIONS = ("sum", "min", "max", "mean", "count", "first", "last")
+
+
+def _as_expression(x: Any) -> Any:
+    if isinstance(x, str):
+        return Expression(x)
+    return x
+
+
+def _required_names(x: Any) -> Optional[Set[str]]:
+    # Columns needed to evaluate a filter or a new column, or None if unknown.
+    if isinstance(x, Expression):
+        return set(x.names)
+    if callable(x):
+        return None
+    return set()
+
+
+def _restriction(columns: Optional[List[str]]) -> str:
+    return "" if columns is None else " -> " + ", ".join(columns)
+
+
+def _ordered(names: Sequence[str], required: Set[str]) -> List[str]:
+    return [n for n in names if n in required]
+
+
+class _Node:
+    """Base class for the nodes of a query plan. Nodes are never modified after construction."""
+
+    children: Tuple[_Node, ...] = ()
+
+    def schema(self) -> List[str]:
+        raise NotImplementedError
+
+    def label(self) -> str:
+        raise NotImplementedError
+
+
+class _Source(_Node):
+    def __init__(self, frame: BiocFrame) -> None:
+        self.frame = frame
+
+    def schema(self) -> List[str]:
+        return list(self.frame._column_names)
+
+    def label(self) -> str:
+        return f"SOURCE [{self.frame.shape[0]} rows, {self.frame.shape[1]} columns]"
+
+    def run(self) -> BiocFrame:
+        return self.frame
+
+
+class _Select(_Node):
+    def __init__(self, child: _Node, columns: List[str]) -> None:
+        available = set(child.schema())
+        for c in columns:
+            if c not in available:
+                raise ValueError(f"Column '{c}' does not exist.")
+        self.children = (child,)
+        self.columns = columns
+
+    def schema(self) -> List[str]:
+        return list(self.columns)
+
+    def label(self) -> str:
+        return "SELECT " + ", ".join(self.columns)
+
+    def run(self, frame: BiocFrame) -> BiocFrame:
+        return frame.get_slice(slice(None), self.columns)
+
+
+class _Filter(_Node):
+    def __init__(self, child: _Node, predicates: List[Any], columns: Optional[List[str]] = None) -> None:
+        available = set(child.schema())
+        for p in predicates:
+            names = _required_names(p)
+            if names is not None:
+                for n in names:
+                    if n not in available:
+                        raise ValueError(f"Column '{n}' does not exist.")
+        self.children = (child,)
+        self.predicates = predicates
+        self.columns = columns
+
+    def schema(self) -> List[str]:
+        return self.children[0].schema() if self.columns is None else list(self.columns)
+
+    def label(self) -> str:
+        parts = []
+        for p in self.predicates:
+            if isinstance(p, Expression):
+                parts.append(p._expr)
+            elif callable(p):
+                parts.append("<function>")
+            else:
+                parts.append("<mask>")
+        return "FILTER " + " & ".join("(" + p + ")" for p in parts) + _restriction(self.columns)
+
+    def run(self, frame: BiocFrame) -> BiocFrame:
+        from .BiocFrame import _as_row_mask
+
+        # All predicates refine a single index vector, so only the columns
+        # used by each predicate are gathered until the final extraction.
+        indices = None
+        for p in self.predicates:
+            if indices is None:
+                current = frame
+            else:
+                names = _required_names(p)
+                current = frame.get_slice(
+                    indices, slice(None) if names is None else _ordered(frame._column_names, names)
+                )
+
+            if isinstance(p, Expression):
+                mask = p.evaluate(current)
+            elif callable(p):
+                mask = p(current)
+            else:
+                mask = p
+            selected = numpy.flatnonzero(_as_row_mask(mask, current.shape[0]))
+            indices = selected if indices is None else indices[selected]
+
+        return frame.get_slice(indices, slice(None) if self.columns is None else self.columns)
+
+
+class _WithColumns(_Node):
+    def __init__(self, child: _Node, values: Dict[str, Any]) -> None:
+        available = set(child.schema())
+        for v in values.values():
+            names = _required_names(v)
+            if names is not None:
+                for n in names:
+                    if n not in available:
+                        raise ValueError(f"Column '{n}' does not exist.")
+        self.children = (child,)
+        self.values = values
+
+    def schema(self) -> List[str]:
+        output = self.children[0].schema()
+        present = set(output)
+        return output + [n for n in self.values if n not in present]
+
+    def label(self) -> str:
+        parts = []
+        for k, v in self.values.items():
+            if isinstance(v, Expression):
+                parts.append(k + " = " + v._expr)
+            elif callable(v):
+                parts.append(k + " = <function>")
+            else:
+                parts.append(k + " = <values>")
+        return "WITH_COLUMNS " + ", ".join(parts)
+
+    def run(self, frame: BiocFrame) -> BiocFrame:
+        new_columns = {}
+        for k, v in self.values.items():
+            if isinstance(v, Expression):
+                new_columns[k] = v.evaluate(frame)
+            elif callable(v):
+                new_columns[k] = v(frame)
+            else:
+                new_columns[k] = v
+        return frame.set_columns(new_columns)
+
+
+class _Sort(_Node):
+    def __init__(
+        self, child: _Node, by: List[str], descending: List[bool], columns: Optional[List[str]] = None
+    ) -> None:
+        available = set(child.schema())
+        for b in by:
+            if b not in available:
+                raise ValueError(f"Column '{b}' does not exist.")
+        self.children = (child,)
+        self.by = by
+        self.descending = descending
+        self.columns = columns
+
+    def schema(self) -> List[str]:
+        return self.children[0].schema() if self.columns is None else list(self.columns)
+
+    def label(self) -> str:
+        label = "SORT " + ", ".join(b + (" DESC" if d else "") for b, d in zip(self.by, self.descending))
+        return label + _restriction(self.columns)
+
+    def run(self, frame: BiocFrame) -> BiocFrame:
+        keys = []
+        for b, d in zip(self.by, self.descending):
+            values = numpy.asarray(frame.get_column(b))
+            if d:
+                # Negated ranks give a descending order that is still stable.
+                values = -numpy.unique(values, return_inverse=True)[1]
+            keys.append(values)
+        # numpy.lexsort() treats the last key as the primary key.
+        order = numpy.lexsort(keys[::-1]) if len(frame) else numpy.zeros(0, dtype=numpy.intp)
+        return frame.get_slice(order, slice(None) if self.columns is None else self.columns)
+
+
+class _GroupBy(_Node):
+    def __init__(self, child: _Node, by: str, aggregations: Dict[str, Tuple[str, Union[str, Callable]]]) -> None:
+        available = set(child.schema())
+        if by not in available:
+            raise ValueError(f"Column '{by}' does not exist.")
+        for name, (column, fun) in aggregations.items():
+            if column not in available:
+                raise ValueError(f"Column '{column}' does not exist.")
+            if not callable(fun) and fun not in _AGGREGATIONS:
+                raise ValueError(f"Unknown aggregation '{fun}' for '{name}'.")
+            if name == by:
+                raise ValueError(f"Aggregation '{name}' has the same name as the grouping column.")
+        self.children = (child,)
+        self.by = by
+        self.aggregations = aggregations
+
+    def schema(self) -> List[str]:
+        return [self.by] + list(self.aggregations)
+
+    def label(self) -> str:
+        parts = []
+        for name, (column, fun) in self.aggregations.items():
+            parts.append(name + " = " + (fun if isinstance(fun, str) else "<function>") + "(" + column + ")")
+        return "GROUP_BY " + self.by + (" AGG " + ", ".join(parts) if parts else "")
+
+    def run(self, frame: BiocFrame) -> BiocFrame:
+        from .BiocFrame import BiocFrame
+
+        groups = frame.split(self.by, only_indices=True)
+        keys = list(groups.keys())
+        original = frame.get_column(self.by)
+        if isinstance(original, numpy.ndarray) and not numpy.ma.isMaskedArray(original):
+            keys = numpy.array(keys, dtype=original.dtype)
+        counts = numpy.array([len(v) for v in groups.values()], dtype=numpy.intp)
+        ngroups = len(groups)
+        order = numpy.concatenate([numpy.asarray(v, dtype=numpy.intp) for v in groups.values()]) if ngroups else None
+        starts = numpy.cumsum(counts) - counts
+
+        output = {self.by: keys}
+        for name, (column, fun) in self.aggregations.items():
+            values = frame.get_column(column)
+            if fun == "count":
+                output[name] = counts
+            elif callable(fun):
+                output[name] = [fun(ut.subset(values, v)) for v in groups.values()]
+            elif not ngroups:
+                output[name] = numpy.zeros(0, dtype=numpy.asarray(values).dtype)
+            else:
+                # Reordering once so that each group is contiguous, after
+                # which each aggregation is a single vectorized reduction.
+                grouped = numpy.asarray(values)[order]
+                if fun == "first":
+                    output[name] = grouped[starts]
+                elif fun == "last":
+                    output[name] = grouped[starts + counts - 1]
+                elif fun == "mean":
+                    output[name] = numpy.add.reduceat(grouped, starts) / counts
+                else:
+                    output[name] = _REDUCERS[fun].reduceat(grouped, starts)
+
+        return BiocFrame(output, number_of_rows=ngroups)
+
+
+class _Merge(_Node):
+    def __init__(
+        self,
+        left: _Node,
+        right: _Node,
+        by: Optional[str],
+        join: Literal["inner", "left", "right", "outer"],
+        rename_duplicate_columns: bool,
+    ) -> None:
+        if join not in ("inner", "left", "right", "outer"):
+            raise ValueError("Unknown joining strategy '" + join + "'")
+        left_schema = left.schema()
+        right_schema = right.schema()
+        if by is not None:
+            for side in (left_schema, right_schema):
+                if by not in side:
+                    raise ValueError(f"Column '{by}' does not exist.")
+
+        # Output names of the columns from 'right', following merge().
+        taken = set(left_schema)
+        renamed = {}
+        for y in right_schema:
+            if y == by:
+                continue
+            original = y
+            counter = 1
+            while y in taken:
+                if not rename_duplicate_columns:
+                    raise ValueError("Detected duplicate columns across objects to be merged ('" + y + "').")
+                counter += 1
+                y = original + " (" + str(counter) + ")"
+            taken.add(y)
+            renamed[original] = y
+
+        self.children = (left, right)
+        self.by = by
+        self.join = join
+        self.rename_duplicate_columns = rename_duplicate_columns
+        self.renamed = renamed
+
+    def schema(self) -> List[str]:
+        return self.children[0].schema() + list(self.renamed.values())
+
+    def label(self) -> str:
+        return self.join.upper() + " JOIN ON " + ("<row names>" if self.by is None else self.by)
+
+    def run(self, left: BiocFrame, right: BiocFrame) -> BiocFrame:
+        from .BiocFrame import merge
+
+        # Renaming up front, as pruning may have removed the columns that
+        # would have been duplicated.
+        new_names = [self.renamed.get(n, n) for n in right._column_names]
+        if new_names != list(right._column_names):
+            right = right.set_column_names(new_names)
+        return merge([left, right], by=self.by, join=self.join)
+
+
+################################
+######>> optimization <<########
+################################
+
+
+def _optimize(node: _Node) -> _Node:
+    """Push filters towards the sources of the plan, fusing consecutive filters along the way."""
+    if isinstance(node, _Source):
+        return node
+    children = [_optimize(c) for c in node.children]
+    if isinstance(node, _Filter):
+        return _push_filters(children[0], node.predicates)
+    return _replace_children(node, children)
+
+
+def _replace_children(node: _Node, children: List[_Node]) -> _Node:
+    if all(a is b for a, b in zip(children, node.children)):
+        return node
+    return _copy_node(node, children)
+
+
+def _copy_node(node: _Node, children: List[_Node]) -> _Node:
+    output = object.__new__(type(node))
+    output.__dict__.update(node.__dict__)
+    output.children = tuple(children)
+    return output
+
+
+def _push_filters(child: _Node, predicates: List[Any]) -> _Node:
+    if isinstance(child, _Filter) and child.columns is None:
+        return _push_filters(child.children[0], child.predicates + predicates)
+
+    # Only a leading run of expressions is moved, as masks and functions may
+    # depend on the positions of the rows that they receive.
+    movable = 0
+    while movable < len(predicates) and isinstance(predicates[movable], Expression):
+        movable += 1
+
+    pushed: Dict[int, List[Any]] = {}
+    kept = []
+    for i, p in enumerate(predicates):
+        target = _filter_target(child, p) if i < movable and not kept else None
+        if target is None:
+            kept.append(p)
+        else:
+            for t in target:
+                pushed.setdefault(t, []).append(p)
+
+    if pushed:
+        children = list(child.children)
+        for t, preds in pushed.items():
+            children[t] = _push_filters(children[t], preds)
+        child = _replace_children(child, children)
+
+    if not kept:
+        return child
+    return _Filter(child, kept)
+
+
+def _filter_target(child: _Node, predicate: Expression) -> Optional[List[int]]:
+    # Returns the children of 'child' that 'predicate' can be pushed into.
+    names = set(predicate.names)
+    if isinstance(child, (_Select, _Sort)):
+        return [0]
+    if isinstance(child, _WithColumns):
+        if all(isinstance(v, Expression) for v in child.values.values()) and not (names & set(child.values)):
+            return [0]
+        return None
+    if isinstance(child, _GroupBy):
+        if names <= {child.by}:
+            return [0]
+        return None
+    if isinstance(child, _Merge):
+        if child.by is not None and names == {child.by}:
+            return [0, 1]
+        if names <= set(child.children[0].schema()) and child.join in ("left", "inner"):
+            return [0]
+        right_names = {v for k, v in child.renamed.items() if k == v}
+        if child.by is not None:
+            right_names.add(child.by)
+        if names <= right_names and child.join in ("right", "inner"):
+            return [1]
+        return None
+    return None
+
+
+def _prune(node: _Node, required: Optional[Set[str]]) -> _Node:
+    """Restrict each node to the columns that are used downstream, so that rows are only gathered for those
+    columns."""
+    if isinstance(node, _Source):
+        schema = node.schema()
+        if required is None or len(required) == len(schema):
+            return node
+        return _Select(node, _ordered(schema, required))
+
+    if isinstance(node, _Select):
+        columns = node.columns if required is None else _ordered(node.columns, required)
+        child = _prune(node.children[0], set(columns))
+        if child.schema() == columns:
+            return child
+        return _Select(child, columns)
+
+    if isinstance(node, _Filter):
+        need = None if required is None else set(required)
+        for p in node.predicates:
+            names = _required_names(p)
+            if need is not None and names is not None:
+                need |= names
+            else:
+                need = None
+        child = _prune(node.children[0], need)
+        columns = None
+        if required is not None:
+            columns = _ordered(child.schema(), required)
+            if len(columns) == len(child.schema()):
+                columns = None
+        return _Filter(child, node.predicates, columns)
+
+    if isinstance(node, _WithColumns):
+        if required is None:
+            return _replace_children(node, [_prune(node.children[0], None)])
+        values = {k: v for k, v in node.values.items() if k in required}
+        need = required - set(values)
+        for v in values.values():
+            names = _required_names(v)
+            if names is None:
+                need = None
+                break
+            need |= names
+        child = _prune(node.children[0], need)
+        if not values:
+            return child
+        return _WithColumns(child, values)
+
+    if isinstance(node, _Sort):
+        need = None if required is None else required | set(node.by)
+        child = _prune(node.children[0], need)
+        columns = None
+        if required is not None:
+            columns = _ordered(child.schema(), required)
+            if len(columns) == len(child.schema()):
+                columns = None
+        return _Sort(child, node.by, node.descending, columns)
+
+    if isinstance(node, _GroupBy):
+        aggregations = node.aggregations
+        if required is not None:
+            aggregations = {k: v for k, v in aggregations.items() if k in required}
+        need = {node.by} | {column for column, _ in aggregations.values()}
+        child = _prune(node.children[0], need)
+        return _GroupBy(child, node.by, aggregations)
+
+    if isinstance(node, _Merge):
+        left, right = node.children
+        if required is None:
+            left_need = None
+            right_need = None
+        else:
+            left_need = required & set(left.schema())
+            right_need = {k for k, v in node.renamed.items() if v in required}
+            if node.by is not None:
+                left_need.add(node.by)
+                right_need.add(node.by)
+        output = _copy_node(node, [_prune(left, left_need), _prune(right, right_need)])
+        output.renamed = {k: v for k, v in node.renamed.items() if right_need is None or k in right_need}
+        return output
+
+    raise NotImplementedError("unknown node type '" + type(node).__name__ + "'")
+
+
+def _execute(node: _Node, stats: Optional[Dict[int, _NodeStats]] = None) -> BiocFrame:
+    from .BiocFrame import _sizeof
+
+    inputs = [_execute(c, stats) for c in node.children]
+    if stats is None:
+        return node.run(*inputs)
+
+    current = _NodeStats()
+    add_hook(current.record)
+    try:
+        start = time.perf_counter()
+        output = node.run(*inputs)
+        current.time = time.perf_counter() - start
+    finally:
+        remove_hook(current.record)
+
+    current.rows, current.columns = output.shape
+    seen = set()
+    current.bytes = sum(_sizeof(col, True, seen) for col in output._data.values())
+    stats[id(node)] = current
+    return output
+
+
+class _NodeStats:
+    def __init__(self) -> None:
+        self.rows = 0
+        self.columns = 0
+        self.bytes = 0
+        self.time = 0.0
+        self.operations: Dict[str, List[float]] = {}
+
+    def record(self, name: str, output: Any, elapsed: float) -> None:
+        self.operations.setdefault(name, []).append(elapsed)
+
+
+def _format_plan(node: _Node, stats: Optional[Dict[int, _NodeStats]], depth: int, lines: List[str]) -> None:
+    indent = "  " * depth
+    line = indent + node.label()
+    if stats is not None:
+        current = stats[id(node)]
+        line += (
+            f"  [rows={current.rows}, columns={current.columns}, bytes={current.bytes}, "
+            f"time={current.time * 1000:.3f} ms]"
+        )
+    lines.append(line)
+
+    if stats is not None:
+        for name, times in stats[id(node)].operations.items():
+            lines.append(f"{indent}  * {name} x{len(times)}: {sum(times) * 1000:.3f} ms")
+
+    for child in node.children:
+        _format_plan(child, stats, depth + 1, lines)
+
+
+class LazyBiocFrame:
+    """A query plan over a :py:class:`~biocframe.BiocFrame.BiocFrame`, usually created by
+    :py:meth:`~biocframe.BiocFrame.BiocFrame.lazy`.
+
+    Each method records a step and returns a new ``LazyBiocFrame``; nothing is
+    computed until :py:meth:`~collect` is called. The plan is then optimized
+    before execution:
+
+    - Filters are moved below sorts, projections, new columns that they do
+      not use, groupings on the filtered column and (where the join type
+      allows) joins, so that later steps operate on fewer rows.
+    - Consecutive filters are fused so that they refine a single vector of
+      row indices, and the rows of the remaining columns are gathered once.
+    - Columns that are not used by any later step are dropped before any
+      rows are gathered.
+
+    Execution uses :py:meth:`~biocframe.BiocFrame.BiocFrame.get_slice`,
+    :py:func:`~biocframe.BiocFrame.merge` and
+    :py:meth:`~biocframe.BiocFrame.BiocFrame.split`.
+    """
+
+    def __init__(self, frame: Union[BiocFrame, _Node]) -> None:
+        """
+        Args:
+            frame:
+                The ``BiocFrame`` to query.
+        """
+        self._plan = frame if isinstance(frame, _Node) else _Source(frame)
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Returns:
+            Names of the columns that will be present in the result.
+        """
+        return self._plan.schema()
+
+    def __repr__(self) -> str:
+        return "LazyBiocFrame(" + str(len(self.columns)) + " columns, " + str(_count_nodes(self._plan)) + " steps)"
+
+    def select(self, columns: Union[str, Sequence[str]]) -> LazyBiocFrame:
+        """Retain a subset of columns.
+
+        Args:
+            columns:
+                Name or names of the columns to retain, in the desired order.
+
+        Returns:
+            A new ``LazyBiocFrame`` with the projection added.
+        """
+        if isinstance(columns, str):
+            columns = [columns]
+        return LazyBiocFrame(_Select(self._plan, list(columns)))
+
+    def filter(
+        self, predicate: Union[str, Expression, Callable[[BiocFrame], Sequence[bool]], Sequence[bool]]
+    ) -> LazyBiocFrame:
+        """Retain the rows that satisfy a condition.
+
+        Args:
+            predicate:
+                String containing an expression, see
+                :py:class:`~biocframe.expressions.Expression`. Only
+                expressions can be moved to earlier steps by the optimizer.
+
+                Alternatively, a function that accepts the intermediate
+                ``BiocFrame`` and returns a boolean vector, or the boolean
+                vector itself.
+
+        Returns:
+            A new ``LazyBiocFrame`` with the filter added.
+        """
+        return LazyBiocFrame(_Filter(self._plan, [_as_expression(predicate)]))
+
+    def with_columns(self, columns: Mapping[str, Any]) -> LazyBiocFrame:
+        """Add or replace columns.
+
+        Args:
+            columns:
+                Mapping of column names to their contents. Strings are parsed
+                as expressions, functions are called with the intermediate
+                ``BiocFrame``, and all other values are used as-is.
+
+        Returns:
+            A new ``LazyBiocFrame`` with the columns added.
+        """
+        values = {}
+        for k, v in columns.items():
+            if not isinstance(k, str):
+                raise TypeError("column names should be strings.")
+            values[k] = _as_expression(v)
+        return LazyBiocFrame(_WithColumns(self._plan, values))
+
+    def sort(self, by: Union[str, Sequence[str]], descending: Union[bool, Sequence[bool]] = False) -> LazyBiocFrame:
+        """Sort the rows by one or more columns. Sorting is stable.
+
+        Args:
+            by:
+                Name or names of the columns to sort by, in order of priority.
+
+            descending:
+                Whether to sort in descending order. This may also be a
+                sequence of booleans with one entry per column in ``by``.
+
+        Returns:
+            A new ``LazyBiocFrame`` with the sort added.
+        """
+        if isinstance(by, str):
+            by = [by]
+        by = list(by)
+        if isinstance(descending, bool):
+            descending = [descending] * len(by)
+        elif len(descending) != len(by):
+            raise ValueError("'descending' should have the same length as 'by'.")
+        return LazyBiocFrame(_Sort(self._plan, by, list(descending)))
+
+    def group_by(self, by: str, aggregations: Mapping[str, Tuple[str, Union[str, Callable]]]) -> LazyBiocFrame:
+        """Aggregate the values of columns for each group of rows.
+
+        Args:
+            by:
+                Name of the column defining the groups.
+
+            aggregations:
+                Mapping of output column names to tuples of ``(column,
+                function)``. ``function`` may be one of ``"sum"``, ``"min"``,
+                ``"max"``, ``"mean"``, ``"count"``, ``"first"`` or ``"last"``,
+                which are computed for all groups at once; or any function
+                that accepts the values of ``column`` for one group.
+
+        Returns:
+            A new ``LazyBiocFrame`` with one row per group, containing the
+            group in the ``by`` column (in order of first appearance) and one
+            column per aggregation.
+        """
+        return LazyBiocFrame(_GroupBy(self._plan, by, dict(aggregations)))
+
+    def merge(
+        self,
+        other: Union[BiocFrame, LazyBiocFrame],
+        by: Optional[str] = None,
+        join: Literal["inner", "left", "right", "outer"] = "left",
+        rename_duplicate_columns: bool = False,
+    ) -> LazyBiocFrame:
+        """Merge with another ``BiocFrame``, see :py:func:`~biocframe.BiocFrame.merge`.
+
+        Args:
+            other:
+                A ``BiocFrame`` or ``LazyBiocFrame`` to merge with.
+
+            by:
+                Name of the column containing the keys in both objects. If
+                None, the row names are used as keys.
+
+            join:
+                Strategy for the merge.
+
+            rename_duplicate_columns:
+                Whether to rename duplicated non-key columns from ``other``.
+
+        Returns:
+            A new ``LazyBiocFrame`` with the merge added.
+        """
+        other_plan = other._plan if isinstance(other, LazyBiocFrame) else _Source(other)
+        return LazyBiocFrame(_Merge(self._plan, other_plan, by, join, rename_duplicate_columns))
+
+    def collect(self) -> BiocFrame:
+        """Optimize and execute the plan.
+
+        Returns:
+            The resulting ``BiocFrame``.
+        """
+        return _execute(_prune(_optimize(self._plan), None))
+
+    def explain(self, analyze: bool = False) -> str:
+        """Describe the optimized plan.
+
+        Args:
+            analyze:
+                Whether to execute the plan and report statistics for each
+                step: the number of rows and columns of its output, the bytes
+                used by its columns (as in
+                :py:meth:`~biocframe.BiocFrame.BiocFrame.memory_usage`), and
+                its wall time excluding that of its inputs. Each step is
+                followed by the number of calls and the total wall time of
+                the ``get_slice``, ``merge``, ``combine_rows`` and ``split``
+                operations that it used, as reported through
+                :py:func:`~biocframe.hooks.add_hook`.
+
+        Returns:
+            String containing the tree of steps, one per line, where the
+            inputs of each step are indented below it.
+        """
+        plan = _prune(_optimize(self._plan), None)
+        stats = None
+        if analyze:
+            stats = {}
+            _execute(plan, stats)
+
+        lines = []
+        _format_plan(plan, stats, 0, lines)
+        return "\n".join(lines)
+
+
+def _count_nodes(node: _Node) -> int:
+    return 1 + sum(_count_nodes(c) for c in node.children)
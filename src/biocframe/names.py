@@ -0,0 +1,846 @@
+from __future__ import annotations
+
+import sys
+from copy import deepcopy
+from typing import Any, Iterator, List, Optional, Sequence, Union
+
+import biocutils as ut
+import numpy
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def _as_names(names: Union[Sequence[str], numpy.ndarray, ut.Names]) -> ut.Names:
+    """Coerce names into a :py:class:`~biocutils.Names` object.
+
+    Args:
+        names:
+            Sequence of names. NumPy string arrays are wrapped in a
+            :py:class:`~StringArrayNames` without conversion into a list.
+
+    Returns:
+        A ``Names`` object.
+    """
+    if isinstance(names, ut.Names):
+        return names
+    if isinstance(names, numpy.ndarray) and names.ndim == 1 and names.dtype.kind in "UT":
+        return StringArrayNames(names)
+    return ut.Names(names)
+
+
+class _CompactNames(ut.Names):
+    """Base class for :py:class:`~biocutils.Names` that are generated on demand from a compact representation.
+
+    Subclasses store their representation in ``_compact`` and override the
+    read-only methods to work on it directly. Reading the underlying list of
+    strings (e.g., in :py:meth:`~biocutils.Names.as_list`) creates a temporary
+    list without discarding the compact representation. Only the methods
+    inherited from :py:class:`~biocutils.Names` that modify the names (e.g.,
+    :py:meth:`~biocutils.Names.append`) cause the names to be materialized,
+    after which the object behaves like a regular ``Names``.
+    """
+
+    def __init__(self, compact: Any) -> None:
+        self._compact = compact
+        self._materialized = None
+        self._reverse = None
+
+    @property
+    def _names(self) -> List[str]:
+        if self._compact is not None:
+            return self._materialize()
+        return self._materialized
+
+    @_names.setter
+    def _names(self, names: List[str]) -> None:
+        self._materialized = names
+        self._compact = None
+
+    def _materialize(self) -> List[str]:
+        return [str(x) for x in self._compact]
+
+    def _detach(self) -> None:
+        # Called before any in-place modification of the list of strings.
+        if self._compact is not None:
+            self._names = self._materialize()
+
+    def _wipe_reverse_index(self) -> None:
+        self._detach()
+        self._reverse = None
+
+    def _define_output(self, in_place: bool) -> ut.Names:
+        output = self if in_place else self.copy()
+        output._detach()
+        return output
+
+    def set_value(self, index: int, value: str, in_place: bool = False) -> ut.Names:
+        """
+        Args:
+            index: Position of interest.
+
+            value: Replacement name.
+
+            in_place: Whether to perform the modification in-place.
+
+        Returns:
+            A modified ``Names`` object with the replacement name, either as a
+            new object or as a reference to the current object.
+        """
+        return ut.Names.set_value(self._define_output(in_place), index, value, in_place=True)
+
+    def __len__(self) -> int:
+        if self._compact is None:
+            return super().__len__()
+        return len(self._compact)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._compact is None:
+            return super().__iter__()
+        return (str(x) for x in self._compact)
+
+    def __sizeof__(self) -> int:
+        size = object.__sizeof__(self)
+        if self._compact is None:
+            return size + sys.getsizeof(self._materialized) + sum(sys.getsizeof(x) for x in self._materialized)
+        if isinstance(self._compact, numpy.ndarray):
+            return size + self._compact.nbytes
+        return size + sys.getsizeof(self._compact)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ut.Names):
+            return False
+        if len(self) != len(other):
+            return False
+        return all(x == y for x, y in zip(self, other))
+
+    def __ne__(self, other: Any) -> bool:
+        return not self.__eq__(other)
+
+    def __str__(self) -> str:
+        return str(list(self))
+
+    def __repr__(self) -> str:
+        if self._compact is None:
+            return super().__repr__()
+        return type(self).__name__ + "(" + repr(self._compact) + ")"
+
+    def get_value(self, index: int) -> str:
+        """
+        Args:
+            index: Position of interest.
+
+        Returns:
+            The name at the specified position.
+        """
+        if self._compact is None:
+            return super().get_value(index)
+        return str(self._compact[index])
+
+    def get_slice(self, index: Any) -> ut.Names:
+        """
+        Args:
+            index:
+                Positions of interest, see
+                :py:func:`~biocutils.normalize_subscript.normalize_subscript`
+                for details.
+
+        Returns:
+            A ``Names`` containing the names at the specified positions.
+        """
+        return ut.Names(self._names, _validate=False).get_slice(index)
+
+    def copy(self) -> ut.Names:
+        """
+        Returns:
+            A shallow copy of the current object. The compact representation
+            is shared as it is never modified in place.
+        """
+        if self._compact is None:
+            return ut.Names(self._names.copy(), _validate=False)
+        return type(self)(self._compact)
+
+    def __deepcopy__(self, memo: Optional[dict] = None) -> ut.Names:
+        if self._compact is None:
+            return ut.Names(deepcopy(self._names, memo), _validate=False)
+        return type(self)(deepcopy(self._compact, memo))
+
+
+class RangeNames(_CompactNames):
+    """Implicit names consisting of the string representation of integer labels, similar to a **pandas**
+    ``RangeIndex``.
+
+    The labels are stored as a :py:class:`range` (i.e., start, stop and step)
+    or as an integer NumPy array, so the strings are never created unless
+    explicitly requested. Lookup of a name by :py:meth:`~map` takes O(1) time
+    for a range, and slicing a range by another range yields a range.
+    """
+
+    def __init__(self, labels: Union[int, range, Sequence[int], numpy.ndarray]) -> None:
+        """
+        Args:
+            labels:
+                Integer labels for the names. This may be an integer ``n``,
+                equivalent to ``range(n)``; a :py:class:`range`; or a sequence
+                or NumPy array of integers.
+        """
+        if isinstance(labels, int):
+            labels = range(labels)
+        elif not isinstance(labels, range):
+            labels = numpy.asarray(labels)
+            if labels.ndim != 1 or (len(labels) and labels.dtype.kind not in "iu"):
+                raise TypeError("'labels' should be a one-dimensional sequence of integers.")
+            labels = labels.astype(numpy.int64, copy=False)
+
+        super().__init__(labels)
+        self._label_reverse = None
+
+    @property
+    def labels(self) -> Optional[Union[range, numpy.ndarray]]:
+        """
+        Returns:
+            The integer labels, or None if the names have been materialized.
+        """
+        return self._compact
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, RangeNames) and self._compact is not None and other._compact is not None:
+            if isinstance(self._compact, range) and isinstance(other._compact, range):
+                return self._compact == other._compact
+            return numpy.array_equal(self._compact, other._compact)
+        return super().__eq__(other)
+
+    def get_slice(self, index: Any) -> ut.Names:
+        """
+        Args:
+            index:
+                Positions of interest, see
+                :py:func:`~biocutils.normalize_subscript.normalize_subscript`
+                for details. Strings are matched against the names.
+
+        Returns:
+            A ``RangeNames`` containing the names at the specified positions.
+        """
+        if self._compact is None:
+            return super().get_slice(index)
+
+        index, _ = ut.normalize_subscript(index, len(self), self)
+        labels = self._compact
+        if isinstance(labels, range) and isinstance(index, range):
+            n = len(index)
+            if n == 0:
+                return type(self)(range(0))
+            step = labels.step * index.step
+            start = labels[index.start]
+            return type(self)(range(start, start + step * n, step))
+
+        return type(self)(numpy.asarray(labels)[numpy.asarray(index, dtype=numpy.intp)])
+
+    def map(self, name: str) -> int:
+        """
+        Args:
+            name: Name of interest.
+
+        Returns:
+            Index containing the position of the first occurrence of ``name``;
+            or -1, if ``name`` is not present in this object.
+        """
+        if self._compact is None:
+            return super().map(name)
+
+        try:
+            value = int(name)
+        except (TypeError, ValueError):
+            return -1
+        if str(value) != name:
+            return -1
+
+        labels = self._compact
+        if isinstance(labels, range):
+            return labels.index(value) if value in labels else -1
+
+        if self._label_reverse is None:
+            uniq, first = numpy.unique(labels, return_index=True)
+            self._label_reverse = dict(zip(uniq.tolist(), first.tolist()))
+        return self._label_reverse.get(value, -1)
+
+    @property
+    def is_unique(self) -> bool:
+        """
+        Returns:
+            True if all names are unique, otherwise False.
+        """
+        if self._compact is None:
+            return super().is_unique
+        if isinstance(self._compact, range):
+            return True
+        return len(numpy.unique(self._compact)) == len(self._compact)
+
+
+@ut.combine_sequences.register(RangeNames)
+def _combine_sequences_RangeNames(*x: ut.Names) -> ut.Names:
+    if not all(isinstance(y, RangeNames) and y.labels is not None for y in x):
+        return ut.combine_sequences.dispatch(ut.Names)(*x)
+
+    labels = [y.labels for y in x if len(y.labels)]
+    if len(labels) == 0:
+        return RangeNames(0)
+
+    if all(isinstance(y, range) for y in labels):
+        first = labels[0]
+        contiguous = True
+        for i in range(1, len(labels)):
+            if labels[i].step != first.step or labels[i].start != labels[i - 1][-1] + first.step:
+                contiguous = False
+                break
+        if contiguous:
+            last = labels[-1]
+            return RangeNames(range(first.start, last[-1] + first.step, first.step))
+
+    return RangeNames(numpy.concatenate([numpy.asarray(y, dtype=numpy.int64) for y in labels]))
+
+
+class StringArrayNames(_CompactNames):
+    """Names backed by a NumPy string array, either fixed-width (``<U``) or variable-width (``StringDType``).
+
+    This avoids the per-element overhead of a list of Python strings for large
+    numbers of names, e.g., cell barcodes. Slicing is performed by vectorized
+    gathers on the array, and equality checks use :py:func:`~numpy.array_equal`.
+    The reverse index used by :py:meth:`~map` is only built on first use.
+    """
+
+    def __init__(self, names: Union[numpy.ndarray, Sequence[str]]) -> None:
+        """
+        Args:
+            names:
+                NumPy array of strings. Other sequences of strings are
+                converted into a fixed-width string array.
+        """
+        if not isinstance(names, numpy.ndarray):
+            names = numpy.array([str(y) for y in names], dtype=str)
+        if names.ndim != 1 or names.dtype.kind not in "UT":
+            raise TypeError("'names' should be a one-dimensional NumPy array of strings.")
+
+        super().__init__(names)
+        self._array_reverse = None
+
+    @property
+    def array(self) -> Optional[numpy.ndarray]:
+        """
+        Returns:
+            The underlying string array, or None if the names have been materialized.
+        """
+        return self._compact
+
+    def _materialize(self) -> List[str]:
+        return self._compact.tolist()
+
+    def __iter__(self) -> Iterator[str]:
+        if self._compact is None:
+            return super().__iter__()
+        return iter(self._compact.tolist())
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, StringArrayNames) and self._compact is not None and other._compact is not None:
+            return numpy.array_equal(self._compact, other._compact)
+        return super().__eq__(other)
+
+    def get_slice(self, index: Any) -> ut.Names:
+        """
+        Args:
+            index:
+                Positions of interest, see
+                :py:func:`~biocutils.normalize_subscript.normalize_subscript`
+                for details. Strings are matched against the names.
+
+        Returns:
+            A ``StringArrayNames`` containing the names at the specified positions.
+        """
+        if self._compact is None:
+            return super().get_slice(index)
+
+        index, _ = ut.normalize_subscript(index, len(self), self)
+        if isinstance(index, range) and index.step > 0:
+            return type(self)(self._compact[index.start : index.stop : index.step])
+        return type(self)(self._compact[numpy.asarray(index, dtype=numpy.intp)])
+
+    def map(self, name: str) -> int:
+        """
+        Args:
+            name: Name of interest.
+
+        Returns:
+            Index containing the position of the first occurrence of ``name``;
+            or -1, if ``name`` is not present in this object.
+        """
+        if self._compact is None:
+            return super().map(name)
+
+        if self._array_reverse is None:
+            reverse = {}
+            for i, x in enumerate(self._compact.tolist()):
+                if x not in reverse:
+                    reverse[x] = i
+            self._array_reverse = reverse
+        return self._array_reverse.get(name, -1)
+
+    @property
+    def is_unique(self) -> bool:
+        """
+        Returns:
+            True if all names are unique, otherwise False.
+        """
+        if self._compact is None:
+            return super().is_unique
+        return len(numpy.unique(self._compact)) == len(self._compact)
+
+
+@ut.combine_sequences.register(StringArrayNames)
+def _combine_sequences_StringArrayNames(*x: ut.Names) -> ut.Names:
+    if not all(isinstance(y, StringArrayNames) and y.array is not None for y in x):
+        return ut.combine_sequences.dispatch(ut.Names)(*x)
+    return StringArrayNames(numpy.concatenate([y.array for y in x]))
+
+
+class PartialNames(_CompactNames):
+    """Names where only some positions have a name and all other names are empty strings, e.g., after combining
+    objects with and without row names.
+
+    Only the positions of the named entries and their names are stored, so
+    the memory usage does not depend on the number of empty names. Lookup of a
+    single name and slicing use binary search on the positions.
+    """
+
+    def __init__(
+        self,
+        length: int,
+        positions: Union[Sequence[int], numpy.ndarray],
+        names: Union[Sequence[str], numpy.ndarray, ut.Names],
+    ) -> None:
+        """
+        Args:
+            length:
+                Total number of names.
+
+            positions:
+                Strictly increasing positions of the named entries, all less
+                than ``length``.
+
+            names:
+                Names at ``positions``.
+        """
+        positions = numpy.asarray(positions, dtype=numpy.int64)
+        names = _as_names(names)
+        if positions.ndim != 1 or len(positions) != len(names):
+            raise ValueError("'positions' and 'names' should be of the same length.")
+        if len(positions) and (
+            positions[0] < 0 or positions[-1] >= length or numpy.any(positions[1:] <= positions[:-1])
+        ):
+            raise ValueError("'positions' should be strictly increasing and less than 'length'.")
+
+        super().__init__((length, positions, names))
+
+    @property
+    def positions(self) -> Optional[numpy.ndarray]:
+        """
+        Returns:
+            Positions of the named entries, or None if the names have been materialized.
+        """
+        return None if self._compact is None else self._compact[1]
+
+    @property
+    def values(self) -> Optional[ut.Names]:
+        """
+        Returns:
+            Names of the named entries, or None if the names have been materialized.
+        """
+        return None if self._compact is None else self._compact[2]
+
+    def _materialize(self) -> List[str]:
+        length, positions, names = self._compact
+        output = [""] * length
+        for i, name in zip(positions.tolist(), names):
+            output[i] = name
+        return output
+
+    def __len__(self) -> int:
+        if self._compact is None:
+            return super().__len__()
+        return self._compact[0]
+
+    def __iter__(self) -> Iterator[str]:
+        if self._compact is None:
+            return super().__iter__()
+        return iter(self._materialize())
+
+    def __sizeof__(self) -> int:
+        if self._compact is None:
+            return super().__sizeof__()
+        _, positions, names = self._compact
+        size = object.__sizeof__(self) + positions.nbytes + sys.getsizeof(names)
+        if getattr(names, "_compact", None) is None:
+            size += sys.getsizeof(names.as_list()) + sum(sys.getsizeof(x) for x in names)
+        return size
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PartialNames) and self._compact is not None and other._compact is not None:
+            return (
+                self._compact[0] == other._compact[0]
+                and numpy.array_equal(self._compact[1], other._compact[1])
+                and self._compact[2] == other._compact[2]
+            )
+        return super().__eq__(other)
+
+    def __repr__(self) -> str:
+        if self._compact is None:
+            return super().__repr__()
+        length, positions, names = self._compact
+        return type(self).__name__ + "(" + str(length) + ", " + repr(positions) + ", " + repr(names) + ")"
+
+    def get_value(self, index: int) -> str:
+        """
+        Args:
+            index: Position of interest.
+
+        Returns:
+            The name at the specified position.
+        """
+        if self._compact is None:
+            return super().get_value(index)
+
+        length, positions, names = self._compact
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("index out of range")
+        k = int(numpy.searchsorted(positions, index))
+        if k < len(positions) and positions[k] == index:
+            return names.get_value(k)
+        return ""
+
+    def get_slice(self, index: Any) -> ut.Names:
+        """
+        Args:
+            index:
+                Positions of interest, see
+                :py:func:`~biocutils.normalize_subscript.normalize_subscript`
+                for details. Strings are matched against the names.
+
+        Returns:
+            A ``PartialNames`` containing the names at the specified positions.
+        """
+        if self._compact is None:
+            return super().get_slice(index)
+
+        index, _ = ut.normalize_subscript(index, len(self), self)
+        _, positions, names = self._compact
+        index = numpy.asarray(index, dtype=numpy.int64)
+        k = numpy.searchsorted(positions, index)
+        found = k < len(positions)
+        found[found] = positions[k[found]] == index[found]
+        return type(self)(len(index), numpy.flatnonzero(found), names.get_slice(k[found]))
+
+    def map(self, name: str) -> int:
+        """
+        Args:
+            name: Name of interest.
+
+        Returns:
+            Index containing the position of the first occurrence of ``name``;
+            or -1, if ``name`` is not present in this object.
+        """
+        if self._compact is None:
+            return super().map(name)
+
+        length, positions, names = self._compact
+        found = names.map(name)
+        found = int(positions[found]) if found >= 0 else -1
+        if name == "" and len(positions) < length:
+            # First position without a name, i.e., where the positions stop
+            # being equal to their own index.
+            gaps = numpy.flatnonzero(positions != numpy.arange(len(positions)))
+            gap = int(gaps[0]) if len(gaps) else len(positions)
+            found = gap if found < 0 else min(found, gap)
+        return found
+
+    @property
+    def is_unique(self) -> bool:
+        """
+        Returns:
+            True if all names are unique, otherwise False.
+        """
+        if self._compact is None:
+            return super().is_unique
+        length, positions, names = self._compact
+        missing = length - len(positions)
+        if missing > 1 or not names.is_unique:
+            return False
+        return missing == 0 or names.map("") < 0
+
+    def copy(self) -> ut.Names:
+        """
+        Returns:
+            A shallow copy of the current object. The compact representation
+            is shared as it is never modified in place.
+        """
+        if self._compact is None:
+            return super().copy()
+        return type(self)(*self._compact)
+
+    def __deepcopy__(self, memo: Optional[dict] = None) -> ut.Names:
+        if self._compact is None:
+            return super().__deepcopy__(memo)
+        length, positions, names = self._compact
+        return type(self)(length, positions.copy(), deepcopy(names, memo))
+
+
+def _combine_partial_names(pieces: Sequence[Union[int, ut.Names]]) -> PartialNames:
+    """Combine names with runs of empty names.
+
+    Args:
+        pieces:
+            Sequence of ``Names``, or integers specifying the number of empty
+            names at that position.
+
+    Returns:
+        A ``PartialNames`` containing the combined names.
+    """
+    positions = []
+    values = []
+    offset = 0
+    for y in pieces:
+        if isinstance(y, int):
+            offset += y
+            continue
+        if isinstance(y, PartialNames) and y.positions is not None:
+            if len(y.values):
+                positions.append(y.positions + offset)
+                values.append(y.values)
+        elif len(y):
+            positions.append(numpy.arange(offset, offset + len(y), dtype=numpy.int64))
+            values.append(y)
+        offset += len(y)
+
+    if len(values) == 0:
+        return PartialNames(offset, [], [])
+    return PartialNames(offset, numpy.concatenate(positions), ut.combine_sequences(*values))
+
+
+@ut.combine_sequences.register(PartialNames)
+def _combine_sequences_PartialNames(*x: ut.Names) -> ut.Names:
+    return _combine_partial_names(x)
+
+
+_VECTOR_BITS = 5
+_VECTOR_WIDTH = 1 << _VECTOR_BITS
+_VECTOR_MASK = _VECTOR_WIDTH - 1
+
+
+def _new_path(shift: int, node: tuple) -> tuple:
+    while shift > 0:
+        node = (node,)
+        shift -= _VECTOR_BITS
+    return node
+
+
+class _NameVector:
+    """Persistent vector of strings, stored as a tree of tuples with up to 32 children per node and a separate
+    tail for the last (up to) 32 elements, as in Clojure's ``PersistentVector``."""
+
+    __slots__ = ("_size", "_shift", "_root", "_tail")
+
+    def __init__(self, size: int, shift: int, root: tuple, tail: tuple) -> None:
+        self._size = size
+        self._shift = shift
+        self._root = root
+        self._tail = tail
+
+    @classmethod
+    def from_list(cls, names: List[str]) -> _NameVector:
+        n = len(names)
+        tail_start = ((n - 1) >> _VECTOR_BITS) << _VECTOR_BITS if n else 0
+        level = [tuple(names[i : i + _VECTOR_WIDTH]) for i in range(0, tail_start, _VECTOR_WIDTH)]
+        shift = _VECTOR_BITS
+        while len(level) > _VECTOR_WIDTH:
+            level = [tuple(level[i : i + _VECTOR_WIDTH]) for i in range(0, len(level), _VECTOR_WIDTH)]
+            shift += _VECTOR_BITS
+        return cls(n, shift, tuple(level), tuple(names[tail_start:]))
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._size
+        if index < 0 or index >= self._size:
+            raise IndexError("index out of range")
+
+        tail_start = self._size - len(self._tail)
+        if index >= tail_start:
+            return self._tail[index - tail_start]
+
+        node = self._root
+        shift = self._shift
+        while shift > 0:
+            node = node[(index >> shift) & _VECTOR_MASK]
+            shift -= _VECTOR_BITS
+        return node[index & _VECTOR_MASK]
+
+    def __iter__(self) -> Iterator[str]:
+        stack = [(self._root, self._shift)]
+        while stack:
+            node, shift = stack.pop()
+            if shift == 0:
+                yield from node
+            else:
+                stack += [(child, shift - _VECTOR_BITS) for child in reversed(node)]
+        yield from self._tail
+
+    def __sizeof__(self) -> int:
+        size = object.__sizeof__(self) + sys.getsizeof(self._tail)
+        stack = [(self._root, self._shift)]
+        while stack:
+            node, shift = stack.pop()
+            size += sys.getsizeof(node)
+            if shift > 0:
+                stack += [(child, shift - _VECTOR_BITS) for child in node]
+        return size
+
+    def _push_tail(self, shift: int, parent: tuple, tail: tuple) -> tuple:
+        subidx = ((self._size - 1) >> shift) & _VECTOR_MASK
+        if shift == _VECTOR_BITS:
+            node = tail
+        elif subidx < len(parent):
+            node = self._push_tail(shift - _VECTOR_BITS, parent[subidx], tail)
+        else:
+            node = _new_path(shift - _VECTOR_BITS, tail)
+
+        if subidx < len(parent):
+            return parent[:subidx] + (node,) + parent[subidx + 1 :]
+        return parent + (node,)
+
+    def append(self, name: str) -> _NameVector:
+        if len(self._tail) < _VECTOR_WIDTH:
+            return type(self)(self._size + 1, self._shift, self._root, self._tail + (name,))
+
+        shift = self._shift
+        if (self._size >> _VECTOR_BITS) > (1 << shift):
+            root = (self._root, _new_path(shift, self._tail))
+            shift += _VECTOR_BITS
+        else:
+            root = self._push_tail(shift, self._root, self._tail)
+        return type(self)(self._size + 1, shift, root, (name,))
+
+
+class PersistentNames(_CompactNames):
+    """Names stored in a persistent vector, for the column names of a
+    :py:class:`~biocframe.BiocFrame.BiocFrame` with many columns.
+
+    The vector is never modified in place, so appending a name with
+    :py:meth:`~safe_append` shares all existing names with the original
+    object and takes O(log n) time, rather than the O(n) needed to copy a
+    list. Positional access also takes O(log n) time. The reverse index used
+    by :py:meth:`~map` is only built on first use.
+    """
+
+    def __init__(self, names: Union[Sequence[str], ut.Names, _NameVector]) -> None:
+        """
+        Args:
+            names:
+                Sequence of names.
+        """
+        if not isinstance(names, _NameVector):
+            if isinstance(names, ut.Names) and getattr(names, "_compact", None) is None:
+                names = names.as_list()
+            elif not isinstance(names, list):
+                names = [str(y) for y in names]
+            names = _NameVector.from_list(names)
+        super().__init__(names)
+
+    def _materialize(self) -> List[str]:
+        return list(self._compact)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._compact is None:
+            return super().__iter__()
+        return iter(self._compact)
+
+    def get_value(self, index: int) -> str:
+        """
+        Args:
+            index: Position of interest.
+
+        Returns:
+            The name at the specified position.
+        """
+        if self._compact is None:
+            return super().get_value(index)
+        return self._compact[index]
+
+    def get_slice(self, index: Any) -> ut.Names:
+        """
+        Args:
+            index:
+                Positions of interest, see
+                :py:func:`~biocutils.normalize_subscript.normalize_subscript`
+                for details. Strings are matched against the names.
+
+        Returns:
+            A ``Names`` containing the names at the specified positions.
+        """
+        if self._compact is None:
+            return super().get_slice(index)
+        index, _ = ut.normalize_subscript(index, len(self), self)
+        return ut.Names([self._compact[i] for i in index], _validate=False)
+
+    def map(self, name: str) -> int:
+        """
+        Args:
+            name: Name of interest.
+
+        Returns:
+            Index containing the position of the first occurrence of ``name``;
+            or -1, if ``name`` is not present in this object.
+        """
+        if self._compact is None:
+            return super().map(name)
+
+        if self._reverse is None:
+            reverse = {}
+            for i, x in enumerate(self._compact):
+                if x not in reverse:
+                    reverse[x] = i
+            self._reverse = reverse
+        return self._reverse.get(name, -1)
+
+    @property
+    def is_unique(self) -> bool:
+        """
+        Returns:
+            True if all names are unique, otherwise False.
+        """
+        if self._compact is None:
+            return super().is_unique
+        return len(set(self._compact)) == len(self._compact)
+
+    def safe_append(self, value: str, in_place: bool = False) -> ut.Names:
+        """
+        Args:
+            value: Name to be added.
+
+            in_place: Whether to perform this appending in-place.
+
+        Returns:
+            A ``PersistentNames`` with the added name. This may be a new
+            object or a reference to the current object.
+        """
+        if self._compact is None:
+            return super().safe_append(value, in_place=in_place)
+
+        appended = self._compact.append(str(value))
+        if not in_place:
+            return type(self)(appended)
+        self._compact = appended
+        self._reverse = None
+        return self
@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Union
+
+import biocutils as ut
+import numpy
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def _pack(valid: numpy.ndarray) -> Optional[numpy.ndarray]:
+    if valid.all():
+        return None
+    return numpy.packbits(valid, bitorder="little")
+
+
+def _unpack(bitmap: Optional[numpy.ndarray], n: int) -> numpy.ndarray:
+    if bitmap is None:
+        return numpy.ones(n, dtype=numpy.bool_)
+    return numpy.unpackbits(bitmap, count=n, bitorder="little").view(numpy.bool_)
+
+
+class NullableArray(NDArrayOperatorsMixin):
+    """A one-dimensional NumPy array with missing values, for use as a column in a
+    :py:class:`~biocframe.BiocFrame.BiocFrame`.
+
+    The values are stored in a regular NumPy array, alongside a validity
+    bitmap with one bit per element (packed into bytes) that is set if the
+    element is present. This uses an eighth of the memory of the boolean mask
+    in a :py:class:`~numpy.ma.MaskedArray`, and the bitmap is omitted entirely
+    if no values are missing. Unlike a list containing Nones, the values
+    retain their NumPy type.
+
+    NumPy ufuncs and the arithmetic and comparison operators are applied to
+    the values and return a ``NullableArray``, where an element is missing if
+    it is missing in any of the inputs. Comparisons are elementwise, like for
+    NumPy arrays; use :py:meth:`~equals` to compare entire arrays. Reductions
+    (e.g., :py:func:`~numpy.sum`) ignore the missing values.
+    """
+
+    def __init__(
+        self,
+        values: Union[numpy.ndarray, Sequence[Any]],
+        mask: Optional[Union[numpy.ndarray, Sequence[bool]]] = None,
+        _bitmap: Optional[numpy.ndarray] = None,
+    ) -> None:
+        """
+        Args:
+            values:
+                One-dimensional array of values. The contents of missing
+                elements are arbitrary. If a masked array is supplied, its mask
+                is used when ``mask = None``.
+
+            mask:
+                Boolean array of the same length as ``values``, where True
+                indicates that the corresponding element is missing.
+                If None, no values are missing.
+        """
+        if mask is None and _bitmap is None and numpy.ma.isMaskedArray(values):
+            mask = numpy.ma.getmaskarray(values)
+            values = numpy.ma.getdata(values)
+        if not isinstance(values, numpy.ndarray):
+            values = numpy.asarray(values)
+        if values.ndim != 1:
+            raise ValueError("'values' should be a one-dimensional array.")
+
+        if mask is not None:
+            mask = numpy.asarray(mask, dtype=numpy.bool_)
+            if mask.shape != values.shape:
+                raise ValueError("'mask' should have the same length as 'values'.")
+            _bitmap = _pack(~mask)
+
+        self._values = values
+        self._validity = _bitmap
+
+    @classmethod
+    def missing(cls, n: int, dtype: Any = numpy.float64) -> NullableArray:
+        """
+        Args:
+            n:
+                Length of the array.
+
+            dtype:
+                Type of the array.
+
+        Returns:
+            A ``NullableArray`` of length ``n`` where all values are missing.
+        """
+        return cls(numpy.zeros(n, dtype=dtype), _bitmap=numpy.zeros((n + 7) // 8, dtype=numpy.uint8))
+
+    @property
+    def values(self) -> numpy.ndarray:
+        """
+        Returns:
+            Array of values, including arbitrary contents for missing elements.
+        """
+        return self._values
+
+    @property
+    def validity(self) -> Optional[numpy.ndarray]:
+        """
+        Returns:
+            Packed validity bitmap in little-endian bit order, or None if no values are missing.
+        """
+        return self._validity
+
+    @property
+    def mask(self) -> numpy.ndarray:
+        """
+        Returns:
+            Boolean array where True indicates that the corresponding element is missing.
+        """
+        return ~_unpack(self._validity, len(self._values))
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        """
+        Returns:
+            Type of the values.
+        """
+        return self._values.dtype
+
+    @property
+    def shape(self) -> Tuple[int]:
+        """
+        Returns:
+            Tuple containing the length of the array.
+        """
+        return self._values.shape
+
+    def __len__(self) -> int:
+        """
+        Returns:
+            Length of the array.
+        """
+        return len(self._values)
+
+    def __sizeof__(self) -> int:
+        size = object.__sizeof__(self) + self._values.nbytes
+        if self._validity is not None:
+            size += self._validity.nbytes
+        return size
+
+    def has_missing(self) -> bool:
+        """
+        Returns:
+            Whether any values are missing.
+        """
+        return self._validity is not None
+
+    def __repr__(self) -> str:
+        return "NullableArray(" + repr(self.tolist()) + ", dtype=" + str(self.dtype) + ")"
+
+    def tolist(self) -> list:
+        """
+        Returns:
+            List of values, where missing elements are represented by None.
+        """
+        output = self._values.tolist()
+        if self._validity is not None:
+            for i in numpy.flatnonzero(self.mask).tolist():
+                output[i] = None
+        return output
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.tolist())
+
+    def to_masked(self) -> numpy.ma.MaskedArray:
+        """
+        Returns:
+            A masked array with the same values and missingness.
+        """
+        return numpy.ma.array(self._values, mask=self.mask if self._validity is not None else False)
+
+    def __array__(self, dtype: Optional[numpy.dtype] = None, copy: Optional[bool] = None) -> numpy.ndarray:
+        output = self._values
+        if self._validity is not None:
+            if output.dtype.kind in "fc":
+                output = output.copy()
+                output[self.mask] = numpy.nan
+            else:
+                output = numpy.array(self.tolist(), dtype=object)
+        if dtype is not None:
+            output = output.astype(dtype, copy=False)
+        return output
+
+    def __array_ufunc__(self, ufunc: numpy.ufunc, method: str, *inputs: Any, **kwargs: Any) -> Any:
+        out = kwargs.pop("out", None)
+        if out is not None and any(y is not None for y in out):
+            return NotImplemented
+
+        if method == "__call__":
+            values = []
+            mask = None
+            for y in inputs:
+                parts = _as_values_and_mask(y)
+                if parts is None:
+                    values.append(y)
+                    continue
+                values.append(parts[0])
+                if parts[1] is not None:
+                    mask = parts[1] if mask is None else mask | parts[1]
+
+            # Missing elements may contain arbitrary values, e.g., zeros in a
+            # division, so floating-point warnings are only meaningful without them.
+            with numpy.errstate(all="ignore") if mask is not None else nullcontext():
+                result = ufunc(*values, **kwargs)
+            if isinstance(result, tuple):
+                return tuple(_wrap_result(y, mask) for y in result)
+            return _wrap_result(result, mask)
+
+        if method == "reduce" and len(inputs) == 1 and inputs[0] is self and kwargs.get("axis", 0) in (0, -1, None):
+            values = self._values if self._validity is None else self._values[_unpack(self._validity, len(self))]
+            return ufunc.reduce(values, **kwargs)
+
+        return NotImplemented
+
+    def __bool__(self) -> bool:
+        if len(self._values) != 1:
+            raise ValueError("The truth value of a 'NullableArray' with more than one element is ambiguous.")
+        if self._validity is not None:
+            raise ValueError("The truth value of a missing value is ambiguous.")
+        return bool(self._values[0])
+
+    def equals(self, other: Any) -> bool:
+        """
+        Args:
+            other:
+                Another ``NullableArray``, a (masked) NumPy array, or a
+                sequence where missing values are represented by None.
+
+        Returns:
+            Whether ``other`` has the same length, missing elements and values.
+        """
+        if not isinstance(other, NullableArray):
+            if not isinstance(other, numpy.ndarray):
+                return self.tolist() == list(other)
+            other = NullableArray(other)
+        if len(self) != len(other):
+            return False
+        mask = self.mask
+        if not numpy.array_equal(mask, other.mask):
+            return False
+        return bool(numpy.array_equal(self._values[~mask], other._values[~mask]))
+
+    def get_value(self, index: int) -> Any:
+        """
+        Args:
+            index:
+                Position of interest.
+
+        Returns:
+            Value at the specified position, or None if it is missing.
+        """
+        n = len(self._values)
+        if index < 0:
+            index += n
+        if index < 0 or index >= n:
+            raise IndexError(f"Index {index} is out of range for a 'NullableArray' of length {n}.")
+        if self._validity is not None and not (self._validity[index >> 3] >> (index & 7)) & 1:
+            return None
+        return self._values[index]
+
+    def get_slice(self, indices: Union[Sequence[int], slice, range, numpy.ndarray]) -> NullableArray:
+        """
+        Args:
+            indices:
+                Positions of interest, or a boolean vector. Missing values in a
+                boolean ``NullableArray`` are treated as False.
+
+        Returns:
+            A ``NullableArray`` containing the values at the specified positions.
+        """
+        if isinstance(indices, range):
+            indices = numpy.arange(indices.start, indices.stop, indices.step)
+        elif isinstance(indices, NullableArray) and indices.dtype == numpy.bool_:
+            # Rows where the condition is missing are not selected, as in a query.
+            indices = indices.fill(False)
+        values = self._values[indices]
+        if self._validity is None:
+            return type(self)(values)
+        return type(self)(values, _bitmap=_pack(_unpack(self._validity, len(self._values))[indices]))
+
+    def __getitem__(self, index: Any) -> Any:
+        """
+        If ``index`` is an integer, this is an alias for :py:meth:`~get_value`.
+        Otherwise, it is an alias for :py:meth:`~get_slice`.
+        """
+        if isinstance(index, (int, numpy.integer)):
+            return self.get_value(int(index))
+        return self.get_slice(index)
+
+    def fill(self, value: Any) -> numpy.ndarray:
+        """
+        Args:
+            value:
+                Value to use for missing elements.
+
+        Returns:
+            A NumPy array where missing elements are replaced by ``value``.
+        """
+        if self._validity is None:
+            return self._values.copy()
+        output = self._values.copy()
+        output[self.mask] = value
+        return output
+
+
+def _wrap_result(x: Any, mask: Optional[numpy.ndarray]) -> Any:
+    if not isinstance(x, numpy.ndarray) or x.ndim != 1 or (mask is not None and x.shape != mask.shape):
+        return x
+    return NullableArray(x, mask)
+
+
+def _as_values_and_mask(x: Any) -> Optional[Tuple[numpy.ndarray, Optional[numpy.ndarray]]]:
+    if isinstance(x, NullableArray):
+        return x.values, (x.mask if x.has_missing() else None)
+    if isinstance(x, numpy.ndarray) and x.ndim == 1:
+        if numpy.ma.isMaskedArray(x):
+            mask = numpy.ma.getmask(x)
+            return numpy.ma.getdata(x), (None if mask is numpy.ma.nomask else numpy.asarray(mask))
+        return x, None
+    return None
+
+
+def combine_nullable(*x: Any) -> Union[NullableArray, list]:
+    """Combine any number of :py:class:`~NullableArray` objects, NumPy arrays and masked arrays.
+
+    Args:
+        x:
+            Objects to combine.
+
+    Returns:
+        A ``NullableArray`` containing the concatenated values. If any of
+        ``x`` is not array-like, a list is returned instead.
+    """
+    parts = [_as_values_and_mask(y) for y in x]
+    if any(p is None for p in parts):
+        output = []
+        for y in x:
+            output += y.tolist() if hasattr(y, "tolist") else list(y)
+        return output
+
+    values = numpy.concatenate([p[0] for p in parts])
+    if all(p[1] is None for p in parts):
+        return NullableArray(values)
+    mask = numpy.concatenate([numpy.zeros(len(p[0]), dtype=numpy.bool_) if p[1] is None else p[1] for p in parts])
+    return NullableArray(values, mask)
+
+
+@ut.get_height.register(NullableArray)
+def _get_height_NullableArray(x: NullableArray) -> int:
+    return len(x)
+
+
+@ut.subset_sequence.register(NullableArray)
+def _subset_sequence_NullableArray(x: NullableArray, indices: Sequence[int]) -> NullableArray:
+    return x.get_slice(indices)
+
+
+@ut.combine_sequences.register(NullableArray)
+def _combine_sequences_NullableArray(*x: Any) -> Union[NullableArray, list]:
+    return combine_nullable(*x)
+
+
+@ut.assign_sequence.register(NullableArray)
+def _assign_sequence_NullableArray(x: NullableArray, indices: Sequence[int], replacement: Any) -> NullableArray:
+    values = x.values.copy()
+    valid = _unpack(x.validity, len(values)).copy()
+    indices = (
+        numpy.arange(len(values))[indices] if isinstance(indices, slice) else numpy.asarray(indices, dtype=numpy.intp)
+    )
+    parts = _as_values_and_mask(replacement)
+    if parts is None:
+        replacement = list(replacement)
+        missing = numpy.array([y is None for y in replacement], dtype=numpy.bool_)
+        values[indices[~missing]] = [y for y in replacement if y is not None]
+        valid[indices] = ~missing
+    else:
+        values[indices] = parts[0]
+        valid[indices] = True if parts[1] is None else ~parts[1]
+    return NullableArray(values, _bitmap=_pack(valid))
+
+
+@ut.show_as_cell.register(NullableArray)
+def _show_as_cell_NullableArray(x: NullableArray, indices: Sequence[int]) -> List[str]:
+    return [str(x.get_value(i)) for i in indices]
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from biocframe import BatchUpdate, BiocFrame
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def _make_frame():
+    return BiocFrame(
+        {"a": [1, 2, 3], "b": np.arange(3), "c": ["x", "y", "z"]},
+        row_names=["r1", "r2", "r3"],
+        column_data=BiocFrame({"info": ["A", "B", "C"]}),
+    )
+
+
+def test_batch_update_in_place():
+    frame = _make_frame()
+    with frame.batch_update() as b:
+        assert isinstance(b, BatchUpdate)
+        b.set_column("d", np.zeros(3))
+        b.rename_column("a", "A")
+        b.remove_column("b")
+        b.set_slice(["r2", "r3"], ["d"], BiocFrame({"d": [1.0, 2.0]}))
+        b.set_slice([0], "d", BiocFrame({"d": [5.0]}))
+        b.set_column("c", ["p", "q", "r"])
+        assert len(b) == 6
+
+    assert b.result is frame
+    assert frame.get_column_names().as_list() == ["A", "c", "d"]
+    assert frame.get_column("A") == [1, 2, 3]
+    assert frame.get_column("c") == ["p", "q", "r"]
+    assert list(frame.get_column("d")) == [5.0, 1.0, 2.0]
+    assert frame.get_column_data().get_column("info") == ["A", "C", None]
+
+
+def test_batch_update_copy():
+    frame = _make_frame()
+    original = frame.get_column("b")
+    with frame.batch_update(in_place=False) as b:
+        b.set_slice([0], ["b"], BiocFrame({"b": [10]}))
+        b.set_columns({"e": [1, 1, 1], "f": [2, 2, 2]})
+
+    out = b.result
+    assert out is not frame
+    assert out.shape == (3, 5)
+    assert frame.shape == (3, 3)
+    assert list(out.get_column("b")) == [10, 1, 2]
+    assert list(original) == [0, 1, 2]
+    assert out.get_column_data().shape == (5, 1)
+
+
+def test_batch_update_errors():
+    frame = _make_frame()
+
+    with pytest.raises(ValueError, match="does not exist"):
+        with frame.batch_update() as b:
+            b.set_column("d", [1, 2, 3])
+            b.remove_column("zzz")
+    assert frame.shape == (3, 3)
+
+    with pytest.raises(ValueError, match="already exists"):
+        with frame.batch_update() as b:
+            b.rename_column("a", "b")
+
+    with pytest.raises(ValueError, match="same length"):
+        with frame.batch_update() as b:
+            b.set_column("d", [1, 2])
+    assert not frame.has_column("d")
+
+    with pytest.raises(RuntimeError):
+        with frame.batch_update() as b:
+            b.set_column("d", [1, 2, 3])
+            raise RuntimeError("stop")
+    assert not frame.has_column("d")
+    assert b.result is None
+
+    with pytest.raises(TypeError):
+        frame.batch_update().set_column(0, [1, 2, 3])
+
+
+def test_batch_update_empty_frame():
+    frame = BiocFrame()
+    with frame.batch_update() as b:
+        b.set_column("a", [1, 2])
+        b.set_column("b", [3, 4])
+    assert frame.shape == (2, 2)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from biocframe import BiocFrame, BiocFrameBuilder
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def test_builder_rows():
+    builder = BiocFrameBuilder({"pos": np.int32, "score": "float64", "id": str}, initial_capacity=2)
+    builder.append_row({"pos": 1, "score": 0.5, "id": "a"})
+    builder.append_row((2, 1.5, "b"))
+    builder.append_rows([(3, 2.5, "c"), {"id": "d", "pos": 4, "score": 3.5}])
+    assert len(builder) == 4
+
+    frame = builder.finish()
+    assert frame.shape == (4, 3)
+    assert frame.column_names.as_list() == ["pos", "score", "id"]
+    assert frame.get_column("pos").dtype == np.int32
+    assert frame.get_column("pos").tolist() == [1, 2, 3, 4]
+    assert frame.get_column("score").tolist() == [0.5, 1.5, 2.5, 3.5]
+    assert frame.get_column("id") == ["a", "b", "c", "d"]
+    assert frame.row_names is None
+
+    # Builder is reset after finishing.
+    assert len(builder) == 0
+    assert builder.finish().shape == (0, 3)
+
+
+def test_builder_frames_and_names():
+    builder = BiocFrameBuilder({"x": np.int64, "y": None})
+    builder.append_row({"x": 1, "y": "a"})
+    builder.append_frame(BiocFrame({"y": ["b", "c"], "x": np.array([2, 3]), "z": [0, 0]}, row_names=["r2", "r3"]))
+    builder.append_row({"x": 4, "y": "d"}, name="r4")
+
+    frame = builder.finish()
+    assert frame.get_column("x").tolist() == [1, 2, 3, 4]
+    assert frame.row_names.as_list() == ["", "r2", "r3", "r4"]
+
+
+def test_builder_errors():
+    builder = BiocFrameBuilder(["a", "b"])
+    with pytest.raises(ValueError, match="missing column"):
+        builder.append_row({"a": 1})
+    with pytest.raises(ValueError, match="values but the schema"):
+        builder.append_row([1])
+
+    typed = BiocFrameBuilder({"a": np.int64, "b": None})
+    with pytest.raises((TypeError, ValueError)):
+        typed.append_row({"a": "foo", "b": "x"})
+    assert len(typed) == 0
+    typed.append_row({"a": 1, "b": "x"})
+    assert typed.finish().get_column("b") == ["x"]
+
+
+def test_builder_errors_leave_buffers_unchanged():
+    builder = BiocFrameBuilder({"x": np.int64, "y": None})
+    builder.append_row({"x": 1, "y": "a"})
+
+    with pytest.raises(ValueError, match="Number of row names"):
+        builder.append_rows([(2, "b"), (3, "c")], names=["r2"])
+    with pytest.raises((TypeError, ValueError)):
+        builder.append_rows([(2, "b"), ("foo", "c")], names=["r2", "r3"])
+    assert len(builder) == 1
+
+    # Builder is still usable afterwards.
+    builder.append_rows([(2, "b"), (3, "c")], names=["r2", "r3"])
+    frame = builder.finish()
+    assert frame.shape == (3, 2)
+    assert frame.get_column("x").tolist() == [1, 2, 3]
+    assert frame.get_column("y") == ["a", "b", "c"]
+    assert frame.row_names.as_list() == ["", "r2", "r3"]
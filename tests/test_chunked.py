@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+import biocutils as ut
+
+from biocframe import BiocFrame, ChunkedArray
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def test_chunked_array_basic():
+    x = ChunkedArray([np.array([1, 2, 3]), np.array([], dtype=int), np.array([4, 5])])
+    assert len(x) == 5
+    assert ut.get_height(x) == 5
+    assert x.offsets.tolist() == [0, 3, 3, 5]
+    assert x[0] == 1
+    assert x[3] == 4
+    assert x[-1] == 5
+    assert x.tolist() == [1, 2, 3, 4, 5]
+    assert x == np.array([1, 2, 3, 4, 5])
+
+    with pytest.raises(IndexError):
+        x.get_value(5)
+
+    view = x[2:4]
+    assert isinstance(view, ChunkedArray)
+    assert len(view.chunks) == 2
+    assert view.tolist() == [3, 4]
+
+    picked = ut.subset_sequence(x, [4, 0, 3])
+    assert picked.tolist() == [5, 1, 4]
+
+    assigned = ut.assign_sequence(x, [1], [20])
+    assert assigned.tolist() == [1, 20, 3, 4, 5]
+    assert x.tolist() == [1, 2, 3, 4, 5]
+
+
+def test_chunked_array_combine_rows():
+    acc = BiocFrame({"x": ChunkedArray([np.array([0, 1])]), "y": ["a", "b"]})
+    for i in range(3):
+        batch = BiocFrame({"x": np.array([i, i]), "y": ["c", "d"]})
+        acc = acc.combine_rows(batch)
+
+    assert acc.shape == (8, 2)
+    assert isinstance(acc.get_column("x"), ChunkedArray)
+    assert len(acc.get_column("x").chunks) == 4
+
+    sliced = acc[1:5, :]
+    assert sliced.get_column("x").tolist() == [1, 0, 0, 1]
+
+    flat = acc.consolidate()
+    assert isinstance(flat.get_column("x"), np.ndarray)
+    assert flat.get_column("x").tolist() == [0, 1, 0, 0, 1, 1, 2, 2]
+    assert isinstance(acc.get_column("x"), ChunkedArray)
+    assert flat == BiocFrame({"x": np.array([0, 1, 0, 0, 1, 1, 2, 2]), "y": ["a", "b"] + ["c", "d"] * 3})
+
+
+def test_chunked_array_boolean_subset():
+    x = ChunkedArray([np.array([1, 2, 3]), np.array([4, 5, 6])])
+    mask = np.array([True, False, True, False, False, True])
+    assert ut.subset_sequence(x, mask).tolist() == [1, 3, 6]
+    assert x[[False] * 6].tolist() == []
+
+    with pytest.raises(ValueError, match="should be equal to the length"):
+        x[np.array([True, False])]
+
+
+def test_chunked_array_append_shared():
+    base = ChunkedArray([np.array([0, 1])])
+    first = base.append(np.array([2]))
+    second = first.append(np.array([3, 4]), ChunkedArray([np.array([5])]))
+    assert first._store is second._store
+
+    # Appending to an older object copies its own chunks instead of
+    # overwriting those seen by the newer objects.
+    branch = first.append(np.array([9]))
+    assert branch._store is not second._store
+
+    assert base.tolist() == [0, 1]
+    assert first.tolist() == [0, 1, 2]
+    assert second.tolist() == [0, 1, 2, 3, 4, 5]
+    assert second.offsets.tolist() == [0, 2, 3, 5, 6]
+    assert branch.tolist() == [0, 1, 2, 9]
+    assert branch.offsets.tolist() == [0, 2, 3, 4]
+    assert len(first.chunks) == 2
+    assert second.get_value(4) == 4
+    assert second[1:5].tolist() == [1, 2, 3, 4]
+
+    acc = ChunkedArray([])
+    for i in range(100):
+        acc = acc.append(np.array([i]))
+    assert len(acc) == 100
+    assert acc.tolist() == list(range(100))
+    assert acc.offsets.tolist() == list(range(101))
@@ -0,0 +1,107 @@
+import random
+from copy import copy
+
+import numpy as np
+import pytest
+
+from biocframe import BiocFrame, ColumnMap, PersistentNames
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def test_column_map_basic():
+    x = ColumnMap({"a": 1, "b": 2})
+    assert len(x) == 2
+    assert x["a"] == 1
+    assert "b" in x
+    assert "c" not in x
+    assert x.get("c") is None
+    assert x == {"a": 1, "b": 2}
+
+    with pytest.raises(KeyError):
+        x["c"]
+
+    x["c"] = 3
+    del x["a"]
+    assert dict(x.items()) == {"b": 2, "c": 3}
+    assert sorted(x.values()) == [2, 3]
+
+    with pytest.raises(KeyError):
+        del x["a"]
+
+
+def test_column_map_persistence():
+    random.seed(42)
+    ref = {}
+    x = ColumnMap()
+    snapshots = []
+    for i in range(5000):
+        key = "k" + str(random.randrange(1000))
+        if key in ref and random.random() < 0.3:
+            del ref[key]
+            del x[key]
+        else:
+            ref[key] = i
+            x[key] = i
+
+        if i % 500 == 0:
+            snapshots.append((dict(ref), copy(x)))
+
+    assert len(x) == len(ref)
+    assert dict(x.items()) == ref
+    for expected, snap in snapshots:
+        assert dict(snap.items()) == expected
+
+
+def test_column_map_in_frame():
+    obj = BiocFrame({"c" + str(i): np.zeros(3) for i in range(2000)})
+
+    current = obj
+    history = []
+    for i in range(50):
+        current = current.set_column("n" + str(i), np.full(3, i))
+        history.append(current)
+
+    assert isinstance(current.get_data(), dict)
+    assert isinstance(current._data, ColumnMap)
+    assert isinstance(current.get_column_names(), PersistentNames)
+
+    assert obj.shape == (3, 2000)
+    for i, frame in enumerate(history):
+        assert frame.shape == (3, 2001 + i)
+        assert frame.get_column_names()[-1] == "n" + str(i)
+        assert frame.get_column("n" + str(i))[0] == i
+
+    assert list(current.get_data())[:2] == ["c0", "c1"]
+    removed = current.remove_columns(["c0", "n5"])
+    assert removed.shape == (3, 2048)
+    assert current.shape == (3, 2050)
+
+    current.set_slice([0], ["n3"], BiocFrame({"n3": [42]}), in_place=True)
+    assert current.get_column("n3")[0] == 42
+    assert history[3].get_column("n3")[0] == 3
+
+
+def test_column_map_slice_after_combine():
+    import biocutils as ut
+
+    obj = BiocFrame({"c" + str(i): [1, 2, 3] for i in range(2000)})
+    for i in range(40):
+        obj = obj.set_column("n" + str(i), [4, 5, 6], in_place=False)
+    assert isinstance(obj.get_column_names(), PersistentNames)
+
+    combined = ut.combine_columns(obj, BiocFrame({"qq": [1, 2, 3]}))
+    assert combined.shape == (3, 2041)
+    assert obj.get_column_names()._compact is not None
+
+    sliced = obj[:, 0:3]
+    assert sliced.get_column_names().as_list() == ["c0", "c1", "c2"]
+
+    # Materialized names are sliced as regular names.
+    names = obj.get_column_names().copy()
+    names.set_value(0, "first", in_place=True)
+    assert names._compact is None
+    assert names[0:2].as_list() == ["first", "c1"]
+    assert obj.get_column_names()[0] == "c0"
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from biocframe import BiocFrame, relaxed_combine_rows
+from biocframe import BiocFrame, NullableArray, concat, concat_dtypes, relaxed_combine_rows
 from biocutils import combine, combine_columns, Names
 
 __author__ = "jkanche"
@@ -158,7 +158,7 @@ def test_relaxed_combine_rows():
         == np.ma.array([False, False, False, True, True, True, False, False, False])
     ).all()
     assert (
-        merged.column("column2").data == np.ma.array([4, 5, 6, 0, 0, 0, -4, -5, -6])
+        merged.column("column2").values == np.array([4, 5, 6, 0, 0, 0, -4, -5, -6])
     ).all()
     assert merged.column("column3") == [
         None,
@@ -181,7 +181,7 @@ def test_relaxed_combine_rows():
         == np.ma.array([False, False, False, True, True, True, False, False, False])
     ).all()
     assert (
-        merged2.column("column2").data == np.ma.array([4, 5, 6, 0, 0, 0, -4, -5, -6])
+        merged2.column("column2").values == np.array([4, 5, 6, 0, 0, 0, -4, -5, -6])
     ).all()
     assert merged2.column("column3") == [
         None,
@@ -259,3 +259,72 @@ def test_combine_columns_with_column_data():
     with pytest.raises(ValueError) as ex:
         combine_columns(obj1, obj2)
     assert str(ex.value).find("Failed to combine 'column_data'") >= 0
+
+
+def test_concat_strict():
+    x = BiocFrame({"odd": [1, 3], "even": np.array([0, 2])})
+    merged = concat([x, x])
+    expected = combine(x, x)
+    assert merged.column_names == expected.column_names
+    assert merged.get_column("odd") == expected.get_column("odd")
+    assert merged.get_column("even").tolist() == [0, 2, 0, 2]
+    assert merged.get_row_names() is None
+
+    x = BiocFrame({"a": np.array([1, 2], dtype=np.int32), "b": ["x", "y"]}, row_names=["r1", "r2"])
+    y = BiocFrame({"b": ["z"], "a": np.array([3.5])})
+    merged = concat(iter([x, y, x]))
+    assert merged.shape == (5, 2)
+    assert merged.get_column("a").dtype == np.float64
+    assert merged.get_column("a").tolist() == [1, 2, 3.5, 1, 2]
+    assert merged.get_column("b") == ["x", "y", "z", "x", "y"]
+    assert merged.get_row_names().as_list() == ["r1", "r2", "", "r1", "r2"]
+
+    with pytest.raises(ValueError, match="same columns"):
+        concat([obj1, BiocFrame({"odd": [1]})])
+    with pytest.raises(ValueError, match="at least one"):
+        concat([])
+
+
+def test_concat_relaxed():
+    x = BiocFrame({"a": np.array([1, 2]), "b": ["x", "y"]})
+    y = BiocFrame({"c": np.array([True]), "a": np.array([3])})
+    z = BiocFrame({"b": ["w"]})
+
+    expected = relaxed_combine_rows(x, y, z)
+    for frames in ([x, y, z], (f for f in [x, y, z])):
+        merged = concat(frames, how="relaxed")
+        assert merged.column_names == expected.column_names
+        assert merged.shape == (4, 3)
+
+        a = merged.get_column("a")
+        assert a.tolist() == [1, 2, 3, None]
+        assert isinstance(a, NullableArray)
+        assert a.mask.tolist() == [False, False, False, True]
+        assert merged.get_column("b") == ["x", "y", None, "w"]
+        assert merged.get_column("c").mask.tolist() == [True, True, False, True]
+
+
+def test_concat_promote():
+    x = BiocFrame({"a": np.array([1, 2], dtype=np.int32), "b": ["x", "y"]})
+    y = BiocFrame({"a": [3, None], "b": ["z", None]})
+    z = BiocFrame({"a": np.array([4], dtype=np.int64), "b": ["w"]})
+
+    dtypes = concat_dtypes([x, y, z], promote=True)
+    assert dtypes == {"a": np.int64, "b": None}
+    assert concat_dtypes([x, y, z]) == {"a": None, "b": None}
+
+    for frames in ([x, y, z], iter([x, y, z])):
+        merged = concat(frames, promote=True)
+        a = merged.get_column("a")
+        assert isinstance(a, NullableArray)
+        assert a.dtype == np.int64
+        assert a.tolist() == [1, 2, 3, None, 4]
+        assert merged.get_column("b") == ["x", "y", "z", None, "w"]
+
+    merged = concat([x, y, z])
+    assert merged.get_column("a").dtype == object
+
+    y = BiocFrame({"a": [None, None], "b": ["z", None]})
+    merged = concat([x, y], promote=True)
+    assert merged.get_column("a").dtype == np.int32
+    assert merged.get_column("a").tolist() == [1, 2, None, None]
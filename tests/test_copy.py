@@ -1,7 +1,11 @@
+import importlib
+import weakref
+
 import numpy as np
 import pytest
 
 from biocframe import BiocFrame
+from biocframe.BiocFrame import _EXACT_REFCOUNTS
 from copy import deepcopy
 
 __author__ = "jkanche"
@@ -24,10 +28,11 @@ def test_basic_copy():
 
     copied["new_col"] = [1, 3, 5, 7, 9]
 
-    assert (
-        copied.shape == obj1.shape
-    )  # well we are copying so it doesn't reflect the change
-    assert obj1.data == copied.data
+    # Copy-on-write: modifying the copy does not affect the original.
+    assert copied.shape == (5, 3)
+    assert obj1.shape == (5, 2)
+    assert "new_col" not in obj1.data
+    assert obj1.get_column_names().as_list() == ["odd", "even"]
 
 
 def test_basic_deepcopy():
@@ -46,3 +51,67 @@ def test_basic_deepcopy():
 
     assert copied.shape != obj1.shape
     assert obj1.data != copied.data
+
+
+def test_copy_on_write():
+    obj1 = BiocFrame({"a": np.zeros(5), "b": [1, 2, 3, 4, 5]})
+    copied = obj1.copy()
+    assert copied.get_data() is obj1.get_data()
+
+    copied.set_slice([0, 1], ["a"], BiocFrame({"a": [1.0, 2.0]}), in_place=True)
+    assert copied.get_data() is not obj1.get_data()
+    assert list(copied.get_column("a")[:3]) == [1.0, 2.0, 0.0]
+    assert list(obj1.get_column("a")) == [0.0] * 5
+
+    obj1.remove_column("b", in_place=True)
+    assert copied.get_column_names().as_list() == ["a", "b"]
+    assert obj1.get_column_names().as_list() == ["a"]
+
+
+def test_copy_on_write_buffers():
+    x = np.zeros(5)
+    obj = BiocFrame({"a": x, "b": np.zeros(5)})
+    obj.set_slice([0], ["a"], BiocFrame({"a": [1.0]}), in_place=True)
+    assert list(x) == [0.0] * 5
+
+    # Buffers supplied by the user are copied once, after which the frame's
+    # own buffer is modified in place if nothing else references it.
+    obj.set_slice([0], ["b"], BiocFrame({"b": [1.0]}), in_place=True)
+    before = id(obj.get_data()["b"])
+    obj.set_slice([0], ["b"], BiocFrame({"b": [1.0]}), in_place=True)
+    if _EXACT_REFCOUNTS:
+        assert id(obj.get_data()["b"]) == before
+
+    col = obj.get_column("b")
+    obj.set_slice([1], ["b"], BiocFrame({"b": [2.0]}), in_place=True)
+    assert list(col[:2]) == [1.0, 0.0]
+    assert list(obj.get_column("b")[:2]) == [1.0, 2.0]
+
+    view = obj[0:2, :]
+    obj.set_slice([0], ["a"], BiocFrame({"a": [5.0]}), in_place=True)
+    assert view.get_column("a")[0] == 1.0
+
+    obj.create_index("b")
+    obj.set_slice([0], ["b"], BiocFrame({"b": [3.0]}), in_place=True)
+    assert obj.get_index("b") is None
+
+
+def test_copy_on_write_supplied_buffers(monkeypatch):
+    x = np.zeros(5)
+    ref = weakref.ref(x)
+    obj = BiocFrame({"x": x})
+    del x
+
+    # Even without any other references, the supplied buffer is not modified.
+    obj.set_slice([0, 1], ["x"], BiocFrame({"x": [1.0, 2.0]}), in_place=True)
+    assert ref() is None or list(ref()) == [0.0] * 5
+    assert list(obj.get_column("x")) == [1.0, 2.0, 0.0, 0.0, 0.0]
+
+    # Ownership does not depend on the reference counts being accurate.
+    monkeypatch.setattr(importlib.import_module("biocframe.BiocFrame"), "_EXCLUSIVE_REFCOUNT", 1000000)
+    y = np.zeros(3)
+    obj = BiocFrame({"y": y})
+    for i in range(3):
+        obj.set_slice([i], ["y"], BiocFrame({"y": [float(i + 1)]}), in_place=True)
+    assert list(y) == [0.0] * 3
+    assert list(obj.get_column("y")) == [1.0, 2.0, 3.0]
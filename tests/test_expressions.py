@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+from biocframe import BiocFrame, Expression, NullableArray
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def _frame():
+    return BiocFrame(
+        {
+            "counts": np.array([0, 1, 3, 7, 15]),
+            "size_factor": np.array([1.0, 0.5, 2.0, 1.0, 4.0]),
+            "qval": np.array([0.01, 0.2, 0.03, 0.001, 0.5]),
+            "lfc": np.array([2.0, -3.0, 0.5, -1.5, 4.0]),
+            "gene": ["A", "B", "C", "D", "E"],
+            "log fold change": np.array([1.0, 2.0, 3.0, 4.0, 5.0]),
+        },
+        row_names=["r0", "r1", "r2", "r3", "r4"],
+    )
+
+
+def test_eval_arithmetic():
+    obj = _frame()
+    out = obj.eval("log1p(counts) / size_factor")
+    assert np.allclose(out, np.log1p(obj.get_column("counts")) / obj.get_column("size_factor"))
+
+    out = obj.eval("-counts ** 2 + 1")
+    assert list(out) == [1, 0, -8, -48, -224]
+
+    out = obj.eval("`log fold change` * 2")
+    assert list(out) == [2, 4, 6, 8, 10]
+
+    out = obj.eval("where(lfc > 0, lfc, nan)")
+    assert np.isnan(out[1]) and out[0] == 2
+
+    out = obj.eval("1 + 2")
+    assert list(out) == [3] * 5
+
+    out = obj.eval("counts")
+    out[0] = 100
+    assert obj.get_column("counts")[0] == 0
+
+
+def test_eval_chunks():
+    obj = BiocFrame({"x": np.arange(1000, dtype=float), "y": np.ones(1000)})
+    expected = np.sqrt(obj.get_column("x")) + obj.get_column("y")
+    for chunk_size in [1, 7, 1000, 5000]:
+        assert np.allclose(obj.eval("sqrt(x) + y", chunk_size=chunk_size), expected)
+
+    empty = BiocFrame({"x": np.zeros(0)})
+    assert len(empty.eval("x + 1")) == 0
+
+    with pytest.raises(ValueError, match="positive"):
+        obj.eval("x", chunk_size=0)
+
+
+def test_expression_reuse():
+    expr = Expression("abs(lfc) > 1 and abs(lfc) < 3")
+    assert expr.names == ["lfc"]
+    calls = [arg for kind, arg, _ in expr._program if kind == "call"]
+    assert calls.count(np.absolute) == 1
+
+    out = _frame().eval(expr)
+    assert list(out) == [True, False, False, True, False]
+
+
+def test_query():
+    obj = _frame()
+    out = obj.query("qval < 0.05 and abs(lfc) > 1")
+    assert out.get_column("gene") == ["A", "D"]
+    assert list(out.get_row_names()) == ["r0", "r3"]
+
+    out = obj.query("gene in ('B', 'E') or 0 < counts < 3", columns=["gene"])
+    assert out.get_column_names().as_list() == ["gene"]
+    assert out.get_column("gene") == ["B", "E"]
+
+    out = obj.query("~(counts >= 3) & (gene != 'A')")
+    assert out.get_column("gene") == ["B"]
+
+    nullable = BiocFrame({"x": NullableArray(np.array([1, 2, 3]), mask=np.array([False, True, False]))})
+    assert nullable.query("x > 0").shape[0] == 2
+
+    with pytest.raises(TypeError, match="boolean"):
+        obj.query("counts + 1")
+
+
+def test_expression_errors():
+    obj = _frame()
+    with pytest.raises(ValueError, match="parse"):
+        obj.eval("counts +")
+    with pytest.raises(ValueError, match="does not exist"):
+        obj.eval("missing + 1")
+    with pytest.raises(ValueError, match="Unsupported function"):
+        obj.eval("__import__('os')")
+    with pytest.raises(ValueError, match="Unsupported function"):
+        obj.eval("counts.sum()")
+    with pytest.raises(ValueError, match="Unsupported syntax"):
+        obj.eval("[x for x in counts]")
+    with pytest.raises(ValueError, match="literals"):
+        obj.eval("gene in counts")
+
+
+def test_eval_nullable_column():
+    obj = BiocFrame(
+        {
+            "x": NullableArray(np.array([1.0, 2.0, 3.0, 4.0]), mask=np.array([False, True, False, False])),
+            "flag": NullableArray(np.array([True, True, False, True]), mask=np.array([False, True, False, False])),
+        }
+    )
+
+    for chunk_size in [None, 2]:
+        out = obj.eval("x", chunk_size=chunk_size)
+        assert np.ma.isMaskedArray(out)
+        assert list(np.ma.getmaskarray(out)) == [False, True, False, False]
+
+        out = obj.query("flag", chunk_size=chunk_size)
+        assert list(out.get_column("x").values) == [1.0, 4.0]
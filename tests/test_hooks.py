@@ -0,0 +1,69 @@
+import numpy as np
+from biocframe import BiocFrame, add_hook, remove_hook
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def test_hooks():
+    obj = BiocFrame({"a": np.array([1, 2, 1, 2]), "b": ["w", "x", "y", "z"]})
+    events = []
+
+    def hook(name, output, elapsed):
+        events.append((name, output, elapsed))
+
+    add_hook(hook)
+    try:
+        sliced = obj[1:3, :]
+        groups = obj.split("b")
+        combined = obj.combine_rows(obj)
+        merged = obj.merge(obj, by="b", rename_duplicate_columns=True)
+    finally:
+        remove_hook(hook)
+
+    # Slices made within split() are not reported separately.
+    assert [e[0] for e in events] == ["get_slice", "split", "combine_rows", "merge"]
+    assert events[0][1] is sliced
+    assert events[1][1] is groups
+    assert events[2][1] is combined
+    assert events[3][1] is merged
+    assert all(e[2] >= 0 for e in events)
+
+    obj[0:1, :]
+    assert len(events) == 4
+
+
+def test_hooks_threads():
+    import threading
+
+    obj = BiocFrame({"a": np.arange(10)})
+    events = []
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hook(name, output, elapsed):
+        events.append((name, threading.current_thread().name))
+
+    def blocking(x):
+        entered.set()
+        release.wait(5)
+        return x
+
+    add_hook(hook)
+    try:
+        # One thread is inside split(), while another slices the object.
+        worker = threading.Thread(target=lambda: obj.split("a"), name="worker")
+        original = obj.get_column
+        obj.get_column = lambda name: blocking(original(name))
+        worker.start()
+        entered.wait(5)
+        obj.get_column = original
+        obj[0:2, :]
+        release.set()
+        worker.join()
+    finally:
+        remove_hook(hook)
+
+    # Hooks only see the operations of the thread that registered them.
+    assert events == [("get_slice", "MainThread")]
@@ -0,0 +1,243 @@
+import numpy as np
+import pytest
+
+from biocframe import BiocFrame, IntervalIndex, merge
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def _make_frame():
+    return BiocFrame(
+        {
+            "gene_id": ["g1", "g2", "g3", "g2"],
+            "score": np.array([1.0, 2.0, 3.0, 4.0]),
+        }
+    )
+
+
+def test_hash_index_lookups():
+    bframe = _make_frame()
+    index = bframe.create_index("gene_id")
+    assert not index.unique
+    assert len(index) == 3
+    assert bframe.get_index("gene_id") is index
+
+    assert bframe.get_row("g3", by="gene_id") == {"gene_id": "g3", "score": 3.0}
+    assert bframe.get_row("g2", by="gene_id")["score"] == 2.0
+    with pytest.raises(ValueError, match="Could not find"):
+        bframe.get_row("g9", by="gene_id")
+
+    sub = bframe.loc_by("gene_id", ["g2", "g1"])
+    assert sub.get_column("gene_id") == ["g2", "g2", "g1"]
+    assert np.array_equal(sub.get_column("score"), [2.0, 4.0, 1.0])
+
+    sub = bframe.loc_by("gene_id", "g3", columns=["score"])
+    assert sub.shape == (1, 1)
+
+    with pytest.raises(ValueError, match="Could not find"):
+        bframe.loc_by("gene_id", ["g9"])
+
+    with pytest.raises(ValueError, match="Duplicate"):
+        bframe.create_index("gene_id", unique=True)
+
+
+def test_hash_index_without_index():
+    bframe = _make_frame()
+    assert bframe.get_index("gene_id") is None
+    assert bframe.get_row("g2", by="gene_id")["score"] == 2.0
+    assert bframe.loc_by("gene_id", ["g1"]).shape == (1, 2)
+
+
+def test_hash_index_sharing():
+    bframe = _make_frame()
+    index = bframe.create_index("gene_id")
+
+    assert bframe.copy().get_index("gene_id") is index
+    assert bframe[["gene_id"]].get_index("gene_id") is index
+    assert bframe[1:3, :].get_index("gene_id") is None
+
+    modified = bframe.set_column("gene_id", ["a", "b", "c", "d"])
+    assert modified.get_index("gene_id") is None
+    assert bframe.get_index("gene_id") is index
+
+    renamed = bframe.set_column("other", [1, 2, 3, 4])
+    assert renamed.get_index("gene_id") is index
+
+    bframe.drop_index("gene_id")
+    assert bframe.get_index("gene_id") is None
+
+
+def test_hash_index_merge():
+    left = BiocFrame({"key": ["a", "b", "c", "d"], "x": [1, 2, 3, 4]})
+    right = BiocFrame({"key": ["d", "b", "e"], "y": np.array([10, 20, 30])})
+    expected = merge([left, right], by="key", join="left")
+
+    right.create_index("key", unique=True)
+    indexed = merge([left, right], by="key", join="left")
+    assert indexed == expected
+    assert indexed.get_column("y").tolist() == [None, 20, None, 10]
+
+
+def test_sorted_index_range_query():
+    bframe = BiocFrame({"pos": np.array([1, 5, 5, 9, 12]), "id": ["a", "b", "c", "d", "e"]})
+    index = bframe.create_sorted_index("pos")
+    assert index.is_sorted
+    assert bframe.get_sorted_index("pos") is index
+
+    sub = bframe.range_query("pos", 5, 9)
+    assert sub.get_column("id") == ["b", "c", "d"]
+    assert bframe.range_query("pos", hi=4).get_column("id") == ["a"]
+    assert bframe.range_query("pos", lo=10).get_column("id") == ["e"]
+    assert bframe.range_query("pos", 6, 8).shape == (0, 2)
+    assert bframe.range_query("pos", 9, 5).shape == (0, 2)
+    assert bframe.range_query("pos", 5, 9, only_indices=True).tolist() == [1, 2, 3]
+
+
+def test_sorted_index_unsorted_column():
+    bframe = BiocFrame({"pos": np.array([12.5, 1.0, 9.0, 5.0]), "id": ["a", "b", "c", "d"]})
+    index = bframe.create_sorted_index("pos")
+    assert not index.is_sorted
+
+    assert bframe.range_query("pos", 4, 10).get_column("id") == ["c", "d"]
+    assert bframe.range_query("pos", 4, 10, only_indices=True).tolist() == [2, 3]
+
+    starts, ends = index.search(np.array([0, 4]), np.array([2, 13]))
+    assert (ends - starts).tolist() == [1, 3]
+
+    with pytest.raises(TypeError, match="numeric"):
+        bframe.create_sorted_index("id")
+
+    bframe.drop_index("pos")
+    assert bframe.get_sorted_index("pos") is None
+    assert bframe.range_query("pos", 4, 10).shape == (2, 2)
+
+
+def _brute_force_overlaps(starts, ends, qstarts, qends):
+    pairs = []
+    for q in range(len(qstarts)):
+        for s in range(len(starts)):
+            if starts[s] <= qends[q] and ends[s] >= qstarts[q]:
+                pairs.append((q, s))
+    return pairs
+
+
+def test_interval_index_overlaps():
+    bframe = BiocFrame(
+        {
+            "start": np.array([10, 1, 20, 5, 30]),
+            "end": np.array([15, 100, 25, 8, 30]),
+        }
+    )
+    index = bframe.create_interval_index("start", "end")
+    assert bframe.get_interval_index() is index
+
+    qstarts = np.array([0, 9, 26, 101, 30])
+    qends = np.array([4, 21, 29, 200, 31])
+    query, subject = index.find_overlaps(qstarts, qends)
+    assert list(zip(query.tolist(), subject.tolist())) == _brute_force_overlaps(
+        bframe.get_column("start"), bframe.get_column("end"), qstarts, qends
+    )
+
+    query, subject = bframe.find_overlaps(12, 12)
+    assert query.tolist() == [0, 0]
+    assert bframe[subject, :].get_column("start").tolist() == [10, 1]
+
+    rng = np.random.default_rng(42)
+    starts = rng.integers(0, 1000, 200)
+    ends = starts + rng.integers(0, 50, 200)
+    qstarts = rng.integers(0, 1000, 50)
+    qends = qstarts + rng.integers(0, 20, 50)
+    query, subject = IntervalIndex("start", "end", starts, ends).find_overlaps(qstarts, qends)
+    assert list(zip(query.tolist(), subject.tolist())) == _brute_force_overlaps(starts, ends, qstarts, qends)
+
+
+def test_interval_index_nested():
+    # Deeply nested and duplicated intervals.
+    starts = np.array([0, 1, 2, 3, 2, 10, 10, 0, 50], dtype=np.uint32)
+    ends = np.array([100, 99, 98, 4, 98, 20, 20, 5, 60], dtype=np.uint32)
+    qstarts = np.array([0, 3, 21, 97, 55, 200])
+    qends = np.array([0, 3, 49, 97, 55, 300])
+    query, subject = IntervalIndex("start", "end", starts, ends).find_overlaps(qstarts, qends)
+    assert list(zip(query.tolist(), subject.tolist())) == _brute_force_overlaps(starts, ends, qstarts, qends)
+
+    # A single interval spanning all others does not make every query scan
+    # all intervals, so this does not run out of memory.
+    n = 200000
+    starts = np.concatenate([[0], np.arange(n) * 10])
+    ends = np.concatenate([[n * 10], np.arange(n) * 10 + 5])
+    qstarts = np.arange(20000) * 100 + 6
+    qends = qstarts + 2
+    query, subject = IntervalIndex("start", "end", starts, ends).find_overlaps(qstarts, qends)
+    assert query.tolist() == list(range(20000))
+    assert subject.tolist() == [0] * 20000
+
+    query, subject = IntervalIndex("start", "end", starts, ends).find_overlaps(qstarts, qends + 10)
+    assert query.tolist() == np.repeat(np.arange(20000), 2).tolist()
+    assert subject.tolist() == np.column_stack([np.zeros(20000, dtype=int), qstarts // 10 + 2]).ravel().tolist()
+
+
+def test_interval_index_duplicates_and_depth():
+    # Identical intervals and intervals with the same start are siblings.
+    starts = np.array([0, 0, 0, 2, 0])
+    ends = np.array([10, 5, 10, 3, 10])
+    index = IntervalIndex("start", "end", starts, ends)
+    assert index._groups[None].depth == 2
+    qstarts = np.array([4, 6, 11])
+    qends = np.array([4, 6, 12])
+    query, subject = index.find_overlaps(qstarts, qends)
+    assert list(zip(query.tolist(), subject.tolist())) == _brute_force_overlaps(starts, ends, qstarts, qends)
+
+    n = 32000
+    index = IntervalIndex("start", "end", np.full(n, 5), np.full(n, 10))
+    assert index._groups[None].depth == 1
+    query, subject = index.find_overlaps(np.array([0, 7, 11]), np.array([5, 7, 20]))
+    assert query.tolist() == [0] * n + [1] * n
+    assert subject.tolist() == list(range(n)) * 2
+
+    # Perfectly nested intervals are only as deep as the nesting, and queries
+    # only descend into the intervals they overlap.
+    index = IntervalIndex("start", "end", np.arange(n), 2 * n - np.arange(n))
+    assert index._groups[None].depth == n
+    query, subject = index.find_overlaps(np.array([5, 2 * n - 100]), np.array([5, 2 * n - 100]))
+    assert query.tolist() == [0] * 6 + [1] * 101
+    assert subject.tolist() == list(range(6)) + list(range(101))
+
+
+def test_interval_index_groups():
+    bframe = BiocFrame(
+        {
+            "chrom": ["chr1", "chr2", "chr1", "chr2"],
+            "start": np.array([1, 1, 50, 40]),
+            "end": np.array([10, 10, 60, 45]),
+        }
+    )
+    bframe.create_interval_index("start", "end", group="chrom")
+    query, subject = bframe.find_overlaps([5, 42, 5], [5, 55, 5], groups=["chr2", "chr1", "chr3"], group="chrom")
+    assert query.tolist() == [0, 1]
+    assert subject.tolist() == [1, 2]
+
+    with pytest.raises(ValueError, match="groups"):
+        bframe.find_overlaps([5], [5], group="chrom")
+
+    modified = bframe.set_column("start", np.array([0, 0, 0, 0]))
+    assert modified.get_interval_index(group="chrom") is None
+
+
+def test_hash_index_extend():
+    values = ["a", "b"]
+    index = BiocFrame({"k": values}).create_index("k")
+
+    extended_values = ["a", "b", "c", "a"]
+    extended = index.extend(extended_values, 2)
+    assert extended is not index
+    assert extended.get("c") == 2
+    assert extended.get_all("a") == [0, 3]
+    assert extended.is_valid_for(extended_values)
+    assert index.get("c") == -1
+    assert index.get_all("a") == [0]
+
+    same = index.extend(extended_values, 2, in_place=True)
+    assert same is index
+    assert index.get("c") == 2
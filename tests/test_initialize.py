@@ -1,3 +1,7 @@
+import struct
+from copy import copy
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -205,3 +209,78 @@ def test_initialize_from_sequence_errors():
 
     with pytest.raises(ValueError, match="Length of `data` and `column_names` must match"):
         BiocFrame(data, column_names=["A"])
+
+
+def test_from_parts():
+    obj = BiocFrame({"a": np.arange(3), "b": ["x", "y", "z"]}, row_names=["r1", "r2", "r3"], metadata={"k": 1})
+    rebuilt = BiocFrame._from_parts(
+        obj._data,
+        number_of_rows=3,
+        row_names=obj._row_names,
+        column_names=obj._column_names,
+        column_data=None,
+        metadata=obj._metadata,
+    )
+    assert rebuilt == obj
+    assert rebuilt.get_index("a") is None
+
+    class Tagged(BiocFrame):
+        def __init__(self, *args, tag="default", **kwargs):
+            super().__init__(*args, **kwargs)
+            self.tag = tag
+
+    sub = Tagged({"a": [1, 2]})
+    copied = sub.set_column("b", [3, 4])
+    assert isinstance(copied, Tagged)
+    assert copied.tag == "default"
+
+
+def test_slots():
+    obj = BiocFrame({"a": [1, 2]})
+    assert "_data" in BiocFrame.__slots__
+
+    # BiocObject does not define __slots__, so frames have a __dict__, but
+    # all attributes are stored in slots.
+    assert vars(obj) == {}
+    assert vars(copy(obj)) == {}
+    assert vars(obj[0:1, :]) == {}
+
+    # The iterator is fully slotted, i.e., just the object header and its two attributes.
+    iterator = obj.__iter__()
+    assert not hasattr(iterator, "__dict__")
+    assert object.__sizeof__(iterator) == object.__sizeof__(object()) + 2 * struct.calcsize("P")
+
+
+def test_validation_levels():
+    data = {"a": [1, 2], "b": ["x", "y"]}
+
+    obj = BiocFrame(data, _validate="full")
+    assert obj.shape == (2, 2)
+    obj = BiocFrame(data, _validate="none")
+    assert obj.shape == (2, 2)
+
+    with pytest.raises(ValueError, match="Mismatch"):
+        BiocFrame(data, column_names=["a", "c"])
+    with pytest.raises(ValueError, match="Mismatch"):
+        BiocFrame(data, column_names=["a", "a"])
+    with pytest.raises(ValueError, match="Mismatch"):
+        BiocFrame(data, column_names=["a"], _validate="shape")
+
+    # "shape" only checks lengths, not the contents of the names.
+    obj = BiocFrame(data, column_names=["a", "c"], _validate="shape")
+    assert obj.shape == (2, 2)
+    obj = BiocFrame(data, row_names=np.array(["x", None], dtype=object), _validate="shape")
+    assert obj.shape == (2, 2)
+
+    with pytest.raises(ValueError, match="same length"):
+        BiocFrame({"a": [1, 2], "b": [1]}, _validate="shape")
+
+    with pytest.raises(ValueError, match="validation level"):
+        BiocFrame(data, _validate="partial")
+
+
+def test_validation_none_in_array_names():
+    obj = BiocFrame({"a": [1, 2]})
+    with pytest.raises(ValueError, match="None"):
+        obj.set_row_names(np.array(["x", None], dtype=object))
+    assert obj.set_row_names(np.array(["x", "y"])).get_row_names().as_list() == ["x", "y"]
@@ -0,0 +1,241 @@
+import numpy as np
+import pytest
+from biocframe import BiocFrame, LazyBiocFrame
+from biocframe.lazy import _Filter, _Merge, _Select, _Sort, _Source, _optimize, _prune
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def _genes():
+    return BiocFrame(
+        {
+            "gene": ["A", "B", "C", "D", "E", "F"],
+            "chrom": ["chr1", "chr2", "chr1", "chr1", "chr2", "chr3"],
+            "lfc": np.array([2.0, -3.0, 0.5, -1.5, 4.0, 1.2]),
+            "qval": np.array([0.01, 0.2, 0.03, 0.001, 0.04, 0.5]),
+            "length": np.array([100, 200, 300, 400, 500, 600]),
+        }
+    )
+
+
+def _annotation():
+    return BiocFrame(
+        {
+            "gene": ["F", "E", "D", "A", "Z"],
+            "symbol": ["f1", "e1", "d1", "a1", "z1"],
+            "score": np.array([1, 2, 3, 4, 5]),
+        }
+    )
+
+
+def _plan(lazy):
+    return _prune(_optimize(lazy._plan), None)
+
+
+def test_lazy_basic():
+    obj = _genes()
+    lazy = obj.lazy()
+    assert isinstance(lazy, LazyBiocFrame)
+    assert lazy.columns == ["gene", "chrom", "lfc", "qval", "length"]
+
+    out = lazy.filter("qval < 0.05").filter("abs(lfc) > 1").select(["gene", "lfc"]).collect()
+    assert out.get_column_names().as_list() == ["gene", "lfc"]
+    assert out.get_column("gene") == ["A", "D", "E"]
+
+    out = lazy.with_columns({"log_length": "log10(length)", "rank": np.arange(6)}).collect()
+    assert np.allclose(out.get_column("log_length"), np.log10(obj.get_column("length")))
+    assert list(out.get_column("rank")) == list(range(6))
+
+    out = lazy.sort(["chrom", "lfc"], descending=[False, True]).collect()
+    assert out.get_column("gene") == ["A", "C", "D", "E", "B", "F"]
+
+    # Original object is untouched.
+    assert obj.get_column("gene") == ["A", "B", "C", "D", "E", "F"]
+
+
+def test_lazy_filter_functions():
+    obj = _genes()
+    out = (
+        obj.lazy()
+        .filter(lambda x: np.asarray(x.get_column("length")) > 150)
+        .filter(np.array([True, False, True, False, True]))
+        .collect()
+    )
+    assert out.get_column("gene") == ["B", "D", "F"]
+
+    with pytest.raises(ValueError, match="number of rows"):
+        obj.lazy().filter(np.array([True])).collect()
+
+
+def test_lazy_group_by():
+    obj = _genes()
+    out = (
+        obj.lazy()
+        .group_by(
+            "chrom",
+            {
+                "n": ("gene", "count"),
+                "total": ("length", "sum"),
+                "mean_lfc": ("lfc", "mean"),
+                "top": ("lfc", "max"),
+                "first": ("gene", "first"),
+                "genes": ("gene", lambda x: ",".join(x)),
+            },
+        )
+        .collect()
+    )
+    assert out.get_column("chrom") == ["chr1", "chr2", "chr3"]
+    assert list(out.get_column("n")) == [3, 2, 1]
+    assert list(out.get_column("total")) == [800, 700, 600]
+    assert np.allclose(out.get_column("mean_lfc"), [1.0 / 3, 0.5, 1.2])
+    assert list(out.get_column("top")) == [2.0, 4.0, 1.2]
+    assert list(out.get_column("first")) == ["A", "B", "F"]
+    assert out.get_column("genes") == ["A,C,D", "B,E", "F"]
+
+    out = obj.lazy().group_by("length", {"n": ("gene", "count")}).filter("length > 300").collect()
+    assert list(out.get_column("length")) == [400, 500, 600]
+
+    with pytest.raises(ValueError, match="Unknown aggregation"):
+        obj.lazy().group_by("chrom", {"x": ("lfc", "mode")})
+
+
+def test_lazy_merge():
+    genes = _genes()
+    annotation = _annotation()
+
+    lazy = genes.lazy().merge(annotation, by="gene", join="left").filter("score > 2").select(["gene", "symbol"])
+    out = lazy.collect()
+    expected = genes.merge(annotation, by="gene", join="left")
+    expected = expected.filter(expected.get_column("score").fill(0) > 2)
+    assert out.get_column("gene") == expected.get_column("gene")
+    assert list(out.get_column("symbol")) == list(expected.get_column("symbol"))
+
+    out = genes.lazy().merge(annotation.lazy(), by="gene", join="inner").filter("qval < 0.05 and score > 1").collect()
+    assert out.get_column("gene") == ["A", "D", "E"]
+    assert list(out.get_column("symbol")) == ["a1", "d1", "e1"]
+
+    out = genes.lazy().merge(annotation, by="gene", join="outer").filter("gene != 'Z'").collect()
+    assert "Z" not in list(out.get_column("gene"))
+    assert out.shape[0] == 6
+
+    with pytest.raises(ValueError, match="duplicate"):
+        genes.lazy().merge(genes, by="gene")
+
+    out = genes.lazy().merge(genes, by="gene", rename_duplicate_columns=True).select(["gene", "lfc (2)"]).collect()
+    assert list(out.get_column("lfc (2)")) == list(genes.get_column("lfc"))
+
+
+def test_lazy_optimizer():
+    genes = _genes()
+    annotation = _annotation()
+
+    # Filters are fused and moved below the sort.
+    plan = _plan(genes.lazy().sort("lfc").filter("qval < 0.05").filter("lfc > 0").select(["gene"]))
+    assert isinstance(plan, _Sort)
+    assert plan.columns == ["gene"]
+    assert isinstance(plan.children[0], _Filter)
+    assert len(plan.children[0].predicates) == 2
+    assert plan.children[0].columns == ["gene", "lfc"]
+    assert isinstance(plan.children[0].children[0], _Select)
+    assert plan.children[0].children[0].columns == ["gene", "lfc", "qval"]
+
+    # Filters on one side of a join are moved into that side.
+    plan = _plan(genes.lazy().merge(annotation, by="gene", join="inner").filter("qval < 0.05 and score > 1"))
+    assert isinstance(plan, _Filter)
+    plan = _plan(genes.lazy().merge(annotation, by="gene", join="inner").filter("qval < 0.05").filter("score > 1"))
+    assert isinstance(plan, _Merge)
+    assert isinstance(plan.children[0], _Filter)
+    assert isinstance(plan.children[1], _Filter)
+
+    # Right-hand filters are not moved below a left join.
+    plan = _plan(genes.lazy().merge(annotation, by="gene", join="left").filter("score > 1"))
+    assert isinstance(plan, _Filter)
+
+    # Unused columns are never read.
+    plan = _plan(genes.lazy().merge(annotation, by="gene").select(["gene", "symbol"]))
+    assert isinstance(plan, _Merge)
+    assert plan.children[0].schema() == ["gene"]
+    assert plan.children[1].schema() == ["gene", "symbol"]
+    assert isinstance(plan.children[0].children[0], _Source)
+
+    # Opaque filters are not reordered with respect to later filters.
+    mask = np.array([True, False, True, False, True, False])
+    lazy = genes.lazy().sort("lfc").filter(mask).filter("lfc > 0")
+    plan = _plan(lazy)
+    assert isinstance(plan, _Filter)
+    assert len(plan.predicates) == 2
+    assert isinstance(plan.children[0], _Sort)
+    assert lazy.collect().get_column("gene") == ["C", "A"]
+
+
+def test_lazy_errors():
+    obj = _genes()
+    with pytest.raises(ValueError, match="does not exist"):
+        obj.lazy().select(["missing"])
+    with pytest.raises(ValueError, match="does not exist"):
+        obj.lazy().filter("missing > 0")
+    with pytest.raises(ValueError, match="does not exist"):
+        obj.lazy().sort("missing")
+    with pytest.raises(ValueError, match="same length"):
+        obj.lazy().sort(["lfc", "qval"], descending=[True])
+    with pytest.raises(ValueError, match="joining strategy"):
+        obj.lazy().merge(obj, by="gene", join="cross")
+
+
+def test_lazy_explain():
+    genes = _genes()
+    annotation = _annotation()
+    lazy = (
+        genes.lazy()
+        .merge(annotation, by="gene", join="inner")
+        .filter("qval < 0.05")
+        .group_by("chrom", {"best": ("score", "max")})
+    )
+
+    text = lazy.explain()
+    lines = text.split("\n")
+    assert lines[0].startswith("GROUP_BY chrom")
+    assert lines[1].startswith("  INNER JOIN ON gene")
+    assert lines[2].startswith("    FILTER (qval < 0.05) -> gene, chrom")
+    assert "rows=" not in text
+
+    text = lazy.explain(analyze=True)
+    assert "GROUP_BY chrom AGG best = max(score)  [rows=2, columns=2" in text
+    assert "FILTER (qval < 0.05) -> gene, chrom  [rows=4, columns=2" in text
+    assert "* merge x1" in text
+    assert "* split x1" in text
+    assert "* get_slice x1" in text
+
+
+def test_lazy_explain_bytes():
+    import re
+
+    obj = BiocFrame({"gene": ["gene_" + str(i) * 50 for i in range(20)], "lfc": np.arange(20.0)})
+    lazy = obj.lazy().filter("lfc >= 10")
+    text = lazy.explain(analyze=True)
+
+    usage = lazy.collect().memory_usage()
+    expected = int(sum(b for b, k in zip(usage.get_column("bytes"), usage.get_column("kind")) if k == "column"))
+    reported = int(re.search(r"FILTER .* bytes=(\d+)", text).group(1))
+    assert reported == expected
+    assert reported > 10 * 50
+
+
+def test_lazy_explain_threads():
+    import threading
+
+    obj = _genes()
+    other = BiocFrame({"x": np.arange(100)})
+
+    def predicate(frame):
+        # Another thread slices a frame while this step is being analyzed.
+        worker = threading.Thread(target=lambda: [other[i : i + 1, :] for i in range(50)])
+        worker.start()
+        worker.join()
+        return np.asarray(frame.get_column("qval")) < 0.05
+
+    text = obj.lazy().filter(predicate).explain(analyze=True)
+    assert "* get_slice x1" in text
+    assert "x50" not in text and "x51" not in text
@@ -201,3 +201,52 @@ def test_merge_class_method():
     combined2 = obj1.merge(obj2, by=None, join="left")
     comcol2 = combined2.get_column_data()
     assert comcol.column("foo") == [True, False]
+
+
+def test_upsert_by_column():
+    import numpy as np
+
+    obj = BiocFrame({"id": ["a", "b", "c"], "x": np.array([1.0, 2.0, 3.0]), "y": [1, 2, 3]})
+    other = BiocFrame({"id": ["c", "d", "a"], "x": np.array([30.0, 40.0, 10.0])})
+
+    out = obj.upsert(other, by="id")
+    assert out.get_column("id") == ["a", "b", "c", "d"]
+    assert list(out.get_column("x")) == [10.0, 2.0, 30.0, 40.0]
+    assert list(out.get_column("y")) == [1, 2, 3, None]
+    assert list(obj.get_column("x")) == [1.0, 2.0, 3.0]
+
+    obj.create_index("id")
+    obj.upsert(other, by="id", in_place=True)
+    assert obj.shape == (4, 3)
+    assert obj.get_index("id").get("d") == 3
+    assert obj.get_row("d", by="id")["x"] == 40.0
+
+    # Only updates.
+    out = obj.upsert(BiocFrame({"id": ["b"], "x": np.array([-1.0])}), by="id")
+    assert out.shape == (4, 3)
+    assert out.get_column("x")[1] == -1.0
+    assert obj.get_column("x")[1] == 2.0
+
+
+def test_upsert_by_row_names():
+    obj = BiocFrame({"x": [1, 2]}, row_names=["r1", "r2"])
+    other = BiocFrame({"x": [20, 30]}, row_names=["r2", "r3"])
+
+    out = obj.upsert(other)
+    assert out.get_row_names().as_list() == ["r1", "r2", "r3"]
+    assert out.get_column("x") == [1, 20, 30]
+
+
+def test_upsert_errors():
+    obj = BiocFrame({"id": ["a", "b"], "x": [1, 2]})
+
+    with pytest.raises(ValueError, match="unique in 'other'"):
+        obj.upsert(BiocFrame({"id": ["c", "c"], "x": [1, 2]}), by="id")
+    with pytest.raises(ValueError, match="unique in the current"):
+        BiocFrame({"id": ["a", "a"]}).upsert(BiocFrame({"id": ["a"]}), by="id")
+    with pytest.raises(ValueError, match="does not exist"):
+        obj.upsert(BiocFrame({"id": ["c"], "z": [1]}), by="id")
+    with pytest.raises(ValueError, match="not a valid column"):
+        obj.upsert(BiocFrame({"x": [1]}), by="id")
+    with pytest.raises(ValueError, match="row names"):
+        obj.upsert(BiocFrame({"x": [1]}))
@@ -1,7 +1,9 @@
+import sys
+
 import numpy as np
 import pytest
 import pandas as pd
-from biocframe.BiocFrame import BiocFrame
+from biocframe.BiocFrame import BiocFrame, merge
 from biocutils import Factor, Names
 import biocutils as ut
 
@@ -172,12 +174,12 @@ def test_bframe_set_columns():
     assert final_column_data.column("prop2").dtype == np.int32
     assert (
         list(final_column_data.column("prop2"))
-        == list(bframe2a.get_column_data().column("prop2")) + [np.ma.masked] * 2
+        == list(bframe2a.get_column_data().column("prop2")) + [None] * 2
     )
     assert final_column_data.column("prop3").dtype == np.int8
     assert (
         list(final_column_data.column("prop3"))
-        == list(bframe2a.get_column_data().column("prop3")) + [np.ma.masked] * 2
+        == list(bframe2a.get_column_data().column("prop3")) + [None] * 2
     )
 
 
@@ -767,3 +769,188 @@ def test_head_tail_errors():
 
     with pytest.raises(ValueError):
         bframe.tail(-1)
+
+
+def test_encode_strings():
+    obj = BiocFrame(
+        {
+            "cell": ["b", "a", None, "b", "a", "b"],
+            "id": ["x1", "x2", "x3", "x4", "x5", "x6"],
+            "mixed": ["a", 1, "a", "a", "a", "a"],
+            "value": np.arange(6),
+        }
+    )
+
+    encoded = obj.encode_strings()
+    cell = encoded.get_column("cell")
+    assert isinstance(cell, Factor)
+    assert list(cell.get_levels()) == ["a", "b"]
+    assert cell.get_codes().tolist() == [1, 0, -1, 1, 0, 1]
+    assert encoded.get_column("id") == obj.get_column("id")
+    assert encoded.get_column("mixed") == obj.get_column("mixed")
+    assert isinstance(obj.get_column("cell"), list)
+
+    assert encoded.split("cell", only_indices=True) == obj.split("cell", only_indices=True)
+    assert encoded.split("cell")["a"].get_column("value").tolist() == [1, 4]
+
+    assert encoded == obj.encode_strings()
+    other = encoded.set_column("cell", Factor([0, 1, -1, 0, 1, 0], ["b", "a"]))
+    assert encoded == other
+    other = encoded.set_column("cell", Factor([0, 1, -1, 0, 1, 1], ["b", "a"]))
+    assert encoded != other
+
+    keys = BiocFrame({"cell": ["b", "z", "a"], "label": [1, 2, 3]})
+    merged = merge([keys, encoded], by="cell")
+    assert merged.get_column("value").tolist() == [0, None, 1]
+    merged = merge([keys.encode_strings(threshold=1), encoded], by="cell")
+    assert merged.get_column("value").tolist() == [0, None, 1]
+
+    obj.encode_strings(threshold=1, columns=["id"], in_place=True)
+    assert isinstance(obj.get_column("id"), Factor)
+    with pytest.raises(ValueError):
+        obj.encode_strings(columns=["foo"])
+
+
+def test_optimize_dtypes():
+    obj = BiocFrame(
+        {
+            "small": np.array([0, -5, 100]),
+            "medium": np.array([0, 1000, 3], dtype=np.int32),
+            "unsigned": np.array([1, 2, 300], dtype=np.uint64),
+            "big": np.array([0, 2**40, 1]),
+            "float": np.array([0.5, 1.5, 2.5]),
+            "flags": [True, False, True],
+            "counts": [1, None, 3],
+            "strings": ["a", "b", "c"],
+        }
+    )
+
+    opt, report = obj.optimize_dtypes()
+    assert opt.get_column("small").dtype == np.int8
+    assert opt.get_column("small").tolist() == [0, -5, 100]
+    assert opt.get_column("medium").dtype == np.int16
+    assert opt.get_column("unsigned").dtype == np.uint16
+    assert opt.get_column("big").dtype == np.int64
+    assert opt.get_column("float").dtype == np.float64
+    assert opt.get_column("flags").dtype == np.bool_
+    assert opt.get_column("counts").dtype == np.int8
+    assert opt.get_column("counts").tolist() == [1, None, 3]
+    assert opt.get_column("strings") == ["a", "b", "c"]
+    assert obj.get_column("small").dtype == np.int64
+
+    assert report.get_row_names().as_list() == ["small", "medium", "unsigned", "flags", "counts"]
+    assert report.get_column("before")[0] == 24
+    assert report.get_column("after")[0] == 3
+    assert (report.get_column("saved") > 0).all()
+    assert report.get_column("dtype")[0] == "int8"
+
+    opt, report = obj.optimize_dtypes(allow_float32=True, columns=["float", "big"])
+    assert opt.get_column("float").dtype == np.float32
+    assert report.get_row_names().as_list() == ["float"]
+
+    opt, report = obj.optimize_dtypes(in_place=True)
+    assert opt is obj
+    assert obj.get_column("small").dtype == np.int8
+    opt, report = obj.optimize_dtypes()
+    assert report.shape[0] == 0
+
+
+def test_memory_usage():
+    obj = BiocFrame(
+        {
+            "ints": np.arange(100),
+            "strings": ["x" + str(i) for i in range(100)],
+            "nested": BiocFrame({"floats": np.zeros(100)}),
+        },
+        row_names=["r" + str(i) for i in range(100)],
+        metadata={"source": "test"},
+    )
+
+    usage = obj.memory_usage()
+    assert usage.get_row_names().as_list() == [
+        "ints",
+        "strings",
+        "nested",
+        "row_names",
+        "column_names",
+        "column_data",
+        "metadata",
+    ]
+    assert usage.get_column("kind")[:3] == ["column"] * 3
+    sizes = usage.get_column("bytes")
+    assert sizes[0] == 800
+    assert sizes[2] > 800
+    assert sizes[5] == 0
+
+    shallow = obj.memory_usage(deep=False).get_column("bytes")
+    assert shallow[0] == 800
+    assert shallow[1] < sizes[1]
+
+    # Shared objects are only counted once.
+    shared = BiocFrame({"a": obj.get_column("ints"), "b": obj.get_column("ints")})
+    assert shared.memory_usage().get_column("bytes")[:2].tolist() == [800, 0]
+
+    assert sys.getsizeof(obj) > sizes.sum()
+
+
+def test_set_slice_numpy_rows():
+    obj = BiocFrame(
+        {"a": np.zeros(6), "b": np.arange(6), "c": ["u", "v", "w", "x", "y", "z"]},
+        row_names=["r0", "r1", "r2", "r3", "r4", "r5"],
+    )
+    value = BiocFrame({"a": np.array([1.0, 2.0]), "b": np.array([10, 20]), "c": ["p", "q"]})
+
+    out = obj.set_slice(np.array([4, -1]), ["a", "b", "c"], value, in_place=False)
+    assert list(out.get_column("a")) == [0, 0, 0, 0, 1, 2]
+    assert list(out.get_column("b")) == [0, 1, 2, 3, 10, 20]
+    assert out.get_column("c") == ["u", "v", "w", "x", "p", "q"]
+    assert list(obj.get_column("a")) == [0] * 6
+
+    mask = np.array([True, False, True, False, False, False])
+    out = obj.set_slice(mask, ["a"], BiocFrame({"a": [7.0, 8.0]}), in_place=False)
+    assert list(out.get_column("a")) == [7, 0, 8, 0, 0, 0]
+
+    out = obj.set_slice(range(1, 6, 2), ["b"], BiocFrame({"b": [-1, -2, -3]}), in_place=False)
+    assert list(out.get_column("b")) == [0, -1, 2, -2, 4, -3]
+
+    out = obj.set_slice(["r5", "r0"], ["b"], BiocFrame({"b": [50, 0]}), in_place=False)
+    assert list(out.get_column("b")) == [0, 1, 2, 3, 4, 50]
+
+    with pytest.raises(IndexError):
+        obj.set_slice(np.array([6]), ["a"], BiocFrame({"a": [1.0]}))
+    with pytest.raises(IndexError):
+        obj.set_slice(np.array([-7]), ["a"], BiocFrame({"a": [1.0]}))
+
+
+def test_filter():
+    obj = BiocFrame(
+        {"a": np.arange(5), "b": ["v", "w", "x", "y", "z"], "c": np.linspace(0, 1, 5)},
+        row_names=["r0", "r1", "r2", "r3", "r4"],
+    )
+
+    out = obj.filter(np.array([True, False, True, False, True]))
+    assert out.shape == (3, 3)
+    assert list(out.get_column("a")) == [0, 2, 4]
+    assert out.get_column("b") == ["v", "x", "z"]
+    assert list(out.get_row_names()) == ["r0", "r2", "r4"]
+
+    out = obj.filter(lambda x: x.get_column("a") >= 3, columns=["b"])
+    assert out.get_column_names().as_list() == ["b"]
+    assert out.get_column("b") == ["y", "z"]
+    assert list(out.get_row_names()) == ["r3", "r4"]
+
+    masked = np.ma.array([True, True, False, False, False], mask=[False, True, False, False, False])
+    out = obj.filter(masked)
+    assert list(out.get_column("a")) == [0]
+
+    out = obj.filter([True] * 5, columns="c")
+    assert out.shape == (5, 1)
+    assert out.get_column("c") is obj.get_column("c")
+
+    out = obj.filter(np.zeros(5, dtype=bool))
+    assert out.shape == (0, 3)
+
+    with pytest.raises(ValueError, match="number of rows"):
+        obj.filter(np.array([True, False]))
+    with pytest.raises(TypeError, match="boolean"):
+        obj.filter(np.array([0, 1, 2, 3, 4]))
@@ -0,0 +1,251 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from biocutils import Names, combine_sequences
+
+from biocframe import BiocFrame, PartialNames, PersistentNames, RangeNames, StringArrayNames, concat
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def test_range_names_basic():
+    names = RangeNames(5)
+    assert len(names) == 5
+    assert names.labels == range(5)
+    assert list(names) == ["0", "1", "2", "3", "4"]
+    assert names[2] == "2"
+    assert names.map("3") == 3
+    assert names.map("03") == -1
+    assert names.map("foo") == -1
+    assert "4" in names
+    assert names.is_unique
+    assert names == Names(["0", "1", "2", "3", "4"])
+
+    sliced = names[1:5:2]
+    assert isinstance(sliced, RangeNames)
+    assert sliced.labels == range(1, 5, 2)
+    assert list(sliced) == ["1", "3"]
+
+    picked = names[[4, 0, 4]]
+    assert isinstance(picked, RangeNames)
+    assert list(picked) == ["4", "0", "4"]
+    assert picked.map("4") == 0
+    assert not picked.is_unique
+
+    # Still compact after all of that.
+    assert names.labels is not None
+
+
+def test_range_names_mutation():
+    names = RangeNames(range(10, 13))
+    extended = names.safe_append("foo")
+    assert extended.as_list() == ["10", "11", "12", "foo"]
+    assert names.labels == range(10, 13)
+
+    names.set_value(0, "bar", in_place=True)
+    assert names.as_list() == ["bar", "11", "12"]
+    assert names.labels is None
+    assert names.map("bar") == 0
+
+
+def test_range_names_materialized():
+    names = RangeNames(5)
+    combined = Names(["a"]) + names
+    assert combined.as_list() == ["a", "0", "1", "2", "3", "4"]
+    assert names.labels == range(5)
+
+    changed = names.set_value(0, "z")
+    assert changed.as_list() == ["z", "1", "2", "3", "4"]
+    assert names.labels == range(5)
+
+    names.append("x")
+    assert names.labels is None
+    sliced = names[1:3]
+    assert type(sliced) is Names
+    assert sliced.as_list() == ["1", "2"]
+    assert names[[5, 0]].as_list() == ["x", "0"]
+    assert type(names.copy()) is Names
+
+
+def test_range_names_combine():
+    combined = combine_sequences(RangeNames(range(0, 3)), RangeNames(range(3, 5)))
+    assert combined.labels == range(0, 5)
+
+    combined = combine_sequences(RangeNames(3), RangeNames(2))
+    assert list(combined.labels) == [0, 1, 2, 0, 1]
+
+    combined = combine_sequences(RangeNames(2), Names(["a"]))
+    assert combined.as_list() == ["0", "1", "a"]
+
+
+def test_range_names_in_frame():
+    bframe = BiocFrame({"x": [1, 2, 3, 4]}, row_names=RangeNames(4))
+    assert bframe.get_row("2") == {"x": 3}
+    assert bframe[1:3, :].row_names.labels == range(1, 3)
+    assert bframe.remove_rows(["1"]).row_names.as_list() == ["0", "2", "3"]
+
+    combined = bframe.combine_rows(bframe[0:2, :])
+    assert combined.row_names.as_list() == ["0", "1", "2", "3", "0", "1"]
+
+    pdf = pd.DataFrame({"x": [1, 2, 3]})
+    converted = BiocFrame.from_pandas(pdf)
+    assert isinstance(converted.row_names, RangeNames)
+    assert converted.row_names == Names(["0", "1", "2"])
+
+
+def test_remove_rows_keeps_missing_names():
+    bframe = BiocFrame({"x": np.array([1, 2, 3, 4])})
+    result = bframe.remove_rows([0, 2])
+    assert result.row_names is None
+    assert result.get_column("x").tolist() == [2, 4]
+
+    result = bframe.remove_rows(slice(1, 3))
+    assert result.get_column("x").tolist() == [1, 4]
+
+    with pytest.raises(ValueError, match="does not exist"):
+        bframe.remove_rows(["foo"])
+
+    empty = BiocFrame(number_of_rows=5).remove_rows([1])
+    assert empty.shape == (4, 0)
+
+
+def test_combine_partial_row_names():
+    named = BiocFrame({"x": [1, 2]}, row_names=["a", "b"])
+    unnamed = BiocFrame({"x": [3, 4, 5]})
+    combined = unnamed.combine_rows(named)
+    assert combined.row_names.as_list() == ["", "", "", "a", "b"]
+    assert isinstance(combined.row_names, PartialNames)
+    assert combined.get_row("b") == {"x": 2}
+
+    names = combined.row_names
+    assert names.positions.tolist() == [3, 4]
+    assert names[1] == "" and names[-1] == "b"
+    assert names.map("a") == 3
+    assert names.map("") == 0
+    assert names.map("z") == -1
+    assert not names.is_unique
+    assert names == Names(["", "", "", "a", "b"])
+
+    sliced = combined[[4, 0, 3], :]
+    assert isinstance(sliced.row_names, PartialNames)
+    assert sliced.row_names.positions.tolist() == [0, 2]
+    assert sliced.row_names.as_list() == ["b", "", "a"]
+    assert names.positions is not None
+
+    concatenated = concat([unnamed, named, unnamed])
+    assert concatenated.row_names.as_list() == ["", "", "", "a", "b", "", "", ""]
+    assert isinstance(concatenated.row_names, PartialNames)
+
+
+def test_partial_names_memory():
+    n = 1000000
+    combined = BiocFrame({"x": np.zeros(n)}).combine_rows(BiocFrame({"x": [1.0]}, row_names=["last"]))
+    names = combined.row_names
+    assert isinstance(names, PartialNames)
+    assert len(names) == n + 1
+    assert names.get_value(n) == "last"
+    assert sys.getsizeof(names) < 1000
+
+    tail = combined[n - 1 :, :].row_names
+    assert tail.as_list() == ["", "last"]
+    assert combine_sequences(names, RangeNames(2)).positions.tolist() == [n, n + 1, n + 2]
+
+    names.set_value(0, "first", in_place=True)
+    assert names.positions is None
+    assert names[0] == "first" and names[n] == "last"
+
+    with pytest.raises(ValueError, match="increasing"):
+        PartialNames(3, [2, 1], ["a", "b"])
+
+
+def test_string_array_names():
+    arr = np.array(["AAAC", "AAAG", "AAAT", "AAAC"])
+    names = StringArrayNames(arr)
+    assert len(names) == 4
+    assert names[1] == "AAAG"
+    assert names.map("AAAC") == 0
+    assert names.map("CCCC") == -1
+    assert not names.is_unique
+    assert list(names) == ["AAAC", "AAAG", "AAAT", "AAAC"]
+    assert names == Names(["AAAC", "AAAG", "AAAT", "AAAC"])
+
+    sliced = names[[3, 1]]
+    assert isinstance(sliced, StringArrayNames)
+    assert sliced.array.tolist() == ["AAAC", "AAAG"]
+    assert names[1:3].array.tolist() == ["AAAG", "AAAT"]
+    assert names.array is arr
+
+    combined = combine_sequences(names, StringArrayNames(np.array(["TTTT"])))
+    assert isinstance(combined, StringArrayNames)
+    assert len(combined) == 5
+
+
+def test_string_array_names_materialized():
+    names = StringArrayNames(np.array(["AAAC", "AAAG", "AAAT"]))
+    combined = combine_sequences(Names(["a"]), names)
+    assert combined.as_list() == ["a", "AAAC", "AAAG", "AAAT"]
+    assert names.array is not None
+
+    bframe = BiocFrame({"x": np.array([1, 2, 3])}, row_names=names)
+    bframe.row_names.set_value(0, "CCCC", in_place=True)
+    assert bframe.row_names.array is None
+
+    sliced = bframe[0:2, :]
+    assert type(sliced.row_names) is Names
+    assert sliced.row_names.as_list() == ["CCCC", "AAAG"]
+    assert bframe.get_row("CCCC") == {"x": 1}
+
+
+def test_string_array_names_in_frame():
+    barcodes = np.array(["AAAC", "AAAG", "AAAT"])
+    bframe = BiocFrame({"x": np.array([1, 2, 3])}, row_names=barcodes)
+    assert isinstance(bframe.row_names, StringArrayNames)
+    assert bframe.get_row("AAAT") == {"x": 3}
+
+    sliced = bframe[[2, 0], :]
+    assert isinstance(sliced.row_names, StringArrayNames)
+    assert sliced.row_names.as_list() == ["AAAT", "AAAC"]
+
+    assert bframe == BiocFrame({"x": np.array([1, 2, 3])}, row_names=barcodes.copy())
+    assert bframe == BiocFrame({"x": np.array([1, 2, 3])}, row_names=["AAAC", "AAAG", "AAAT"])
+    assert bframe != BiocFrame({"x": np.array([1, 2, 3])}, row_names=np.array(["A", "B", "C"]))
+
+    renamed = bframe.set_row_names(np.array(["x", "y", "z"]))
+    assert isinstance(renamed.row_names, StringArrayNames)
+
+
+def test_persistent_names():
+    base = [f"col{i}" for i in range(100)]
+    names = PersistentNames(base)
+    assert len(names) == 100
+    assert list(names) == base
+    assert names[40] == "col40"
+    assert names[-1] == "col99"
+    assert names.map("col7") == 7
+    assert names.map("foo") == -1
+    assert names.is_unique
+    assert names == Names(base)
+
+    extended = names
+    for i in range(1000):
+        extended = extended.safe_append(f"new{i}")
+    assert isinstance(extended, PersistentNames)
+    assert len(names) == 100
+    assert len(extended) == 1100
+    assert list(extended) == base + [f"new{i}" for i in range(1000)]
+    assert extended[531] == "new431"
+    assert extended.map("new999") == 1099
+
+    sliced = extended[[0, 1099]]
+    assert list(sliced) == ["col0", "new999"]
+
+    names.safe_append("extra", in_place=True)
+    assert len(names) == 101
+    assert names.map("extra") == 100
+
+    names.append("more")
+    assert list(names)[-2:] == ["extra", "more"]
@@ -0,0 +1,117 @@
+import biocutils as ut
+import numpy as np
+import pytest
+
+from biocframe import BiocFrame, NullableArray, merge, relaxed_combine_columns
+
+__author__ = "jkanche"
+__copyright__ = "jkanche"
+__license__ = "MIT"
+
+
+def test_nullable_basic():
+    x = NullableArray(np.array([1, 2, 3, 4], dtype=np.int32), mask=[False, True, False, True])
+    assert len(x) == 4
+    assert x.dtype == np.int32
+    assert x.has_missing()
+    assert x.validity.tolist() == [0b0101]
+    assert x.mask.tolist() == [False, True, False, True]
+    assert x.tolist() == [1, None, 3, None]
+    assert x[0] == 1
+    assert x[-1] is None
+    with pytest.raises(IndexError):
+        x[4]
+
+    assert x.equals([1, None, 3, None])
+    assert x.fill(0).tolist() == [1, 0, 3, 0]
+    assert x.to_masked().mask.tolist() == [False, True, False, True]
+
+    y = NullableArray(np.ma.array([1.5, 2.5], mask=[True, False]))
+    assert y.tolist() == [None, 2.5]
+    assert np.isnan(np.asarray(y)[0])
+
+    z = NullableArray(np.arange(3))
+    assert not z.has_missing()
+    assert z.validity is None
+    assert z.equals(np.arange(3))
+
+    empty = NullableArray.missing(10, dtype=np.int8)
+    assert empty.dtype == np.int8
+    assert empty.tolist() == [None] * 10
+
+
+def test_nullable_generics():
+    x = NullableArray(np.arange(10), mask=np.arange(10) % 3 == 0)
+    assert ut.get_height(x) == 10
+
+    sub = ut.subset_sequence(x, [0, 1, 9, 2])
+    assert sub.tolist() == [None, 1, None, 2]
+
+    combined = ut.combine_sequences(x[:2], np.array([20, 30]), NullableArray.missing(1, dtype=np.int64))
+    assert isinstance(combined, NullableArray)
+    assert combined.tolist() == [None, 1, 20, 30, None]
+
+    assigned = ut.assign_sequence(x, [0, 1], [100, None])
+    assert assigned.tolist()[:4] == [100, None, 2, None]
+    assert x.tolist()[:2] == [None, 1]
+
+    assigned = ut.assign_sequence(x, [0, 1], np.array([5, 6]))
+    assert assigned.tolist()[:2] == [5, 6]
+
+    frame = BiocFrame({"x": x})
+    assert "None" in str(frame)
+
+
+def test_nullable_merge():
+    obj1 = BiocFrame({"B": np.array([1, 2, 3])}, row_names=["a", "b", "c"])
+    obj2 = BiocFrame({"C": np.array([1.5, 2.5], dtype=np.float32)}, row_names=["c", "a"])
+
+    combined = merge([obj1, obj2], by=None, join="left")
+    col = combined.get_column("C")
+    assert isinstance(col, NullableArray)
+    assert col.dtype == np.float32
+    assert col.tolist() == [2.5, None, 1.5]
+
+    combined = relaxed_combine_columns(obj1, obj2)
+    assert combined.get_column("C").equals(col)
+    assert combined == relaxed_combine_columns(obj1, obj2)
+
+    combined = merge([obj2, obj1], by=None, join="outer")
+    assert combined.get_row_names().as_list() == ["c", "a", "b"]
+    assert combined.get_column("C").tolist() == [1.5, 2.5, None]
+    assert combined.get_column("B").tolist() == [3, 1, 2]
+
+
+def test_nullable_ufuncs():
+    x = NullableArray(np.array([1.0, 2.0, 0.0, 4.0]), mask=[False, True, True, False])
+    y = np.array([10.0, 20.0, 30.0, 40.0])
+
+    out = x + y
+    assert isinstance(out, NullableArray)
+    assert out.tolist() == [11.0, None, None, 44.0]
+    assert (y * x).tolist() == [10.0, None, None, 160.0]
+    assert (-x).tolist() == [-1.0, None, None, -4.0]
+    assert np.log1p(x).tolist()[1:3] == [None, None]
+
+    # Elementwise comparisons, propagating the missing values.
+    eq = x == np.array([1.0, 2.0, 0.0, 5.0])
+    assert isinstance(eq, NullableArray)
+    assert eq.tolist() == [True, None, None, False]
+    assert (x > 1).tolist() == [False, None, None, True]
+    with pytest.raises(ValueError, match="ambiguous"):
+        bool(x == x)
+
+    # Missing values in a boolean subscript are not selected.
+    assert x[x > 0].tolist() == [1.0, 4.0]
+
+    masked = np.ma.array([1.0, 1.0, 1.0, 1.0], mask=[True, False, False, False])
+    assert (x + masked).tolist() == [None, None, None, 5.0]
+
+    # Reductions ignore the missing values.
+    assert np.sum(x) == 5.0
+    assert np.maximum.reduce(x) == 4.0
+
+    with np.errstate(all="raise"):
+        assert (y / x).tolist() == [10.0, None, None, 10.0]
+        with pytest.raises(FloatingPointError):
+            _ = NullableArray(np.array([0.0])) / NullableArray(np.array([0.0]))